@@ -25,9 +25,17 @@ except ImportError:
     __version__ = "?"
 
 from .canbus_modules import *
+from .codec import *
 from .component import *
 from .csc import *
 from .enums import *
 from .interfaces import *
+from .lock import *
 from .mock_server import *
 from .register import *
+from .retry import *
+from .rtt import *
+from .scan import *
+from .scheduler import *
+from .testutils import *
+from .transaction import *
@@ -44,13 +44,23 @@ __all__ = [
     "DelayLin",
     "MidiOPG",
     "E5DCB",
+    "E5DCBMonitor",
 ]
+import asyncio
 import logging
+import time
+import typing
 
 from . import interfaces
 from .compoway_register import CompoWayFDataRegister, CompoWayFOperationRegister
 from .enums import Mode, OpticalConfiguration, Output, Power
 from .register import AsciiRegister
+from .wizardry import (
+    WARMUP_POLL_PERIOD,
+    WAVELENGTH_SETTLE_TIMEOUT,
+    WAVELENGTH_STABLE_READS,
+    WAVELENGTH_TOLERANCE,
+)
 
 
 class CPU8000(interfaces.CanbusModule):
@@ -97,33 +107,25 @@ class CPU8000(interfaces.CanbusModule):
             module_name=self.name,
             module_id=self.id,
             register_name="Power",
+            value_type=Power,
         )
         self.display_current_register = AsciiRegister(
             component=self.component,
             module_name=self.name,
             module_id=self.id,
             register_name="Display Current",
+            value_type=float,
+            unit="A",
         )
         self.fault_register = AsciiRegister(
             component=self.component,
             module_name=self.name,
             module_id=self.id,
             register_name="Fault code",
+            value_type=int,
         )
         self.log.debug(f"{self.name} Module initialized")
 
-    async def update_register(self):
-        """Publish the registers located inside of this module.
-
-        Returns
-        -------
-        None
-
-        """
-        await self.power_register.send_command()
-        await self.display_current_register.send_command()
-        await self.fault_register.send_command()
-
     def __repr__(self):
         return f"CPU8000:\n {self.power_register}\n {self.display_current_register}\n {self.fault_register}\n"
 
@@ -192,18 +194,22 @@ class MCPU800(interfaces.CanbusModule):
             module_name=self.name,
             module_id=self.id,
             register_name="Power",
+            value_type=Power,
         )
         self.display_current_register = AsciiRegister(
             component=self.component,
             module_name=self.name,
             module_id=self.id,
             register_name="Display Current",
+            value_type=float,
+            unit="A",
         )
         self.fault_register = AsciiRegister(
             component=self.component,
             module_name=self.name,
             module_id=self.id,
             register_name="Fault code",
+            value_type=int,
         )
 
         self.power_register_2 = AsciiRegister(
@@ -213,18 +219,22 @@ class MCPU800(interfaces.CanbusModule):
             register_name="Power",
             read_only=False,
             accepted_values=list(Power),
+            value_type=Power,
         )
         self.display_current_register_2 = AsciiRegister(
             component=self.component,
             module_name=self.name,
             module_id=self.id_2,
             register_name="Display Current",
+            value_type=float,
+            unit="A",
         )
         self.fault_register_2 = AsciiRegister(
             component=self.component,
             module_name=self.name,
             module_id=self.id_2,
             register_name="Fault code",
+            value_type=int,
         )
         self.continous_burst_mode_trigger_burst_register = AsciiRegister(
             component=self.component,
@@ -233,6 +243,7 @@ class MCPU800(interfaces.CanbusModule):
             register_name="Continuous %2F Burst mode %2F Trigger burst",
             read_only=False,
             accepted_values=list(Mode),
+            value_type=Mode,
         )
         self.output_energy_level_register = AsciiRegister(
             component=self.component,
@@ -241,6 +252,7 @@ class MCPU800(interfaces.CanbusModule):
             register_name="Output Energy level",
             read_only=False,
             accepted_values=list(Output),
+            value_type=Output,
         )
         self.frequency_divider_register = AsciiRegister(
             component=self.component,
@@ -249,24 +261,28 @@ class MCPU800(interfaces.CanbusModule):
             register_name="Frequency divider",
             read_only=False,
             accepted_values=range(1, 5001),
+            value_type=int,
         )
         self.burst_pulse_left_register = AsciiRegister(
             component=self.component,
             module_name=self.name,
             module_id=self.id_2,
             register_name="Burst pulses to go",
+            value_type=int,
         )
         self.qsw_adjustment_output_delay_register = AsciiRegister(
             component=self.component,
             module_name=self.name,
             module_id=self.id_2,
             register_name="QSW Adjustment output delay",
+            value_type=float,
         )
         self.repetition_rate_register = AsciiRegister(
             component=self.component,
             module_name=self.name,
             module_id=self.id_2,
             register_name="Repetition rate",
+            value_type=float,
         )
         self.synchronization_mode_register = AsciiRegister(
             component=self.component,
@@ -281,6 +297,7 @@ class MCPU800(interfaces.CanbusModule):
             register_name="Burst length",
             read_only=False,
             accepted_values=range(1, 50001),
+            value_type=int,
         )
 
     async def start_propagating(self):
@@ -293,7 +310,51 @@ class MCPU800(interfaces.CanbusModule):
         None
 
         """
-        await self.power_register_2.send_command(Power.ON)
+        await self.power_register_2.send_command(Power.ON, force=True)
+
+    async def wait_until_propagating(self, timeout):
+        """Wait until the laser reports that it propagates.
+
+        The power and the propagation mode are polled every
+        `WARMUP_POLL_PERIOD` seconds.
+        A laser in trigger mode propagates bursts, like in burst mode.
+
+        Parameters
+        ----------
+        timeout : `float`
+            The longest time to wait [s].
+
+        Returns
+        -------
+        mode : `Mode`
+            The propagation mode of the laser.
+
+        Raises
+        ------
+        TimeoutError
+            Raised when the laser does not propagate within the timeout.
+        """
+        registers = [
+            self.power_register_2,
+            self.continous_burst_mode_trigger_burst_register,
+        ]
+        start = time.monotonic()
+        while True:
+            snapshot = await self.read_registers(registers)
+            power = snapshot[self.power_register_2]
+            mode = snapshot[self.continous_burst_mode_trigger_burst_register]
+            if power == Power.ON and mode in (
+                Mode.BURST,
+                Mode.CONTINUOUS,
+                Mode.TRIGGER,
+            ):
+                return mode
+            remaining = timeout - (time.monotonic() - start)
+            if remaining <= 0:
+                raise TimeoutError(
+                    f"Laser not propagating after {timeout}s: {power=}, {mode=}."
+                )
+            await asyncio.sleep(min(WARMUP_POLL_PERIOD, remaining))
 
     async def stop_propagating(self):
         """Stop the propagation of the laser.
@@ -306,7 +367,7 @@ class MCPU800(interfaces.CanbusModule):
         None
 
         """
-        await self.power_register_2.send_command(Power.OFF)
+        await self.power_register_2.send_command(Power.OFF, force=True)
 
     async def set_output_energy_level(self, value):
         """Set the output energy level for the laser.
@@ -319,9 +380,9 @@ class MCPU800(interfaces.CanbusModule):
         -------
         None
         """
-        await self.output_energy_level_register.send_command(value)
+        await self.output_energy_level_register.send_command(value, readback=False)
 
-    async def set_propagation_mode(self, value):
+    async def set_propagation_mode(self, value, force=False):
         """Set the propagation mode of the laser.
 
         value : `str`, {Continuous, Burst, Trigger}
@@ -330,8 +391,12 @@ class MCPU800(interfaces.CanbusModule):
             Burst: Pulses a set number of times at regular interval
             Trigger: Trigger a pulse using an external device
             Trigger has not been used as we have no source.
+        force : `bool`, optional
+            Whether to set the mode even if the laser is already in it.
         """
-        await self.continous_burst_mode_trigger_burst_register.send_command(Mode(value))
+        await self.continous_burst_mode_trigger_burst_register.send_command(
+            Mode(value), readback=False, force=force
+        )
 
     async def set_burst_count(self, value):
         """Set the burst count for the laser when in burst mode.
@@ -342,30 +407,7 @@ class MCPU800(interfaces.CanbusModule):
             The amount of pulses to perform.
             Accepts values between 1 and 50000
         """
-        await self.burst_length_register.send_command(value)
-
-    async def update_register(self):
-        """Publish the register values of the module.
-
-        Returns
-        -------
-        None
-
-        """
-        await self.power_register.send_command()
-        await self.display_current_register.send_command()
-        await self.fault_register.send_command()
-        await self.power_register_2.send_command()
-        await self.display_current_register_2.send_command()
-        await self.fault_register_2.send_command()
-        await self.continous_burst_mode_trigger_burst_register.send_command()
-        await self.output_energy_level_register.send_command()
-        await self.frequency_divider_register.send_command()
-        await self.burst_pulse_left_register.send_command()
-        await self.qsw_adjustment_output_delay_register.send_command()
-        await self.repetition_rate_register.send_command()
-        await self.synchronization_mode_register.send_command()
-        await self.burst_length_register.send_command()
+        await self.burst_length_register.send_command(value, readback=False)
 
     def __repr__(self):
         return (
@@ -413,16 +455,6 @@ class LLPMKU(interfaces.CanbusModule):
             register_name="Power",
         )
 
-    async def update_register(self):
-        """Publish the register values of the module.
-
-        Returns
-        -------
-        None
-
-        """
-        await self.power_register.send_command()
-
     def __repr__(self):
         return f"11PMKu:\n {self.power_register}"
 
@@ -458,21 +490,30 @@ class MidiOPG(interfaces.CanbusModule):
             register_name="WaveLength",
             read_only=False,
             accepted_values=range(1, 2600),
+            value_type=float,
+            unit="nm",
         )
 
     async def change_wavelength(self, value):
-        """Change wavelength.
+        """Change wavelength and wait for it to settle.
 
         Parameters
         ----------
         value : `float`
             The wavelength value.
-        """
-        await self.wavelength_register.send_command(value)
 
-    async def update_register(self):
-        """Update all registers."""
-        await self.wavelength_register.send_command()
+        Returns
+        -------
+        settle_time : `float`
+            The time the wavelength took to settle [s].
+        """
+        await self.wavelength_register.send_command(value, readback=False)
+        return await self.wavelength_register.wait_until_settled(
+            target=value,
+            tolerance=WAVELENGTH_TOLERANCE,
+            stable_reads=WAVELENGTH_STABLE_READS,
+            timeout=WAVELENGTH_SETTLE_TIMEOUT,
+        )
 
     def __repr__(self):
         return f"{self.name}:\n {self.wavelength_register}\n"
@@ -522,6 +563,8 @@ class MaxiOPG(interfaces.CanbusModule):
             register_name="WaveLength",
             read_only=False,
             accepted_values=range(300, 1100),
+            value_type=float,
+            unit="nm",
         )
         self.configuration_register = AsciiRegister(
             component=self.component,
@@ -530,10 +573,11 @@ class MaxiOPG(interfaces.CanbusModule):
             register_name="Configuration",
             read_only=False,
             accepted_values=list(OpticalConfiguration),
+            value_type=OpticalConfiguration,
         )
 
     async def change_wavelength(self, wavelength):
-        """Change the wavelength of the laser.
+        """Change the wavelength of the laser and wait for it to settle.
 
         Parameters
         ----------
@@ -542,10 +586,17 @@ class MaxiOPG(interfaces.CanbusModule):
 
         Returns
         -------
-        None
+        settle_time : `float`
+            The time the wavelength took to settle [s].
 
         """
-        await self.wavelength_register.send_command(wavelength)
+        await self.wavelength_register.send_command(wavelength, readback=False)
+        return await self.wavelength_register.wait_until_settled(
+            target=wavelength,
+            tolerance=WAVELENGTH_TOLERANCE,
+            stable_reads=WAVELENGTH_STABLE_READS,
+            timeout=WAVELENGTH_SETTLE_TIMEOUT,
+        )
 
     async def set_configuration(self):
         """Set the configuration of the output of the laser
@@ -563,18 +614,9 @@ class MaxiOPG(interfaces.CanbusModule):
         None
 
         """
-        await self.configuration_register.send_command(f"{self.optical_alignment}")
-
-    async def update_register(self):
-        """Publish the register values of the modules.
-
-        Returns
-        -------
-        None
-
-        """
-        await self.wavelength_register.send_command()
-        await self.configuration_register.send_command()
+        await self.configuration_register.send_command(
+            OpticalConfiguration(self.optical_alignment)
+        )
 
     def __repr__(self):
         return f"{self.name}:\n {self.wavelength_register}\n {self.configuration_register}\n"
@@ -611,18 +653,9 @@ class MiniOPG(interfaces.CanbusModule):
             module_name=self.name,
             module_id=self.id,
             register_name="Error Code",
+            value_type=int,
         )
 
-    async def update_register(self):
-        """Publish the register values of the module.
-
-        Returns
-        -------
-        None
-
-        """
-        await self.error_code_register.send_command()
-
     def __repr__(self):
         return f"{self.name}:\n {self.error_code_register}\n"
 
@@ -669,39 +702,34 @@ class TK6(interfaces.CanbusModule):
             module_name=self.name,
             module_id=self.id,
             register_name="Display temperature",
+            value_type=float,
+            unit="C",
         )
         self.set_temperature_register = AsciiRegister(
             component=self.component,
             module_name=self.name,
             module_id=self.id,
             register_name="Set temperature",
+            value_type=float,
+            unit="C",
         )
         self.display_temperature_register_2 = AsciiRegister(
             component=self.component,
             module_name=self.name,
             module_id=self.id_2,
             register_name="Display temperature",
+            value_type=float,
+            unit="C",
         )
         self.set_temperature_register_2 = AsciiRegister(
             component=self.component,
             module_name=self.name,
             module_id=self.id_2,
             register_name="Set temperature",
+            value_type=float,
+            unit="C",
         )
 
-    async def update_register(self):
-        """Publish the register values of the module.
-
-        Returns
-        -------
-        None
-
-        """
-        await self.display_temperature_register.send_command()
-        await self.set_temperature_register.send_command()
-        await self.display_temperature_register_2.send_command()
-        await self.set_temperature_register_2.send_command()
-
     def __repr__(self):
         return (
             f"{self.name}:\n {self.display_temperature_register}\n {self.set_temperature_register}\n"
@@ -742,18 +770,10 @@ class HV40W(interfaces.CanbusModule):
             module_name=self.name,
             module_id=self.id,
             register_name="HV voltage",
+            value_type=float,
+            unit="V",
         )
 
-    async def update_register(self):
-        """Publishes the register values of the module.
-
-        Returns
-        -------
-        None
-
-        """
-        await self.hv_voltage_register.send_command()
-
     def __repr__(self):
         return f"{self.name}:\n {self.hv_voltage_register}\n"
 
@@ -790,18 +810,9 @@ class DelayLin(interfaces.CanbusModule):
             module_name=self.name,
             module_id=self.id,
             register_name="Error Code",
+            value_type=int,
         )
 
-    async def update_register(self):
-        """Publish the register values of the module.
-
-        Returns
-        -------
-        None
-
-        """
-        await self.error_code_register.send_command()
-
     def __repr__(self):
         return f"{self.name}:\n {self.error_code_register}\n"
 
@@ -851,38 +862,34 @@ class LDCO48BP(interfaces.CanbusModule):
             module_name=self.name,
             module_id=self.id,
             register_name="Display temperature",
+            value_type=float,
+            unit="C",
         )
         self.display_temperature_register_2 = AsciiRegister(
             component=self.component,
             module_name=self.name,
             module_id=self.id_2,
             register_name="Display temperature",
+            value_type=float,
+            unit="C",
         )
         self.display_temperature_register_3 = AsciiRegister(
             component=self.component,
             module_name=self.name,
             module_id=self.id_3,
             register_name="Display temperature",
+            value_type=float,
+            unit="C",
         )
         self.display_temperature_register_4 = AsciiRegister(
             component=self.component,
             module_name=self.name,
             module_id=self.id_4,
             register_name="Display temperature",
+            value_type=float,
+            unit="C",
         )
 
-    async def update_register(self):
-        """Publish the register values of the module.
-
-        Returns
-        -------
-        None
-        """
-        await self.display_temperature_register.send_command()
-        await self.display_temperature_register_2.send_command()
-        await self.display_temperature_register_3.send_command()
-        await self.display_temperature_register_4.send_command()
-
     def __repr__(self):
         return (
             f"{self.name}:\n {self.display_temperature_register}\n"
@@ -927,27 +934,89 @@ class MLDCO48(interfaces.CanbusModule):
             module_name=self.name,
             module_id=self.id,
             register_name="Display temperature",
+            value_type=float,
+            unit="C",
         )
         self.display_temperature_register_2 = AsciiRegister(
             component=self.component,
             module_name=self.name,
             module_id=self.id_2,
             register_name="Display temperature",
+            value_type=float,
+            unit="C",
         )
 
-    async def update_register(self):
-        """Publish the register values of the module.
+    def __repr__(self):
+        return f"{self.name}:\n {self.display_temperature_register}\n {self.display_temperature_register_2}\n"
+
+
+class E5DCBMonitor(typing.NamedTuple):
+    """The monitor values of the E5DCB, read in one exchange, and the time
+    they were read.
+
+    Temperatures, current and output are read in tenths of their unit, the
+    scale which `CompoWayFDataRegister.create_set_message` writes the set
+    point in.
+
+    Parameters
+    ----------
+    process_value : `float`
+        The measured temperature [C].
+    status : `int`
+        The status bits of the controller.
+    set_point : `float`
+        The set point in use [C].
+    heater_current : `float`
+        The current of the heater [A].
+    manipulated_value : `float`
+        The heating output [%].
+    timestamp : `float`
+        The monotonic time at which the values were read.
+    """
+
+    process_value: float
+    status: int
+    set_point: float
+    heater_current: float
+    manipulated_value: float
+    timestamp: float
+
+    ELEMENTS = 5
+    ALARM_BITS = (12, 13, 14)
+
+    @property
+    def alarms(self):
+        """The states of alarms 1 to 3."""
+        return tuple(bool(self.status >> bit & 1) for bit in self.ALARM_BITS)
+
+    @classmethod
+    def from_words(cls, words, timestamp):
+        """Decode the monitor values from the words read.
+
+        Parameters
+        ----------
+        words : `tuple` [`int`]
+            The words of the process value, status, set point, heater
+            current and manipulated value, in the order of their addresses.
+        timestamp : `float`
+            The monotonic time at which the words were read.
 
         Returns
         -------
-        None
-
+        monitor : `E5DCBMonitor`
+            The monitor values.
         """
-        await self.display_temperature_register.send_command()
-        await self.display_temperature_register_2.send_command()
-
-    def __repr__(self):
-        return f"{self.name}:\n {self.display_temperature_register}\n {self.display_temperature_register_2}\n"
+        process_value, status, set_point, heater_current, manipulated_value = [
+            word - 0x10000 if word & 0x8000 else word for word in words
+        ]
+        return cls(
+            process_value=process_value / 10,
+            status=words[1],
+            set_point=set_point / 10,
+            heater_current=heater_current / 10,
+            manipulated_value=manipulated_value / 10,
+            timestamp=timestamp,
+        )
 
 
 class E5DCB:
@@ -971,6 +1040,11 @@ class E5DCB:
         Corresponds to the "Temperature Set" register.
     alarm_set_register : `AsciiRegister`
         Corresponds to the "Alarm Set" register.
+    monitor_register : `CompoWayFDataRegister`
+        Reads the process value, status, set point, heater current and
+        manipulated value in one exchange.
+    monitor : `E5DCBMonitor` or `None`
+        The monitor values last read, `None` before the first read.
 
     """
 
@@ -997,16 +1071,40 @@ class E5DCB:
             simulation_mode=simulation_mode,
         )
 
+        self.monitor_register = CompoWayFDataRegister(
+            component=component,
+            module_name=self.name,
+            module_id=self.id_1,
+            register_name="Monitor",
+            simulation_mode=simulation_mode,
+            elements=E5DCBMonitor.ELEMENTS,
+        )
+        self.monitor = None
+
     async def update_register(self):
         """Publish the register values of the module.
 
+        The monitor values are read in one exchange, which also updates the
+        set point.
+        The set point register keeps the word read, in tenths of a degree,
+        as its own get message reads it.
+
         Returns
         -------
         None
         """
-        await self.set_point_register.read_register_value()
+        if await self.monitor_register.read_register_value():
+            self.monitor = E5DCBMonitor.from_words(
+                self.monitor_register.register_value, self.monitor_register.read_time
+            )
+            # The set point is the third word of the monitor block.
+            self.set_point_register.register_value = (
+                self.monitor_register.register_value[2]
+            )
+            self.set_point_register.read_time = self.monitor_register.read_time
 
     def __repr__(self):
         return (
-            f"{self.name}:\n {self.run_stop_register}\n" f"{self.set_point_register}\n"
+            f"{self.name}:\n {self.run_stop_register}\n"
+            f"{self.set_point_register}\n {self.monitor}\n"
         )
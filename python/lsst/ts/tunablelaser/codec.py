@@ -0,0 +1,298 @@
+# This file is part of ts_tunablelaser.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Software.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Implements the codec of the ASCII protocol of the laser.
+
+Notes
+-----
+A reply of the laser is the value of the register, optionally followed by
+its unit, and terminated by ``\r\n`` and the terminator of the client.
+An error reply starts with ``'''`` and contains an error code in
+parentheses, for instance ``'''Error: (8) Timeout waiting for device answer``.
+The codec works on the bytes read from the stream, so that numbers are
+decoded without building intermediate strings.
+
+A response of the CompoWay/F protocol of the temperature controller is a
+frame which starts with STX, ends with ETX, and is followed by a block check
+character, which is the exclusive or of the bytes after STX up to and
+including ETX.
+"""
+__all__ = ["AsciiCodec", "AsciiReply", "CompoWayFCodec", "CompoWayFFrame"]
+
+import functools
+import operator
+import re
+import typing
+
+
+class AsciiReply(typing.NamedTuple):
+    """A decoded reply of the laser.
+
+    Parameters
+    ----------
+    value : Any
+        The decoded value, or the message of an error reply.
+    unit : `str`
+        The unit of the value, empty if the reply has none.
+    error_code : `int` or `None`
+        The code of an error reply, 0 if the error has no code, `None` if
+        the reply is not an error.
+    """
+
+    value: typing.Any
+    unit: str = ""
+    error_code: int | None = None
+
+    @property
+    def is_error(self):
+        """Is the reply an error reported by the laser?"""
+        return self.error_code is not None
+
+
+class AsciiCodec:
+    """Decode the replies of the ASCII protocol of the laser.
+
+    Parameters
+    ----------
+    terminator : `bytes`, optional
+        The characters that terminate a reply.
+    encoding : `str`, optional
+        The encoding of the text of a reply.
+
+    Attributes
+    ----------
+    terminator : `bytes`
+        The characters that terminate a reply.
+    encoding : `str`
+        The encoding of the text of a reply.
+    """
+
+    ERROR_PREFIX = b"'''"
+    NUMBER = re.compile(rb"([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)\s*([^\s\d]*)\Z")
+    ERROR_CODE = re.compile(rb"\((\d+)\)")
+
+    def __init__(self, terminator=b"\x03", encoding="ascii"):
+        self.terminator = terminator
+        self.encoding = encoding
+
+    def strip(self, data):
+        """Return a view of a reply without the terminator and whitespace.
+
+        Parameters
+        ----------
+        data : `bytes` or `memoryview`
+            The reply, as read from the stream.
+
+        Returns
+        -------
+        body : `memoryview`
+            The body of the reply, sharing the memory of ``data``.
+        """
+        view = memoryview(data)
+        end = len(view)
+        if view[end - len(self.terminator) : end] == self.terminator:
+            end -= len(self.terminator)
+        start = 0
+        while end > start and view[end - 1] in b" \t\r\n":
+            end -= 1
+        while start < end and view[start] in b" \t\r\n":
+            start += 1
+        return view[start:end]
+
+    def is_error(self, data):
+        """Is the reply an error reported by the laser?
+
+        Parameters
+        ----------
+        data : `bytes` or `memoryview`
+            The reply, as read from the stream.
+
+        Returns
+        -------
+        `bool`
+        """
+        return self.strip(data)[: len(self.ERROR_PREFIX)] == self.ERROR_PREFIX
+
+    def decode(self, data, value_type=str):
+        """Decode a reply.
+
+        Parameters
+        ----------
+        data : `bytes` or `memoryview`
+            The reply, as read from the stream.
+        value_type : `type`, optional
+            The type to decode the value into.
+            `int` and `float` are split from their unit and decoded straight
+            from the bytes, other types are built from the whole text of the
+            reply, even if it starts with a number.
+
+        Returns
+        -------
+        reply : `AsciiReply`
+            The decoded reply.
+
+        Raises
+        ------
+        ValueError
+            Raised when the value cannot be decoded into ``value_type``.
+        """
+        body = self.strip(data)
+        if body[: len(self.ERROR_PREFIX)] == self.ERROR_PREFIX:
+            match = self.ERROR_CODE.search(body)
+            return AsciiReply(
+                value=str(body, self.encoding),
+                error_code=int(match.group(1)) if match else 0,
+            )
+        if value_type not in (int, float):
+            return AsciiReply(value=value_type(str(body, self.encoding)))
+        match = self.NUMBER.match(body)
+        if match is None:
+            raise ValueError(
+                f"Cannot decode {bytes(body)!r} as {value_type.__name__}."
+            )
+        number, unit = match.groups()
+        return AsciiReply(value=value_type(number), unit=str(unit, self.encoding))
+
+
+class CompoWayFFrame(typing.NamedTuple):
+    """A decoded response frame of the CompoWay/F protocol.
+
+    Parameters
+    ----------
+    node : `str`
+        The node number of the controller, 2 digits.
+    sub_address : `str`
+        The sub-address, 2 digits.
+    end_code : `str`
+        The end code, ``"00"`` for a normal completion.
+    mrc_src : `str`
+        The main and sub request codes of the command, empty if the frame
+        has no PDU.
+    response_code : `str`
+        The response code, ``"0000"`` for a normal completion, empty if the
+        frame has no PDU.
+    data : `str`
+        The data of the response.
+    """
+
+    node: str
+    sub_address: str
+    end_code: str
+    mrc_src: str = ""
+    response_code: str = ""
+    data: str = ""
+
+    @property
+    def is_normal(self):
+        """Did the command complete normally?"""
+        return self.end_code == "00" and self.response_code == "0000"
+
+
+class CompoWayFCodec:
+    """Decode the response frames of the CompoWay/F protocol.
+
+    Parameters
+    ----------
+    encoding : `str`, optional
+        The encoding of the text of a frame.
+
+    Attributes
+    ----------
+    encoding : `str`
+        The encoding of the text of a frame.
+    """
+
+    STX = b"\x02"
+    ETX = b"\x03"
+
+    def __init__(self, encoding="ascii"):
+        self.encoding = encoding
+
+    @staticmethod
+    def bcc(data):
+        """Return the block check character of a frame.
+
+        Parameters
+        ----------
+        data : `bytes` or `memoryview`
+            The frame without STX, up to and including ETX.
+
+        Returns
+        -------
+        bcc : `int`
+            The exclusive or of the bytes.
+        """
+        return functools.reduce(operator.xor, data, 0)
+
+    def find_start(self, data):
+        """Return the position of the STX of the last frame of the data.
+
+        Parameters
+        ----------
+        data : `bytes`
+            The data read, up to and including ETX.
+
+        Returns
+        -------
+        start : `int`
+            The position of STX, -1 if there is none.
+        """
+        return data.rfind(self.STX)
+
+    def decode(self, data, bcc):
+        """Decode a response frame.
+
+        Parameters
+        ----------
+        data : `bytes` or `memoryview`
+            The frame, from STX up to and including ETX.
+        bcc : `int`
+            The block check character read after the frame.
+
+        Returns
+        -------
+        frame : `CompoWayFFrame`
+            The decoded frame.
+
+        Raises
+        ------
+        ValueError
+            Raised when the frame is malformed or its block check character
+            does not match.
+        """
+        view = memoryview(data)
+        if len(view) < 8 or view[:1] != self.STX or view[-1:] != self.ETX:
+            raise ValueError(f"Malformed frame {bytes(view)!r}.")
+        expected_bcc = self.bcc(view[1:])
+        if bcc != expected_bcc:
+            raise ValueError(
+                f"Incorrect BCC of frame {bytes(view)!r}, got: {bcc:#04x}, "
+                f"expected: {expected_bcc:#04x}."
+            )
+        body = view[1:-1]
+        return CompoWayFFrame(
+            node=str(body[0:2], self.encoding),
+            sub_address=str(body[2:4], self.encoding),
+            end_code=str(body[4:6], self.encoding),
+            mrc_src=str(body[6:10], self.encoding),
+            response_code=str(body[10:14], self.encoding),
+            data=str(body[14:], self.encoding),
+        )
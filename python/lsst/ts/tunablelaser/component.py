@@ -25,10 +25,10 @@ import asyncio
 import logging
 
 from lsst.ts import tcpip
-from lsst.ts.xml.enums.TunableLaser import LaserDetailedState
 
 from . import canbus_modules, interfaces
 from .enums import Mode, Power
+from .lock import PriorityLock
 
 
 class MainLaser(interfaces.Laser):
@@ -72,9 +72,9 @@ class MainLaser(interfaces.Laser):
         Controls the LDCO48BP laser module.
     m_ldco48 : `MLDCO48`
         Controls the LDCO48 laser module.
-    laser_warmup_delay : `int`
-        The warmup delay before stating that the laser is propagating.
-    lock : `asyncio.Lock`
+    wavelength_settle_time : `float` or `None`
+        The time the wavelength took to settle at the last change [s].
+    lock : `PriorityLock`
         Lock the read/write operation.
 
 
@@ -100,8 +100,13 @@ class MainLaser(interfaces.Laser):
         self.mini_opg = canbus_modules.MiniOPG(component=self)
         self.ldco48bp = canbus_modules.LDCO48BP(component=self, laser_id=self.laser_id)
         self.m_ldcO48 = canbus_modules.MLDCO48(component=self)
-        self.laser_warmup_delay = 10
-        self.lock = asyncio.Lock()
+        self.wavelength_settle_time = None
+        self.lock = PriorityLock()
+        self.add_polling_tiers(
+            status=[self.mini_opg.error_code_register],
+            temperature=[self.ldco48bp.display_temperature_register_4],
+            static=[self.llpmku.power_register, self.maxi_opg.configuration_register],
+        )
 
     @property
     def is_propagating(self):
@@ -111,21 +116,29 @@ class MainLaser(interfaces.Laser):
             return False
 
     @property
-    def wavelength(self):
-        return self.maxi_opg.wavelength_register.register_value
+    def wavelength_register(self):
+        return self.maxi_opg.wavelength_register
 
     @property
-    def temperature(self):
+    def temperature_registers(self):
         return (
-            self.tk6.display_temperature_register.register_value,
-            self.tk6.display_temperature_register_2.register_value,
-            self.ldco48bp.display_temperature_register.register_value,
-            self.ldco48bp.display_temperature_register_2.register_value,
-            self.ldco48bp.display_temperature_register_3.register_value,
-            self.m_ldcO48.display_temperature_register.register_value,
-            self.m_ldcO48.display_temperature_register_2.register_value,
+            self.tk6.display_temperature_register,
+            self.tk6.display_temperature_register_2,
+            self.ldco48bp.display_temperature_register,
+            self.ldco48bp.display_temperature_register_2,
+            self.ldco48bp.display_temperature_register_3,
+            self.m_ldcO48.display_temperature_register,
+            self.m_ldcO48.display_temperature_register_2,
         )
 
+    @property
+    def wavelength(self):
+        return self.wavelength_register.register_value
+
+    @property
+    def temperature(self):
+        return tuple(register.register_value for register in self.temperature_registers)
+
     async def change_wavelength(self, wavelength):
         """Change the wavelength of the laser.
 
@@ -137,10 +150,19 @@ class MainLaser(interfaces.Laser):
             However, it should have been a long int.
 
             :Units: nanometers
+
+        Returns
+        -------
+        settle_time : `float`
+            The time the wavelength took to settle [s].
         """
         self.log.debug("Changing wavelength")
         wave = int(wavelength)
-        await self.maxi_opg.change_wavelength(wave)
+        self.wavelength_settle_time = await self.maxi_opg.change_wavelength(wave)
+        self.log.info(
+            f"Wavelength settled at {wave}nm in {self.wavelength_settle_time:.2f}s."
+        )
+        return self.wavelength_settle_time
 
     async def set_optical_configuration(self, optical_configuration):
         """Change the optical alignment of the laser.
@@ -183,7 +205,7 @@ class MainLaser(interfaces.Laser):
         ValueError
             Raised when mode parameter is not in list of accepted values.
         """
-        await self.m_cpu800.set_propagation_mode(Mode.TRIGGER)
+        await self.m_cpu800.set_propagation_mode(Mode.TRIGGER, force=True)
 
     async def set_burst_mode(self, count):
         """Set the propagation mode to pulse the laser at regular intervals.
@@ -200,8 +222,10 @@ class MainLaser(interfaces.Laser):
             Raised when the count parameter falls outside of the
             accepted range.
         """
-        await self.m_cpu800.set_propagation_mode(Mode.BURST)
-        await self.m_cpu800.set_burst_count(count)
+        async with self.transaction():
+            await self.m_cpu800.set_propagation_mode(Mode.BURST)
+            await self.m_cpu800.set_burst_count(count)
+        await self.csc.evt_burstCountSet.set_write(count=count)
 
     async def set_continuous_mode(self):
         """Set the propagation mode to continuously pulse the laser."""
@@ -218,60 +242,13 @@ class MainLaser(interfaces.Laser):
         await self.m_cpu800.set_burst_count(count)
         await self.csc.evt_burstCountSet.set_write(count=count)
 
-    async def start_propagating(self, data):
-        """Start propagating the beam of the laser."""
-        await self.m_cpu800.start_propagating()
-        await self.csc.cmd_startPropagateLaser.ack_in_progress(
-            data=data, timeout=self.laser_warmup_delay
-        )
-        await asyncio.sleep(self.laser_warmup_delay)  # laser warmup delay
-        if (
-            self.m_cpu800.continous_burst_mode_trigger_burst_register.register_value
-            == Mode.BURST
-        ):
-            await self.csc.publish_new_detailed_state(
-                LaserDetailedState.PROPAGATING_BURST_MODE
-            )
-        elif (
-            self.m_cpu800.continous_burst_mode_trigger_burst_register.register_value
-            == Mode.CONTINUOUS
-        ):
-            await self.csc.publish_new_detailed_state(
-                LaserDetailedState.PROPAGATING_CONTINUOUS_MODE
-            )
-        else:
-            raise RuntimeError(
-                f"""{self.m_cpu800.continous_burst_mode_trigger_burst_register.register_value}
-                not in list of {list(Mode)} valid laser modes."""
-            )
-
-    async def stop_propagating(self):
-        """Stop propagating the beam of the laser"""
-        await self.m_cpu800.stop_propagating()
-
-    async def clear_fault(self):
-        """Clear the fault state of the laser."""
-        if self.m_cpu800.power_register_2.register_value == "FAULT":
-            await self.m_cpu800.power_register_2.set_register_value()
-
-    async def read_all_registers(self):
-        """Publish the module's registers' values."""
-        await self.cpu8000.update_register()
-        await self.m_cpu800.update_register()
-        await self.llpmku.update_register()
-        await self.maxi_opg.update_register()
-        await self.mini_opg.update_register()
-        await self.tk6.update_register()
-        await self.hv40w.update_register()
-        await self.delay_lin.update_register()
-        await self.ldco48bp.update_register()
-        await self.m_ldcO48.update_register()
-
     async def configure(self, config):
         """Set the configuration for the TunableLaser."""
         self.log.debug("Setting config.")
         self.host = config.host
         self.port = config.port
+        self.laser_warmup_delay = config.warmup_timeout
+        self.rtt.max_timeout = config.timeout
         self.maxi_opg.wavelength_register.accepted_values = range(
             config.wavelength["min"], config.wavelength["max"]
         )
@@ -284,12 +261,6 @@ class MainLaser(interfaces.Laser):
             f"Optical alignment is {self.maxi_opg.optical_alignment}"
         )
 
-    def __str__(self):
-        return (
-            f"{self.cpu8000} {self.m_cpu800} {self.llpmku} {self.maxi_opg} {self.mini_opg} {self.tk6}"
-            f"{self.hv40w} {self.delay_lin} {self.ldco48bp} {self.m_ldcO48}"
-        )
-
 
 class StubbsLaser(interfaces.Laser):
     """Implement the Stubbs NT-252 laser.
@@ -325,9 +296,9 @@ class StubbsLaser(interfaces.Laser):
         The LDCO48BP module.
     m_ldc048 : `hardware.MLDCO48`
         The MLDCO48 module.
-    laser_warmup_delay : `int`
-        A delay for publishing propagation for warmup.
-    lock : `asyncio.Lock`
+    wavelength_settle_time : `float` or `None`
+        The time the wavelength took to settle at the last change [s].
+    lock : `PriorityLock`
         A lock for writing/reading messages.
     """
 
@@ -349,35 +320,49 @@ class StubbsLaser(interfaces.Laser):
         self.delay_lin = canbus_modules.DelayLin(component=self, laser_id=self.laser_id)
         self.ldco48bp = canbus_modules.LDCO48BP(component=self, laser_id=self.laser_id)
         self.m_ldcO48 = canbus_modules.MLDCO48(component=self)
-        self.laser_warmup_delay = 10
-        self.lock = asyncio.Lock()
+        self.wavelength_settle_time = None
+        self.lock = PriorityLock()
+        self.add_polling_tiers()
 
     @property
     def is_propagating(self):
-        if self.m_cpu800.power_register_2.register_value == "ON":
+        if self.m_cpu800.power_register_2.register_value == Power.ON:
             return True
         else:
             return False
 
     @property
-    def wavelength(self):
-        return self.midiopg.wavelength_register.register_value
+    def wavelength_register(self):
+        return self.midiopg.wavelength_register
 
     @property
-    def temperature(self):
+    def temperature_registers(self):
         return (
-            self.tk6.display_temperature_register.register_value,
-            self.tk6.display_temperature_register_2.register_value,
-            self.ldco48bp.display_temperature_register.register_value,
-            self.ldco48bp.display_temperature_register_2.register_value,
-            self.ldco48bp.display_temperature_register_3.register_value,
-            self.ldco48bp.display_temperature_register_4.register_value,
-            self.m_ldcO48.display_temperature_register.register_value,
-            self.m_ldcO48.display_temperature_register_2.register_value,
+            self.tk6.display_temperature_register,
+            self.tk6.display_temperature_register_2,
+            self.ldco48bp.display_temperature_register,
+            self.ldco48bp.display_temperature_register_2,
+            self.ldco48bp.display_temperature_register_3,
+            self.ldco48bp.display_temperature_register_4,
+            self.m_ldcO48.display_temperature_register,
+            self.m_ldcO48.display_temperature_register_2,
         )
 
+    @property
+    def wavelength(self):
+        return self.wavelength_register.register_value
+
+    @property
+    def temperature(self):
+        return tuple(register.register_value for register in self.temperature_registers)
+
     async def change_wavelength(self, wavelength):
-        await self.midiopg.change_wavelength(wavelength)
+        wave = int(wavelength)
+        self.wavelength_settle_time = await self.midiopg.change_wavelength(wave)
+        self.log.info(
+            f"Wavelength settled at {wave}nm in {self.wavelength_settle_time:.2f}s."
+        )
+        return self.wavelength_settle_time
 
     async def set_output_energy_level(self, output_energy_level):
         await self.m_cpu800.set_output_energy_level(output_energy_level)
@@ -390,7 +375,7 @@ class StubbsLaser(interfaces.Laser):
         ValueError
             Raised when mode parameter is not in list of accepted values.
         """
-        await self.m_cpu800.set_propagation_mode(Mode.TRIGGER)
+        await self.m_cpu800.set_propagation_mode(Mode.TRIGGER, force=True)
 
     async def set_burst_mode(self, count):
         """Set the propagation mode to pulse the laser at regular intervals.
@@ -407,8 +392,9 @@ class StubbsLaser(interfaces.Laser):
             Raised when the count parameter falls outside of the
             accepted range.
         """
-        await self.m_cpu800.set_propagation_mode(Mode.BURST)
-        await self.m_cpu800.set_burst_count(count)
+        async with self.transaction():
+            await self.m_cpu800.set_propagation_mode(Mode.BURST)
+            await self.m_cpu800.set_burst_count(count)
         await self.csc.evt_burstCountSet.set_write(count=count)
 
     async def set_continuous_mode(self):
@@ -426,46 +412,12 @@ class StubbsLaser(interfaces.Laser):
         await self.m_cpu800.set_burst_count(count)
         await self.csc.evt_burstCountSet.set_write(count=count)
 
-    async def start_propagating(self, data):
-        """Start propagating the beam of the laser."""
-        await self.m_cpu800.start_propagating()
-        await self.csc.cmd_startPropagateLaser.ack_in_progress(
-            data=data, timeout=self.laser_warmup_delay
-        )
-        await asyncio.sleep(self.laser_warmup_delay)  # laser warmup delay
-        if (
-            self.m_cpu800.continous_burst_mode_trigger_burst_register.register_value
-            == Mode.BURST
-        ):
-            await self.csc.publish_new_detailed_state(
-                LaserDetailedState.PROPAGATING_BURST_MODE
-            )
-        elif (
-            self.m_cpu800.continous_burst_mode_trigger_burst_register.register_value
-            == Mode.CONTINUOUS
-        ):
-            await self.csc.publish_new_detailed_state(
-                LaserDetailedState.PROPAGATING_CONTINUOUS_MODE
-            )
-        else:
-            raise RuntimeError(
-                f"""{self.m_cpu800.continous_burst_mode_trigger_burst_register.register_value}
-                not in list of {list(Mode)} valid laser modes."""
-            )
-
-    async def stop_propagating(self):
-        """Stop propagating the beam of the laser"""
-        await self.m_cpu800.stop_propagating()
-
-    async def clear_fault(self):
-        """Clear the fault state of the laser."""
-        if self.m_cpu800.power_register_2.register_value == "FAULT":
-            await self.m_cpu800.power_register_2.set_register_value()
-
     async def configure(self, config):
         self.log.debug("Setting config.")
         self.host = config.host
         self.port = config.port
+        self.laser_warmup_delay = config.warmup_timeout
+        self.rtt.max_timeout = config.timeout
 
         self.midiopg.wavelength_register.accepted_values = range(
             config.wavelength["min"], config.wavelength["max"]
@@ -479,16 +431,6 @@ class StubbsLaser(interfaces.Laser):
         #     f"Optical alignment is {self.maxi_opg.optical_alignment}"
         # ) PF: Not sure about this either
 
-    async def read_all_registers(self):
-        await self.midiopg.update_register()
-        await self.cpu8000.update_register()
-        await self.m_cpu800.update_register()
-        await self.tk6.update_register()
-        await self.hv40w.update_register()
-        await self.delay_lin.update_register()
-        await self.ldco48bp.update_register()
-        await self.m_ldcO48.update_register()
-
 
 class TemperatureCtrl(interfaces.CompoWayFModule):
     """Implement the Omron Temperature Controller.
@@ -510,7 +452,7 @@ class TemperatureCtrl(interfaces.CompoWayFModule):
 
     Attributes
     ----------
-    lock : `asyncio.Lock`
+    lock : `PriorityLock`
     A lock for writing/reading messages.
     host : `string`
     The host for the temp controller to connect to during simulation mode
@@ -531,7 +473,7 @@ class TemperatureCtrl(interfaces.CompoWayFModule):
             encoding=encoding,
             simulation_mode=simulation_mode,
         )
-        self.lock = asyncio.Lock()
+        self.lock = PriorityLock()
 
         # if host is not valid IP address assume its unconnected
         if str(host).lower() != "none":
@@ -549,9 +491,12 @@ class TemperatureCtrl(interfaces.CompoWayFModule):
 
     @property
     def temperature(self):
-        """Return temperature value."""
-        if self.e5dc_b is not None:
-            return (self.e5dc_b.set_point_register.register_value,)
+        """Return the temperature measured by the controller.
+
+        -1 if the controller is unconnected or was not read yet.
+        """
+        if self.e5dc_b is not None and self.e5dc_b.monitor is not None:
+            return (self.e5dc_b.monitor.process_value,)
         else:
             return (-1,)
 
@@ -583,14 +528,18 @@ class TemperatureCtrl(interfaces.CompoWayFModule):
             )
 
     async def configure(self, config):
-        """Configure the thermal controller."""
+        """Configure the thermal controller.
+
+        The host and port of the controller are given when it is created,
+        from ``config.temp_ctrl``.
+        """
         self.log.debug("Setting config.")
-        self.host = config.host
-        self.port = config.port
+        self.rtt.max_timeout = config.timeout
 
     async def read_all_registers(self):
         """Read all of the registers."""
         if self.e5dc_b is not None:
+            self.telemetry_retry_policy.reset_budget()
             await self.e5dc_b.update_register()
         else:
             self.log.warning(
@@ -26,7 +26,13 @@ __all__ = [
     "CompoWayFOperationRegister",
 ]
 
-from .register import AsciiRegister
+import asyncio
+import functools
+import itertools
+import time
+
+from .codec import CompoWayFCodec
+from .register import AsciiRegister, reconnect_on_cancel
 
 
 class CompoWayFGeneralRegister(AsciiRegister):
@@ -72,9 +78,14 @@ class CompoWayFGeneralRegister(AsciiRegister):
         register and can be of int or str.
     register_value : `str`
         The value of the register as gotten by :meth:`get_register_value`.
+    codec : `CompoWayFCodec`
+        Decodes the response frames of the controller.
 
     """
 
+    codec = CompoWayFCodec()
+    set_mrc_src = ""
+
     def __init__(
         self,
         component=None,
@@ -133,17 +144,23 @@ class CompoWayFGeneralRegister(AsciiRegister):
 
     # Frame should be whole packet, without STX byte but WITH ETX byte
     def generate_bcc(self, frame):
-        if isinstance(frame, bytes):
-            self.log.error(f"bytes sent into generate_bcc, decoding... {frame}")
-            frame = frame.decode()
-        result = 0
-        for char in frame:
-            char = str(char)
-            char_in_int = int(ord(char))
-            result = result ^ char_in_int
-        return chr(result)
+        if isinstance(frame, str):
+            frame = frame.encode(self.codec.encoding)
+        return chr(self.codec.bcc(frame))
 
-    def compoway_cmd_frame(self, pdu_structure):
+    def encode_cmd_frame(self, pdu_structure):
+        """Encode a command frame.
+
+        Parameters
+        ----------
+        pdu_structure : `str`
+            The PDU of the command.
+
+        Returns
+        -------
+        cmd_frame : `bytes`
+            The frame, from STX through the BCC.
+        """
         if len(self.node) == 1:
             node = "0" + self.node
         elif len(self.node) == 2:
@@ -152,11 +169,12 @@ class CompoWayFGeneralRegister(AsciiRegister):
             raise ValueError(
                 f"Incorrect length of node, expected length 2, got {len(self.node)} {self.node}."
             )
-        cmd_frame = node + "00" + "0" + pdu_structure + "\x03"
-        cmd_frame = cmd_frame.upper()
-        cmd_frame = cmd_frame + self.generate_bcc(cmd_frame)
-        cmd_frame = "\x02" + cmd_frame
-        return cmd_frame
+        body = (node + "00" + "0" + pdu_structure).upper().encode(self.codec.encoding)
+        body += self.codec.ETX
+        return self.codec.STX + body + bytes([self.codec.bcc(body)])
+
+    def compoway_cmd_frame(self, pdu_structure):
+        return self.encode_cmd_frame(pdu_structure).decode(self.codec.encoding)
 
     def _create_get_message_generic(self, variable_code, read_address, read_elements):
         """Generate the message that will get the register value.
@@ -172,7 +190,7 @@ class CompoWayFGeneralRegister(AsciiRegister):
         cmd_txt = (
             MRC + SRC + variable_code + read_address + bit_position + read_elements
         )
-        get_message = self.compoway_cmd_frame(cmd_txt).upper()
+        get_message = self.compoway_cmd_frame(cmd_txt)
         self.log.debug(f"get_message={get_message}")
         return get_message
 
@@ -223,6 +241,166 @@ class CompoWayFGeneralRegister(AsciiRegister):
             "Function not implemented, you shouldn't be using the generic class"
         )
 
+    async def read_frame(self, mrc_src, sent=None):
+        """Read a response frame of the controller.
+
+        The frame is read through ETX and its BCC, and bytes received before
+        its STX, such as the terminator of the previous response, are
+        skipped.
+        The BCC is read on its own because it can be any byte, including
+        ETX, so it cannot delimit the frame, and the length of the frame is
+        not known before its end code is read.
+        The stream buffers the BCC along with the frame, so reading it does
+        not wait for the device again.
+        End and response codes other than normal completion are logged.
+        The frame must arrive within the timeout estimated from the round
+        trip times of the previous responses.
+
+        Parameters
+        ----------
+        mrc_src : `str`
+            The main and sub request codes of the command sent.
+        sent : `float` or `None`, optional
+            The monotonic time at which the command was written, used to
+            measure the round trip time, `None` if the response is queued
+            behind the responses to other commands.
+
+        Returns
+        -------
+        frame : `CompoWayFFrame`
+            The decoded frame.
+
+        Raises
+        ------
+        ValueError
+            Raised when the frame is malformed, its BCC does not match, or it
+            does not answer the command sent to the node.
+        TimeoutError
+            Raised when the frame is not received in time.
+        """
+        rtt = self.component.rtt
+        timeout = rtt.timeout
+        try:
+            async with asyncio.timeout(timeout):
+                data = await self.component.commander.readuntil(self.codec.ETX)
+                bcc = await self.component.commander.readexactly(1)
+        except TimeoutError:
+            rtt.record_timeout()
+            self.log.warning(
+                "No response from %s/%s within %.3f s.",
+                self.module_name,
+                self.register_name,
+                timeout,
+            )
+            raise
+        if sent is not None:
+            rtt.record(time.monotonic() - sent)
+        start = self.codec.find_start(data)
+        if start < 0:
+            raise ValueError(f"Received no start of packet: {bytes(data)!r}")
+        if start > 0:
+            self.log.debug(f"Skipped {bytes(data[:start])!r} before the frame.")
+        frame = self.codec.decode(memoryview(data)[start:], bcc[0])
+        self.end_code = frame.end_code
+        self.response_code = frame.response_code
+        self.cmd_txt = frame.data
+        self.bcc = chr(bcc[0])
+        expected_node = self.node.rjust(2, "\x30")
+        if frame.node != expected_node or frame.sub_address != "\x30\x30":
+            raise ValueError(
+                f"Received incorrect start of packet: {frame.node}{frame.sub_address}, "
+                f"expected: {expected_node}\x30\x30"
+            )
+        if frame.end_code != "\x30\x30":
+            self.log.error(
+                f"Received bad end code: {frame.end_code}: {self.get_end_code()}"
+            )
+            return frame
+        if frame.mrc_src != mrc_src:
+            raise ValueError(
+                f"Received incorrect Request Codes: {frame.mrc_src}, "
+                f"expected: {mrc_src}"
+            )
+        if frame.response_code != "\x30\x30\x30\x30":
+            self.log.error(
+                "Received bad response code: "
+                f"{frame.response_code}: {self.get_response()}"
+            )
+        return frame
+
+    async def exchange_frames(self, requests):
+        """Write messages back-to-back and read their responses, holding the
+        lock of the component from the first write to the last response.
+
+        A response that does not arrive in time may still arrive later, and
+        the responses after one that is not valid are left unread, so the
+        component reconnects before any error is raised, and when the
+        exchange is cancelled, for the next exchange not to read them.
+
+        Parameters
+        ----------
+        requests : `list` [`tuple` [`bytes`, `str`]]
+            The encoded messages, each with the main and sub request codes
+            of its command.
+
+        Returns
+        -------
+        frames : `list` [`CompoWayFFrame`]
+            The responses, in the order of the messages.
+
+        Raises
+        ------
+        ValueError
+            Raised when a response is not valid.
+        TimeoutError
+            Raised when a response is not received in time.
+        """
+        async with self.component.lock, reconnect_on_cancel(self.component):
+            sent = time.monotonic()
+            await self.component.commander.write(
+                b"".join(message for message, _ in requests)
+            )
+            frames = []
+            try:
+                for _, mrc_src in requests:
+                    # Only the first response measures the round trip time.
+                    frames.append(await self.read_frame(mrc_src, sent))
+                    sent = None
+            except Exception:
+                await self.component.reconnect()
+                raise
+            return frames
+
+    async def send_command(self, set_value=None, readback=True, force=False):
+        """Read the value of the register, after setting it if a value is
+        given.
+
+        Parameters
+        ----------
+        set_value : Any, optional
+            The value to set.
+        readback : `bool`, optional
+            Unused, `set_register_value` reads back the registers that can
+            be read.
+        force : `bool`, optional
+            Unused, the value is always set.
+
+        Returns
+        -------
+        None
+        """
+        if not self.component.connected:
+            raise RuntimeError("Not connected.")
+        if set_value is not None:
+            await self.set_register_value(set_value)
+        else:
+            await self.read()
+
+    async def _read_once(self):
+        if not await self.read_register_value():
+            raise ValueError(f"No valid value read from {self.register_name}.")
+        return self.register_value
+
     def get_response(self):
         translated_response = self.response_code
         if isinstance(self.response_code, bytes):
@@ -266,6 +444,9 @@ class CompoWayFDataRegister(CompoWayFGeneralRegister):
         register and can be of int or str.
     simulation_mode : `bool`
         A bool representing whether the register is in simulation mode or not.
+    elements : `int`, optional
+        The number of consecutive variables read from the address of the
+        register.
 
     Attributes
     ----------
@@ -288,8 +469,12 @@ class CompoWayFDataRegister(CompoWayFGeneralRegister):
     simulation_mode : `bool`
         A bool representing whether the register is in simulation mode or not.
         Only needed to append '\r' to string for the tcpip.client
-    register_value : `str`
-        The value of the register as gotten by :meth:`get_register_value`.
+    elements : `int`
+        The number of consecutive variables read from the address of the
+        register.
+    register_value : `int` or `tuple` [`int`]
+        The value of the register as gotten by :meth:`get_register_value`,
+        a tuple of the values of the variables if more than one is read.
 
     Raises
     --------
@@ -300,6 +485,11 @@ class CompoWayFDataRegister(CompoWayFGeneralRegister):
 
     """
 
+    # read variable area request MRC is 01, SRC is 01
+    get_mrc_src = "\x30\x31\x30\x31"
+    # write variable area request MRC is 01, SRC is 02
+    set_mrc_src = "\x30\x31\x30\x32"
+
     def __init__(
         self,
         component,
@@ -309,6 +499,7 @@ class CompoWayFDataRegister(CompoWayFGeneralRegister):
         read_only=True,
         accepted_values=None,
         simulation_mode=False,
+        elements=1,
     ) -> None:
         if read_only is False and isinstance(accepted_values, range) is False:
             raise TypeError("accepted_values must be type range")
@@ -323,17 +514,20 @@ class CompoWayFDataRegister(CompoWayFGeneralRegister):
         )
 
         self.simulation_mode = simulation_mode
+        self.elements = elements
 
         # Note this is hardcoding to read words of data instead of double words
         # If this changes to accommodate double words then multiple places in
         # the class need updating these places are denoted by comments as well
         self.variable_code_dict = {
             "Set Point": "\x38\x31",
+            "Monitor": "\x38\x30",
         }
 
         # Dictionary of implemented commands
         self.register_address_dict = {
             "Set Point": "\x30\x30\x30\x33",
+            "Monitor": "\x30\x30\x30\x30",
         }
 
         if (
@@ -358,10 +552,8 @@ class CompoWayFDataRegister(CompoWayFGeneralRegister):
         get_message: `bytes`
 
         """
-        # This read_elements setting only reads 1 word of data (4 digits)
-        # If this needs to change/be configurable in the future one way
-        # is to make a dictionary like its done for register address/variable
-        read_elements = "\x30\x30\x30\x31"
+        # Each element is 1 word of data (4 digits)
+        read_elements = f"{self.elements:04X}"
 
         get_message = self._create_get_message_generic(
             variable_code=self.variable_code,
@@ -372,6 +564,17 @@ class CompoWayFDataRegister(CompoWayFGeneralRegister):
         self.log.debug(f"get_message={get_message}")
         return get_message
 
+    @functools.cached_property
+    def get_frame(self):
+        """The encoded message that gets the register value.
+
+        The frame is built once and reused by every read.
+        """
+        get_frame = self.create_get_message().encode(self.codec.encoding)
+        if self.simulation_mode:
+            get_frame += b"\r"
+        return get_frame
+
     def create_set_message(self, set_value):
         """Create the message that sets the value of the register provided
         that it is not read only.
@@ -437,149 +640,98 @@ class CompoWayFDataRegister(CompoWayFGeneralRegister):
     async def read_register_value(self):
         """Read the value of the register.
 
+        Invalid replies are retried as allowed by the retry policy of the
+        component.
+
         Returns
         -------
-        None
+        valid : `bool`
+            Whether a valid reply was received.
         """
-        async with self.component.lock:
-            message = self.create_get_message()
+        retry_policy = self.component.retry_policy
+        for attempt in itertools.count():
+            if await self.read_register_value_once():
+                return True
+            if not retry_policy.allow(attempt):
+                self.log.error(f"Giving up reading {self.register_name}.")
+                return False
+            await retry_policy.wait(attempt)
+
+    async def read_register_value_once(self):
+        """Read the value of the register once.
 
-            if self.simulation_mode:
-                message += "\r"
+        Returns
+        -------
+        valid : `bool`
+            Whether the reply was valid.
+        """
+        try:
+            (frame,) = await self.exchange_frames([(self.get_frame, self.get_mrc_src)])
+        except Exception as e:
+            self.log.error(f"Message format not as expected. Message: {e}")
+            return False
+        return self.decode_value(frame)
 
-            await self.component.commander.write(
-                message.encode(self.component.commander.encoding)
-            )
+    def decode_value(self, frame):
+        """Decode the value of the register from the response to a get
+        message.
 
-            try:
-                stx_node_subadd = await self.component.commander.readexactly(5)
-                stx_node_subadd = stx_node_subadd.decode()
-                expected_stx_node_subadd = "\x02"
-                if int(self.node) < 10:
-                    expected_stx_node_subadd += "\x30"
-                expected_stx_node_subadd += self.node + "\x30\x30"
-                if stx_node_subadd is not expected_stx_node_subadd:
-                    self.log.error(
-                        f"Received incorrect start of packet: {stx_node_subadd}, "
-                        f"expected: {expected_stx_node_subadd}"
-                    )
-                    self.register_value = -1
-                self.end_code = await self.component.commander.readexactly(2)
-                self.end_code = self.end_code.decode()
-                mrc_src = await self.component.commander.readexactly(4)
-                mrc_src = mrc_src.decode()
-                # read variable area request MRC is 01, SRC is 01
-                expected_mrc_src = "\x30\x31\x30\x31"
-                if mrc_src is not expected_mrc_src:
-                    self.log.error(
-                        f"Received incorrect Request Codes: {mrc_src}, "
-                        f"expected: {expected_mrc_src}"
-                    )
-                    self.register_value = -1
-                self.response_code = await self.component.commander.readexactly(4)
-                self.response_code = self.response_code.decode()
-
-                self.cmd_txt = await self.component.commander.readuntil(b"\x03")
-                self.cmd_txt = self.cmd_txt.decode()
-                # trim off ETX byte
-                self.cmd_txt = self.cmd_txt[:-1]
-                try:
-                    self.register_value = int(self.cmd_txt, 16)
-                except Exception as e:
-                    self.log.error(
-                        f"Received no valid register value! {self.cmd_txt} {str(e)}"
-                    )
-                    self.register_value = -1
-
-                self.bcc = await self.component.commander.readexactly(1)
-                self.bcc = self.bcc.decode()
-
-                # bcc should be calculated without STX, but with ETX byte
-                bcc_frame = (
-                    stx_node_subadd.split("\x02")[1]
-                    + self.end_code
-                    + mrc_src
-                    + self.response_code
-                    + self.cmd_txt
-                    + "\x03"
-                )
-                expected_bcc = self.generate_bcc(bcc_frame)
-                if expected_bcc is not self.bcc:
-                    self.log.error(
-                        f"Incorrect BCC, got: {self.bcc}, expected: {expected_bcc}"
-                    )
-                    self.register_value = -1
-            except Exception as e:
-                self.log.error(f"Message format not as expected. Message: {e}")
-
-    async def handle_set_response(self):
-        async with self.component.lock:
-            try:
-                stx_node_subadd = await self.component.commander.readexactly(5)
-                stx_node_subadd = stx_node_subadd.decode()
-                expected_stx_node_subadd = "\x02"
-                if int(self.node) < 10:
-                    expected_stx_node_subadd += "\x30"
-                expected_stx_node_subadd += self.node + "\x30\x30"
-                if stx_node_subadd is not expected_stx_node_subadd:
-                    self.log.error(
-                        f"Received incorrect start of packet: {stx_node_subadd}, "
-                        f"expected: {expected_stx_node_subadd}"
-                    )
-                    self.register_value = ""
-                self.end_code = await self.component.commander.readexactly(2)
-                self.end_code = self.end_code.decode()
-                if self.end_code != "\x30\x30":
-                    self.log.error(
-                        f"Received bad end code: {self.end_code}: {self.end_code_dict[self.end_code]}"
-                    )
-
-                mrc_src = await self.component.commander.readexactly(4)
-                mrc_src = mrc_src.decode()
-                # write variable area request MRC is 01, SRC is 02
-                expected_mrc_src = "\x30\x31\x30\x32"
-                if mrc_src is not expected_mrc_src:
-                    self.log.error(
-                        f"Received incorrect Request Codes: {mrc_src}, "
-                        f"expected: {expected_mrc_src}"
-                    )
-                self.response_code = await self.component.commander.readexactly(4)
-                self.response_code = self.response_code.decode()
-
-                if self.response_code != "\x30\x30\x30\x30":
-                    self.log.error(
-                        "Received bad response code: "
-                        f"{self.response_code}: {self.response_dict[self.response_code]}"
-                    )
-
-                etx = await self.component.commander.readuntil(b"\x03")
-                etx = etx.decode()
-
-                if etx != "\x03":
-                    self.log.error(f"Received bad ETX: {etx} expected: \x03")
-
-                self.bcc = await self.component.commander.readexactly(1)
-                self.bcc = self.bcc.decode()
-
-                # bcc should be calculated without STX, but with ETX byte
-                bcc_frame = (
-                    stx_node_subadd.split("\x02")[1]
-                    + self.end_code
-                    + mrc_src
-                    + self.response_code
-                    + "\x03"
-                )
-                expected_bcc = self.generate_bcc(bcc_frame)
-                if expected_bcc is not self.bcc:
-                    self.log.error(
-                        f"Incorrect BCC, got: {self.bcc}, expected: {expected_bcc}"
-                    )
-            except Exception as e:
-                print(f"handle_set_response excepted: {e}")
+        Parameters
+        ----------
+        frame : `CompoWayFFrame`
+            The response.
+
+        Returns
+        -------
+        valid : `bool`
+            Whether the response holds a valid value, in which case
+            ``read_time`` is updated.
+        """
+        if not frame.is_normal:
+            return False
+        try:
+            if self.elements == 1:
+                self.register_value = int(frame.data, 16)
+            else:
+                self.register_value = self.decode_words(frame.data)
+        except ValueError as e:
+            self.log.error(f"Received no valid register value! {frame.data} {str(e)}")
+            self.register_value = -1
+            return False
+        self.read_time = time.monotonic()
+        return True
+
+    def decode_words(self, data):
+        """Decode the values of the variables read.
+
+        Parameters
+        ----------
+        data : `str`
+            The data of the response, 4 hexadecimal digits per variable.
+
+        Returns
+        -------
+        values : `tuple` [`int`]
+            The unsigned values of the variables.
+
+        Raises
+        ------
+        ValueError
+            Raised when the data does not hold one word per variable.
+        """
+        if len(data) != 4 * self.elements:
+            raise ValueError(f"Expected {self.elements} words, got {len(data)} digits.")
+        return tuple(int(data[i : i + 4], 16) for i in range(0, len(data), 4))
 
     async def set_register_value(self, set_value):
         """Set the value of the register and read the new value.
 
+        The set and get messages are written back-to-back, and both
+        responses read, in one hold of the lock of the component, so that no
+        other exchange can take the response to the set.
+        If the value read back is not valid, it is read again as allowed by
+        the retry policy of the component.
+
         Parameters
         ----------
         set_value : Any
@@ -599,20 +751,27 @@ class CompoWayFDataRegister(CompoWayFGeneralRegister):
         if self.read_only:
             raise PermissionError("This register is read only.")
         if not self.simulation_mode:
+            message = self.create_set_message(set_value)
+            self.log.debug(f"sending message {message}.")
             try:
-                async with self.component.lock:
-                    message = self.create_set_message(set_value)
-                    self.log.debug(f"sending message {message}.")
-                    await self.component.commander.write(
-                        message.encode(self.component.commander.encoding)
-                    )
-                await self.handle_set_response()
-                await self.read_register_value()
+                _, frame = await self.exchange_frames(
+                    [
+                        (message.encode(self.codec.encoding), self.set_mrc_src),
+                        (self.get_frame, self.get_mrc_src),
+                    ]
+                )
+                valid = self.decode_value(frame)
             except TimeoutError:
                 self.log.exception("Response timed out.")
                 raise
+            except ValueError as e:
+                self.log.error(f"set_register_value excepted: {e}")
+                valid = False
+            if not valid:
+                await self.read_register_value()
         else:
-            self.register_value = set_value
+            # Hold the word that a get message would read.
+            self.register_value = int(set_value * 10) & 0xFFFF
 
 
 class CompoWayFOperationRegister(CompoWayFGeneralRegister):
@@ -668,6 +827,9 @@ class CompoWayFOperationRegister(CompoWayFGeneralRegister):
 
     """
 
+    # write operation command MRC is 30, SRC is 05
+    set_mrc_src = "\x33\x30\x30\x35"
+
     def __init__(
         self,
         component,
@@ -759,71 +921,6 @@ class CompoWayFOperationRegister(CompoWayFGeneralRegister):
         # can't read operational registers
         raise Exception("Can't read operational registers")
 
-    async def handle_set_response(self):
-        async with self.component.lock:
-            try:
-                stx_node_subadd = await self.component.commander.readexactly(5)
-                stx_node_subadd = stx_node_subadd.decode()
-                expected_stx_node_subadd = "\x02"
-                if int(self.node) < 10:
-                    expected_stx_node_subadd += "\x30"
-                expected_stx_node_subadd += self.node + "\x30\x30"
-                if stx_node_subadd is not expected_stx_node_subadd:
-                    self.log.error(
-                        f"Received incorrect start of packet: {stx_node_subadd}, "
-                        f"expected: {expected_stx_node_subadd}"
-                    )
-                    self.register_value = ""
-                self.end_code = await self.component.commander.readexactly(2)
-                self.end_code = self.end_code.decode()
-                if self.end_code != "\x30\x30":
-                    self.log.error(
-                        f"Received bad end code: {self.end_code}: {self.end_code_dict[self.end_code]}"
-                    )
-
-                mrc_src = await self.component.commander.readexactly(4)
-                mrc_src = mrc_src.decode()
-                # write variable area request MRC is 30, SRC is 05
-                expected_mrc_src = "\x33\x30\x30\x35"
-                if mrc_src is not expected_mrc_src:
-                    self.log.error(
-                        f"Received incorrect Request Codes: {mrc_src}, "
-                        f"expected: {expected_mrc_src}"
-                    )
-                self.response_code = await self.component.commander.readexactly(4)
-                self.response_code = self.response_code.decode()
-
-                if self.response_code != "\x30\x30\x30\x30":
-                    self.log.error(
-                        "Received bad response code: "
-                        f"{self.response_code}: {self.response_dict[self.response_code]}"
-                    )
-
-                etx = await self.component.commander.readuntil(b"\x03")
-                etx = etx.decode()
-
-                if etx != "\x03":
-                    self.log.error(f"Received bad ETX: {etx} expected: \x03")
-
-                self.bcc = await self.component.commander.readexactly(1)
-                self.bcc = self.bcc.decode()
-
-                # bcc should be calculated without STX, but with ETX byte
-                bcc_frame = (
-                    stx_node_subadd.split("\x02")[1]
-                    + self.end_code
-                    + mrc_src
-                    + self.response_code
-                    + "\x03"
-                )
-                expected_bcc = self.generate_bcc(bcc_frame)
-                if expected_bcc is not self.bcc:
-                    self.log.error(
-                        f"Incorrect BCC, got: {self.bcc}, expected: {expected_bcc}"
-                    )
-            except Exception as e:
-                print(f"handle_set_response excepted: {e}")
-
     def get_related_info(self, set_value):
         chosen_dict = None
         # RUN/STOP
@@ -862,17 +959,17 @@ class CompoWayFOperationRegister(CompoWayFGeneralRegister):
         """
         if self.read_only:
             raise PermissionError("This register is read only.")
+        message = self.create_set_message(set_value)
+        self.log.debug(f"sending message {message}.")
+        if self.simulation_mode:
+            message += "\r"
         try:
-            async with self.component.lock:
-                message = self.create_set_message(set_value)
-                self.log.debug(f"sending message {message}.")
-                if self.simulation_mode:
-                    message += "\r"
-                await self.component.commander.write(
-                    message.encode(self.component.commander.encoding)
-                )
-            await self.handle_set_response()
+            await self.exchange_frames(
+                [(message.encode(self.codec.encoding), self.set_mrc_src)]
+            )
         except TimeoutError:
             self.log.exception("Response timed out.")
             raise TimeoutError
+        except ValueError as e:
+            self.log.error(f"set_register_value excepted: {e}")
         self.register_value = set_value
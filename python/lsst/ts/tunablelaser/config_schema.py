@@ -27,7 +27,7 @@ CONFIG_SCHEMA = yaml.safe_load(
     """
 $schema: http://json-schema.org/draft-07/schema#
 $id: https://github.com/lsst-ts/ts_TunableLaser/blob/master/schema/TunableLaser.yaml
-title: TunableLaser v4
+title: TunableLaser v5
 description: Schema for TunableLaser configuration files
 type: object
 properties:
@@ -42,8 +42,18 @@ properties:
     description: Port for the TCPIP server.
     type: integer
   timeout:
-    description: Timeout for the TCP/IP client.
+    description: >-
+      The longest time to wait for a reply of the laser or the temperature
+      controller (seconds).
+      Replies are awaited for an estimate of the round trip time, up to this.
     type: number
+  warmup_timeout:
+    description: >-
+      The longest time to wait for the laser to propagate after starting the
+      propagation (seconds).
+    type: number
+    exclusiveMinimum: 0
+    default: 10
   optical_configuration:
     description: The mirror alignment configuration for the laser
     enum: ["SCU","No SCU","F1 SCU","F1 No SCU","F2 SCU","F2 No SCU"]
@@ -25,13 +25,18 @@
 __all__ = ["run_tunablelaser", "LaserCSC"]
 
 import asyncio
+import contextlib
+import math
 
 from lsst.ts import salobj, utils
 from lsst.ts.xml.enums import TunableLaser
 
 from . import __version__, component, mock_server
 from .config_schema import CONFIG_SCHEMA
-from .enums import SimulationMode
+from .enums import LockPriority, Power, SimulationMode
+from .lock import lock_priority
+from .scan import ScanStep
+from .wizardry import WAVELENGTH_ACK_MARGIN, WAVELENGTH_SETTLE_TIMEOUT
 
 
 def run_tunablelaser():
@@ -67,6 +72,8 @@ class LaserCSC(salobj.ConfigurableCsc):
         The amount of time to wait for telemetry to publish.
     telemetry_task : `asyncio.Future`
         The task that tracks the state of the telemetry loop.
+    scan_task : `asyncio.Future`
+        The task that runs the current wavelength scan.
     simulator : `MainLaserServer` or `StubbsLaserServer`
         The mock simulator if in simulation mode.
 
@@ -96,6 +103,7 @@ class LaserCSC(salobj.ConfigurableCsc):
         self.thermal_ctrl = None
         self.telemetry_rate = 1
         self.telemetry_task = utils.make_done_future()
+        self.scan_task = utils.make_done_future()
         self.simulator = None
         self.thermal_ctrl_simulator = None
         self.laser_type = None
@@ -109,56 +117,120 @@ class LaserCSC(salobj.ConfigurableCsc):
         return self.model is not None and self.model.connected
 
     async def telemetry(self):
-        """Send out the TunableLaser's telemetry."""
+        """Send out the TunableLaser's telemetry.
+
+        The registers are polled every scheduler tick, so that a fault is
+        caught within a tick, while the telemetry is published every
+        ``telemetry_rate`` seconds.
+        The ticks follow a fixed cadence of the monotonic clock, so the
+        telemetry is published at predictable times.
+        The thermal controller is read concurrently with the laser in the
+        ticks that publish telemetry.
+        The reads yield the devices to commands waiting for them.
+        """
+        lock_priority.set(LockPriority.TELEMETRY)
+        scheduler = self.model.scheduler
+        scheduler.reset()
+        publish_ticks = max(1, round(self.telemetry_rate / scheduler.tick))
+        next_publish_tick = 0
         while True:
             try:
                 if not self.model.connected and self.model.should_be_connected:
                     await self.fault(code=4, report="Device lost connection.")
                     return
-                self.log.debug("Telemetry updating")
-                await self.model.read_all_registers()
-                await self.thermal_ctrl.read_all_registers()
-                self.log.info(self.fc_client.response)
-                self.log.info(self.la_client.response)
-                self.log.debug(f"model={self.model}")
-                self.log.debug(
-                    f"detailed_state={self.evt_detailedState.data.detailedState}"
-                )
+                publish = scheduler.tick_count >= next_publish_tick
+                if publish:
+                    next_publish_tick += publish_ticks * math.ceil(
+                        (scheduler.tick_count + 1 - next_publish_tick) / publish_ticks
+                    )
+                    snapshot, _ = await asyncio.gather(
+                        self.model.poll(), self.thermal_ctrl.read_all_registers()
+                    )
+                else:
+                    snapshot = await self.model.poll()
                 if (
-                    self.model.cpu8000.power_register.register_value == "FAULT"
-                    or self.model.m_cpu800.power_register.register_value == "FAULT"
-                    or self.model.m_cpu800.power_register_2.register_value == "FAULT"
+                    snapshot[self.model.cpu8000.power_register] == Power.FAULT
+                    or snapshot[self.model.m_cpu800.power_register] == Power.FAULT
+                    or snapshot[self.model.m_cpu800.power_register_2] == Power.FAULT
                 ):
                     await self.fault(
                         code=TunableLaser.LaserErrorCode.HW_CPU_ERROR,
                         report=(
-                            f"cpu8000 fault:{self.model.cpu8000.fault_register.register_value}"
-                            f"m_cpu800 fault:{self.model.m_cpu800.fault_register.register_value}"
-                            f"m_cpu800 fault2:{self.model.m_cpu800.fault_register_2.register_value}"
+                            f"cpu8000 fault:{snapshot[self.model.cpu8000.fault_register]}"
+                            f"m_cpu800 fault:{snapshot[self.model.m_cpu800.fault_register]}"
+                            f"m_cpu800 fault2:{snapshot[self.model.m_cpu800.fault_register_2]}"
                         ),
                     )
                     return
-                await self.tel_wavelength.set_write(
-                    wavelength=float(self.model.wavelength)
-                )
-                await self.tel_temperature.set_write(
-                    tk6_temperature=float(self.model.temperature[0]),
-                    tk6_temperature_2=float(self.model.temperature[1]),
-                    ldco48bp_temperature=float(self.model.temperature[2]),
-                    ldco48bp_temperature_2=float(self.model.temperature[3]),
-                    ldco48bp_temperature_3=float(self.model.temperature[4]),
-                    m_ldco48_temperature=float(self.model.temperature[5]),
-                    m_ldco48_temperature_2=float(self.model.temperature[6]),
-                )
-                await self.tel_scannerTemperature.set_write(
-                    scanner_temperature=float(self.thermal_ctrl.temperature[0]),
-                )
-                self.log.debug("Telemetry updated")
+                if publish:
+                    await self.publish_telemetry(snapshot)
             except Exception:
                 self.log.exception("Telemetry loop failed.")
                 await self.fault(code=4, report="Telemetry loop failed.")
                 return
-            await asyncio.sleep(self.telemetry_rate)
+            missed = await scheduler.wait_next_tick()
+            if missed:
+                self.log.warning(
+                    f"Telemetry tick overran, skipped {missed} tick(s); "
+                    f"{scheduler.overruns} overrun(s) so far."
+                )
+
+    async def publish_telemetry(self, snapshot):
+        """Publish the telemetry of the laser and the thermal controller.
+
+        The thermal controller must have been read before.
+        A topic is not published until every register it holds has a valid
+        value, as a register keeps no value while its replies are garbled.
+
+        Parameters
+        ----------
+        snapshot : `RegisterSnapshot`
+            The latest register values of the laser.
+        """
+        self.log.debug("Telemetry updating")
+        self.log.info(self.fc_client.response)
+        self.log.info(self.la_client.response)
+        self.log.debug(f"model={self.model}")
+        self.log.debug(f"detailed_state={self.evt_detailedState.data.detailedState}")
+        self.log.debug(
+            "command lock wait: "
+            f"{self.model.lock.wait_statistics[LockPriority.COMMAND]}"
+        )
+        self.log.debug(
+            f"laser retries: telemetry {self.model.telemetry_retry_policy}, "
+            f"commands {self.model.command_retry_policy}"
+        )
+        self.log.debug(f"laser round trip: {self.model.rtt}")
+        self.log.debug(f"thermal_ctrl={self.thermal_ctrl.e5dc_b}")
+        writes = [
+            self.tel_scannerTemperature.set_write(
+                scanner_temperature=float(self.thermal_ctrl.temperature[0]),
+            )
+        ]
+        wavelength = snapshot.get(self.model.wavelength_register)
+        if wavelength is None:
+            self.log.debug("No valid wavelength yet, not publishing it.")
+        else:
+            writes.append(self.tel_wavelength.set_write(wavelength=wavelength))
+        temperature = [
+            snapshot.get(register) for register in self.model.temperature_registers
+        ]
+        if None in temperature:
+            self.log.debug("No valid temperatures yet, not publishing them.")
+        else:
+            writes.append(
+                self.tel_temperature.set_write(
+                    tk6_temperature=temperature[0],
+                    tk6_temperature_2=temperature[1],
+                    ldco48bp_temperature=temperature[2],
+                    ldco48bp_temperature_2=temperature[3],
+                    ldco48bp_temperature_3=temperature[4],
+                    m_ldco48_temperature=temperature[5],
+                    m_ldco48_temperature_2=temperature[6],
+                )
+            )
+        await asyncio.gather(*writes)
+        self.log.debug("Telemetry updated")
 
     def assert_substate(self, substates, action):
         """Assert that the action is happening while in the PropagatingState.
@@ -183,8 +255,33 @@ class LaserCSC(salobj.ConfigurableCsc):
                 f"{action} not allowed in state {self.evt_detailedState.data.detailedState!r}"
             )
 
+    def assert_no_scan(self, action):
+        """Assert that no wavelength scan is running.
+
+        Parameters
+        ----------
+        action : `str`
+            The name of the command being sent.
+
+        Raises
+        ------
+        `salobj.ExpectedError`
+            Raised when a scan is running.
+        """
+        if not self.scan_task.done():
+            raise salobj.ExpectedError(
+                f"{action} not allowed while a scan is running."
+            )
+
     async def handle_summary_state(self):
-        """Handle the summary state transitons."""
+        """Handle the summary state transitons.
+
+        A wavelength scan is aborted in every state but ENABLED.
+        The registers which only change when they are set are read again
+        when the CSC is enabled.
+        """
+        if self.summary_state != salobj.State.ENABLED:
+            await self.abort_scan()
         if self.disabled_or_enabled:
             if self.simulation_mode:
                 if self.simulator is None:
@@ -239,6 +336,9 @@ class LaserCSC(salobj.ConfigurableCsc):
                 await self.publish_new_detailed_state(
                     TunableLaser.LaserDetailedState.NONPROPAGATING_CONTINUOUS_MODE
                 )
+            if self.summary_state == salobj.State.ENABLED:
+                scheduler = self.model.scheduler
+                scheduler.expedite(scheduler.static_registers)
             if self.telemetry_task.done():
                 self.telemetry_task = asyncio.create_task(self.telemetry())
             if self.fc_task.done():
@@ -274,6 +374,7 @@ class LaserCSC(salobj.ConfigurableCsc):
             The command data.
         """
         self.assert_enabled()
+        self.assert_no_scan("setBurstMode")
         if self.connected:
             await self.model.set_burst_mode(data.count)
             await self.evt_burstModeSet.set_write()
@@ -306,6 +407,7 @@ class LaserCSC(salobj.ConfigurableCsc):
             The command data.
         """
         self.assert_enabled()
+        self.assert_no_scan("setContinuousMode")
         if self.connected:
             await self.model.set_continuous_mode()
             await self.evt_continuousModeSet.set_write()
@@ -315,14 +417,26 @@ class LaserCSC(salobj.ConfigurableCsc):
     async def do_changeWavelength(self, data):
         """Change the wavelength of the laser.
 
+        The time the wavelength took to settle is reported in the result of
+        the final acknowledgement.
+
         Parameters
         ----------
         data
         """
         self.assert_enabled()
+        self.assert_no_scan("changeWavelength")
         if self.connected:
-            await self.model.change_wavelength(data.wavelength)
+            await self.cmd_changeWavelength.ack_in_progress(
+                data=data, timeout=WAVELENGTH_SETTLE_TIMEOUT + WAVELENGTH_ACK_MARGIN
+            )
+            settle_time = await self.model.change_wavelength(data.wavelength)
             await self.evt_wavelengthChanged.set_write(wavelength=data.wavelength)
+            return self.salinfo.make_ackcmd(
+                private_seqNum=data.private_seqNum,
+                ack=salobj.SalRetCode.CMD_COMPLETE,
+                result=f"Wavelength settled in {settle_time:.2f}s.",
+            )
         else:
             raise salobj.ExpectedError("Not connected")
 
@@ -363,6 +477,7 @@ class LaserCSC(salobj.ConfigurableCsc):
             "stopPropagateLaser",
         )
         if self.connected:
+            await self.abort_scan()
             await self.model.stop_propagating()
             if (
                 self.evt_detailedState.data.detailedState
@@ -381,6 +496,65 @@ class LaserCSC(salobj.ConfigurableCsc):
         else:
             raise salobj.ExpectedError("Not connected.")
 
+    async def run_scan(self, steps):
+        """Run a wavelength scan while propagating in burst mode.
+
+        The whole scan runs in the CSC, so the steps do not pay the round
+        trip of a command each.
+        There is no command for a scan in the SAL interface, so this is
+        meant to be called by code running alongside the CSC.
+        Every step is checked against the limits of the laser before the
+        scan starts, and the commands which change the wavelength or the
+        propagation mode are rejected while the scan runs.
+
+        Parameters
+        ----------
+        steps : `list` [`ScanStep`]
+            The steps of the scan.
+
+        Raises
+        ------
+        salobj.ExpectedError
+            Raised when the laser is not connected, a scan is already
+            running, or a step is out of the limits of the laser.
+        asyncio.CancelledError
+            Raised when the scan is aborted.
+        """
+        self.assert_enabled()
+        self.assert_substate(
+            [TunableLaser.LaserDetailedState.PROPAGATING_BURST_MODE],
+            "scan",
+        )
+        if not self.connected:
+            raise salobj.ExpectedError("Not connected.")
+        if not self.scan_task.done():
+            raise salobj.ExpectedError("A scan is already running.")
+        steps = [ScanStep(*step) for step in steps]
+        wavelengths = self.model.wavelength_register.accepted_values
+        burst_counts = self.model.m_cpu800.burst_length_register.accepted_values
+        for index, step in enumerate(steps):
+            if (
+                int(step.wavelength) not in wavelengths
+                or step.burst_count not in burst_counts
+            ):
+                raise salobj.ExpectedError(
+                    f"Scan step {index + 1} is out of range: {step}; "
+                    f"wavelength limits are {wavelengths}, "
+                    f"burst count limits are {burst_counts}."
+                )
+        self.scan_task = asyncio.create_task(self.model.run_scan(steps))
+        await self.scan_task
+
+    async def abort_scan(self):
+        """Abort the wavelength scan, if one is running, and wait for it to
+        end.
+        """
+        if not self.scan_task.done():
+            self.log.info("Aborting the wavelength scan.")
+            self.scan_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self.scan_task
+
     async def do_clearLaserFault(self, data):
         """Clear the hardware fault state of the laser by turning the power
         register off.
@@ -402,6 +576,7 @@ class LaserCSC(salobj.ConfigurableCsc):
             [TunableLaser.LaserDetailedState.PROPAGATING_BURST_MODE],
             "Trigger",
         )
+        self.assert_no_scan("triggerBurst")
         await self.model.trigger_burst()
 
     async def do_changeTempCtrlSetpoint(self, data):
@@ -472,6 +647,7 @@ class LaserCSC(salobj.ConfigurableCsc):
             port=config.temp_ctrl["port"],
             simulation_mode=bool(self.simulation_mode),
         )
+        await self.thermal_ctrl.configure(config)
 
     @staticmethod
     def get_config_pkg():
@@ -19,7 +19,17 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-__all__ = ["Power", "Mode", "Output", "OpticalConfiguration", "SimulationMode"]
+__all__ = [
+    "Error",
+    "ErrorPolicy",
+    "Power",
+    "Mode",
+    "Output",
+    "OpticalConfiguration",
+    "SimulationMode",
+    "PollPriority",
+    "LockPriority",
+]
 
 import enum
 
@@ -31,7 +41,27 @@ class SimulationMode(enum.IntEnum):
 
 
 class Error(enum.IntEnum):
-    pass
+    """The codes of the error replies of the laser."""
+
+    TIMEOUT = 8
+    """A module of the laser did not answer in time."""
+    TOP_LIMIT = 11
+    """The value is above the top limit of the register."""
+    BOTTOM_LIMIT = 12
+    """The value is below the bottom limit of the register."""
+    WRONG_VALUE = 13
+    """The value is not included in the allowed values of the register."""
+
+
+class ErrorPolicy(enum.Enum):
+    """How to handle an error reply of the laser."""
+
+    RETRY = enum.auto()
+    """Send the message again after a delay."""
+    FAIL = enum.auto()
+    """Raise the error without sending the message again."""
+    RECONNECT = enum.auto()
+    """Reconnect to the laser before sending the message again."""
 
 
 class Power(enum.StrEnum):
@@ -79,3 +109,29 @@ class OpticalConfiguration(enum.StrEnum):
     """Pass the beam to F1 output."""
     F2_NO_SCU = "F2 No SCU"
     """Pass the beam to F2 output."""
+
+
+class PollPriority(enum.IntEnum):
+    """The priority of a register read by the polling scheduler.
+
+    Lower values are more important.
+    """
+
+    HIGH = 1
+    """Registers that report faults and the propagation state."""
+    MEDIUM = 2
+    """Registers that report the state of the laser."""
+    LOW = 3
+    """Registers that change slowly, like temperatures."""
+
+
+class LockPriority(enum.IntEnum):
+    """The priority of a task waiting for the lock of a device.
+
+    Lower values are more important.
+    """
+
+    COMMAND = 1
+    """Commands sent to the device."""
+    TELEMETRY = 2
+    """Reads done to publish telemetry."""
@@ -19,16 +19,41 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-__all__ = ["Laser", "CompoWayFModule"]
+__all__ = ["TcpipComponent", "Laser", "CompoWayFModule"]
 
+import asyncio
+import itertools
+import time
 from abc import ABC, abstractmethod
 
 from lsst.ts import tcpip
-from lsst.ts.tunablelaser.wizardry import NUMBER_OF_RETRIES
-
-
-class Laser(ABC):
-    """Implement common Laser interface.
+from lsst.ts.tunablelaser.wizardry import (
+    FAULT_POLL_PERIOD,
+    REGISTER_MAX_AGE,
+    RETRY_BUDGET,
+    STATUS_POLL_PERIOD,
+    TEMPERATURE_POLL_PERIOD,
+    WARMUP_ACK_MARGIN,
+)
+from lsst.ts.xml.enums.TunableLaser import LaserDetailedState
+
+from .enums import LockPriority, Mode, PollPriority, Power
+from .lock import lock_priority
+from .register import AsciiRegister, RegisterSnapshot, read_registers_pipelined
+from .retry import RetryPolicy
+from .rtt import RttEstimator
+from .scan import ScanStep
+from .scheduler import PollingScheduler
+from .transaction import Transaction
+
+
+class TcpipComponent(ABC):
+    """Implement the connection of a component over TCP/IP.
+
+    The laser and the CompoWayF module share the retries of their
+    exchanges, the estimate of the time to wait for a reply and the
+    connection.
+    The subclasses provide the ``host``, ``port`` and ``lock`` attributes.
 
     Parameters
     ----------
@@ -39,7 +64,7 @@ class Laser(ABC):
     encoding : `str`
         The type of encoding to use.
     simulation_mode : `bool`, optional
-        Is the laser being simulated?
+        Is the component being simulated?
 
     Attributes
     ----------
@@ -52,11 +77,23 @@ class Laser(ABC):
     log : `logging.Logger`
         The log of the component.
     simulation_mode : `bool`
-        Is the laser being simulated?
+        Is the component being simulated?
     commander : `lsst.ts.tcpip.Client`
         A TCP/IP client.
+    telemetry_retry_policy : `RetryPolicy`
+        Retries the exchanges of the telemetry with the component, with a
+        budget per telemetry sweep.
+    command_retry_policy : `RetryPolicy`
+        Retries the exchanges of the commands with the component.
+    connect_retry_policy : `RetryPolicy`
+        Retries the connection to the component.
+    rtt : `RttEstimator`
+        Estimates the time to wait for a reply of the component.
     """
 
+    name = "component"
+    """The name of the component in the log."""
+
     def __init__(self, csc, terminator, encoding, simulation_mode=False) -> None:
         self.csc = csc
         self.terminator = terminator
@@ -64,6 +101,99 @@ class Laser(ABC):
         self.log = csc.log
         self.simulation_mode = simulation_mode
         self.commander = tcpip.Client(host="", port=0, log=self.log)
+        self.telemetry_retry_policy = RetryPolicy(budget=RETRY_BUDGET)
+        self.command_retry_policy = RetryPolicy()
+        self.connect_retry_policy = RetryPolicy()
+        self.rtt = RttEstimator()
+
+    @property
+    def connected(self):
+        """Is the component connected?"""
+        return self.commander.connected
+
+    @property
+    def retry_policy(self):
+        """The retry policy of the exchanges of the current task.
+
+        The telemetry, which runs with `LockPriority.TELEMETRY`, retries
+        within the budget of its sweep, and the commands retry on their
+        own, so that neither spends the retries of the other.
+        """
+        if lock_priority.get() == LockPriority.TELEMETRY:
+            return self.telemetry_retry_policy
+        return self.command_retry_policy
+
+    async def disconnect(self):
+        """Disconnect from the component."""
+        await self.commander.close()
+        self.commander = tcpip.Client(host="", port=0, log=self.log)
+
+    async def connect(self):
+        """Connect to the component, retrying as the connect retry policy
+        allows.
+        """
+        for attempt in itertools.count():
+            try:
+                self.commander = tcpip.Client(
+                    host=self.host,
+                    port=self.port,
+                    log=self.log,
+                    terminator=bytes(self.terminator),
+                    encoding=self.encoding,
+                )
+                await self.commander.start_task
+            except Exception:
+                self.log.exception("Connection failed.")
+            if self.commander.connected or not self.connect_retry_policy.allow(attempt):
+                break
+            await self.connect_retry_policy.wait(attempt)
+
+    async def reconnect(self):
+        """Reconnect to the component, discarding any reply not read yet."""
+        self.log.warning(f"Reconnecting to the {self.name}.")
+        async with self.lock:
+            await self.disconnect()
+            await self.connect()
+
+
+class Laser(TcpipComponent):
+    """Implement common Laser interface.
+
+    Every laser has the CPU8000, M_CPU800, TK6, HV40W and DelayLin modules,
+    which the subclasses create as the ``cpu8000``, ``m_cpu800``, ``tk6``,
+    ``hv40w`` and ``delay_lin`` attributes.
+
+    Parameters
+    ----------
+    csc : `LaserCSC`
+        The CSC object.
+    terminator : `bytes`
+        The characters that terminate sent/received messages.
+    encoding : `str`
+        The type of encoding to use.
+    simulation_mode : `bool`, optional
+        Is the laser being simulated?
+
+    Attributes
+    ----------
+    register_snapshot : `RegisterSnapshot`
+        The latest register values of the laser.
+    scheduler : `PollingScheduler`
+        Schedules the reads of the registers during telemetry.
+    laser_warmup_delay : `float`
+        The longest time to wait for the laser to propagate [s].
+    warmup_time : `float` or `None`
+        The time the laser took to propagate at the last start [s].
+    """
+
+    name = "laser"
+
+    def __init__(self, csc, terminator, encoding, simulation_mode=False) -> None:
+        super().__init__(csc, terminator, encoding, simulation_mode)
+        self.register_snapshot = RegisterSnapshot()
+        self.scheduler = PollingScheduler(tick=FAULT_POLL_PERIOD)
+        self.laser_warmup_delay = 10
+        self.warmup_time = None
 
     @property
     @abstractmethod
@@ -71,15 +201,46 @@ class Laser(ABC):
         """Is the laser propagating?"""
         raise NotImplementedError
 
-    @property
-    def connected(self):
-        """Is the laser connected?"""
-        return self.commander.connected
-
     @property
     def should_be_connected(self):
         return self.commander.should_be_connected
 
+    @property
+    def modules(self):
+        """The canbus modules of the laser, in the order they were added."""
+        return [
+            value for value in vars(self).values() if isinstance(value, CanbusModule)
+        ]
+
+    @property
+    def registers(self):
+        """The registers of every canbus module of the laser."""
+        return [register for module in self.modules for register in module.registers]
+
+    @property
+    def fault_registers(self):
+        """The registers that report a fault of the laser."""
+        return (
+            self.cpu8000.power_register,
+            self.cpu8000.fault_register,
+            self.m_cpu800.power_register,
+            self.m_cpu800.fault_register,
+            self.m_cpu800.power_register_2,
+            self.m_cpu800.fault_register_2,
+        )
+
+    @property
+    @abstractmethod
+    def wavelength_register(self):
+        """The register that holds the wavelength."""
+        raise NotImplementedError
+
+    @property
+    @abstractmethod
+    def temperature_registers(self):
+        """The registers that hold the temperature sensors."""
+        raise NotImplementedError
+
     @property
     @abstractmethod
     def wavelength(self):
@@ -100,6 +261,11 @@ class Laser(ABC):
         ----------
         wavelength: `float`
             The value to change the wavelength.
+
+        Returns
+        -------
+        settle_time : `float`
+            The time the wavelength took to settle [s].
         """
         raise NotImplementedError
 
@@ -125,49 +291,236 @@ class Laser(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def start_propagating(self):
-        """Start propagating the laser."""
+    def set_burst_count(self, count):
+        """Set the burst count."""
         raise NotImplementedError
 
-    @abstractmethod
-    def stop_propagating(self):
-        """Stop propagating the laser."""
-        raise NotImplementedError
+    async def start_propagating(self, data):
+        """Start propagating the beam of the laser.
 
-    @abstractmethod
-    def clear_fault(self):
-        """Clear the fault state of the laser."""
-        raise NotImplementedError
+        If the laser does not propagate within the warmup timeout, it is
+        turned off again.
+
+        Parameters
+        ----------
+        data : `DataType`
+            The data of the startPropagateLaser command.
+
+        Raises
+        ------
+        TimeoutError
+            Raised when the laser does not propagate within the warmup
+            timeout.
+        """
+        await self.m_cpu800.start_propagating()
+        await self.csc.cmd_startPropagateLaser.ack_in_progress(
+            data=data, timeout=self.laser_warmup_delay + WARMUP_ACK_MARGIN
+        )
+        start = time.monotonic()
+        try:
+            mode = await self.m_cpu800.wait_until_propagating(
+                timeout=self.laser_warmup_delay
+            )
+        except TimeoutError:
+            self.log.error("Laser did not propagate in time, turning it off.")
+            await self.m_cpu800.stop_propagating()
+            raise
+        self.warmup_time = time.monotonic() - start
+        self.log.info(
+            f"Laser propagating in {mode} mode after {self.warmup_time:.2f}s."
+        )
+        if mode == Mode.CONTINUOUS:
+            await self.csc.publish_new_detailed_state(
+                LaserDetailedState.PROPAGATING_CONTINUOUS_MODE
+            )
+        else:
+            await self.csc.publish_new_detailed_state(
+                LaserDetailedState.PROPAGATING_BURST_MODE
+            )
+
+    async def stop_propagating(self):
+        """Stop propagating the beam of the laser."""
+        await self.m_cpu800.stop_propagating()
+
+    async def clear_fault(self):
+        """Clear the fault state of the laser by turning its power off."""
+        power = await self.m_cpu800.power_register_2.get(max_age=REGISTER_MAX_AGE)
+        if power == Power.FAULT:
+            await self.m_cpu800.power_register_2.send_command(Power.OFF, force=True)
 
     @abstractmethod
     def configure(self, config):
         """Configure the laser."""
         raise NotImplementedError
 
-    async def disconnect(self):
-        """Disconnect from the laser."""
-        await self.commander.close()
-        self.commander = tcpip.Client(host="", port=0, log=self.log)
+    def add_polling_tiers(self, status=(), temperature=(), static=()):
+        """Add the registers of the laser to the tiers of the scheduler.
+
+        The registers of the modules that every laser has are added along
+        with the registers given.
+
+        Parameters
+        ----------
+        status : `list` [`AsciiRegister`], optional
+            Other registers to poll every `STATUS_POLL_PERIOD` seconds.
+        temperature : `list` [`AsciiRegister`], optional
+            Other registers to poll every `TEMPERATURE_POLL_PERIOD` seconds.
+        static : `list` [`AsciiRegister`], optional
+            Other registers which only change when they are set.
+        """
+        self.scheduler.add(
+            self.fault_registers,
+            period=FAULT_POLL_PERIOD,
+            priority=PollPriority.HIGH,
+        )
+        self.scheduler.add(
+            [
+                self.wavelength_register,
+                self.m_cpu800.continous_burst_mode_trigger_burst_register,
+                self.m_cpu800.output_energy_level_register,
+                self.m_cpu800.burst_pulse_left_register,
+                self.m_cpu800.burst_length_register,
+                self.cpu8000.display_current_register,
+                self.m_cpu800.display_current_register,
+                self.m_cpu800.display_current_register_2,
+                self.delay_lin.error_code_register,
+                *status,
+            ],
+            period=STATUS_POLL_PERIOD,
+            priority=PollPriority.MEDIUM,
+        )
+        self.scheduler.add(
+            [
+                *self.temperature_registers,
+                self.tk6.set_temperature_register,
+                self.tk6.set_temperature_register_2,
+                self.hv40w.hv_voltage_register,
+                *temperature,
+            ],
+            period=TEMPERATURE_POLL_PERIOD,
+            priority=PollPriority.LOW,
+        )
+        self.scheduler.add(
+            [
+                self.m_cpu800.frequency_divider_register,
+                self.m_cpu800.qsw_adjustment_output_delay_register,
+                self.m_cpu800.repetition_rate_register,
+                self.m_cpu800.synchronization_mode_register,
+                *static,
+            ],
+            period=None,
+            priority=PollPriority.LOW,
+        )
+
+    async def read_registers(self, registers):
+        """Read a set of registers across modules as one batch.
+
+        Parameters
+        ----------
+        registers : `list` [`AsciiRegister`]
+            The registers to read.
+
+        Returns
+        -------
+        snapshot : `RegisterSnapshot`
+            The values of the registers read.
+        """
+        return await read_registers_pipelined(registers)
+
+    async def snapshot(self):
+        """Read every register of the laser as one batch.
+
+        Returns
+        -------
+        snapshot : `RegisterSnapshot`
+            The values of every register of the laser.
+        """
+        self.register_snapshot = await self.read_registers(self.registers)
+        return self.register_snapshot
+
+    async def poll(self):
+        """Read the registers that the scheduler says are due.
+
+        Each poll is a telemetry sweep, so it refills the budget of retries.
+
+        Returns
+        -------
+        snapshot : `RegisterSnapshot`
+            The latest values of every register read so far.
+        """
+        registers = self.scheduler.due()
+        self.telemetry_retry_policy.reset_budget()
+        start = time.monotonic()
+        snapshot = await self.read_registers(registers)
+        self.scheduler.record_read(len(registers), time.monotonic() - start)
+        self.register_snapshot = self.register_snapshot.merged(snapshot)
+        return self.register_snapshot
+
+    async def read_all_registers(self):
+        """Read every register of the laser.
+
+        Returns
+        -------
+        snapshot : `RegisterSnapshot`
+            The values of every register of the laser.
+        """
+        return await self.snapshot()
+
+    async def run_scan(self, steps):
+        """Run a wavelength scan.
+
+        The laser is first put in burst mode, with the burst count of the
+        first step.
+        At each step the wavelength is changed and allowed to settle, the
+        burst count is set if it differs from the previous step, a burst is
+        triggered and the laser dwells.
+        The progress is reported by the wavelengthChanged and burstCountSet
+        events, and the log.
+        The scan is aborted by cancelling the task running it.
+
+        Parameters
+        ----------
+        steps : `list` [`ScanStep`]
+            The steps of the scan.
+        """
+        steps = [ScanStep(*step) for step in steps]
+        if not steps:
+            return
+        burst_count = steps[0].burst_count
+        await self.set_burst_mode(burst_count)
+        for index, step in enumerate(steps):
+            await self.change_wavelength(step.wavelength)
+            await self.csc.evt_wavelengthChanged.set_write(wavelength=step.wavelength)
+            if step.burst_count != burst_count:
+                await self.set_burst_count(step.burst_count)
+                burst_count = step.burst_count
+            await self.trigger_burst()
+            self.log.info(
+                f"Scan step {index + 1}/{len(steps)}: "
+                f"wavelength={step.wavelength} burst_count={step.burst_count}."
+            )
+            await asyncio.sleep(step.dwell)
 
     async def connect(self):
-        """Connect to the laser."""
+        """Connect to the laser, or to the simulator in simulation mode."""
         if self.csc.simulation_mode:
             self.host = self.csc.simulator.host
             self.port = self.csc.simulator.port
-        for _ in range(NUMBER_OF_RETRIES):
-            try:
-                self.commander = tcpip.Client(
-                    host=self.host,
-                    port=self.port,
-                    log=self.log,
-                    terminator=bytes(self.terminator),
-                    encoding=self.encoding,
-                )
-                await self.commander.start_task
-            except Exception:
-                self.log.exception("Connection failed.")
-            if self.commander.connected:
-                break
+        await super().connect()
+
+    def transaction(self):
+        """Return a transaction which holds the lock of the laser for a
+        group of exchanges.
+
+        Returns
+        -------
+        transaction : `Transaction`
+            The transaction, to use with ``async with``.
+        """
+        return Transaction(self)
+
+    def __str__(self):
+        return str(self.register_snapshot)
 
 
 class CanbusModule(ABC):
@@ -188,12 +541,37 @@ class CanbusModule(ABC):
         self.component = component
         super().__init__()
 
+    @property
+    def registers(self):
+        """The registers of the module, in the order they were added."""
+        return [
+            value for value in vars(self).values() if isinstance(value, AsciiRegister)
+        ]
+
+    async def read_registers(self, registers=None):
+        """Read registers of the module as one batch.
+
+        Parameters
+        ----------
+        registers : `list` [`AsciiRegister`], optional
+            The registers to read, all of the registers of the module if
+            not given.
+
+        Returns
+        -------
+        snapshot : `RegisterSnapshot`
+            The values of the registers read.
+        """
+        if registers is None:
+            registers = self.registers
+        return await read_registers_pipelined(registers)
+
     async def update_register(self):
         """Update the registers located in the canbus module."""
-        pass
+        await self.read_registers()
 
 
-class CompoWayFModule(ABC):
+class CompoWayFModule(TcpipComponent):
     """Implement CompoWayF Module.
 
     Parameters
@@ -207,36 +585,14 @@ class CompoWayFModule(ABC):
     simulation_mode : `bool`, optional
         Is the laser being simulated?
 
-    Attributes
-    ----------
-    csc : `LaserCSC`
-        The CSC object.
-    terminator : `bytes`
-        The characters that terminate sent/received messages.
-    encoding : `str`
-        The type of encoding to use.
-    log : `logging.Logger`
-        The log of the component.
-    simulation_mode : `bool`
-        Is the module being simulated?
-    commander : `lsst.ts.tcpip.Client`
-        A TCP/IP client.
     """
 
+    name = "module"
+
     def __init__(
         self, csc, terminator=b"\x03", encoding="utf-8", simulation_mode=False
     ) -> None:
-        self.csc = csc
-        self.encoding = encoding
-        self.log = csc.log
-        self.simulation_mode = simulation_mode
-        self.terminator = terminator
-        self.commander = tcpip.Client(host="", port=0, log=self.log)
-
-    @property
-    def connected(self):
-        """Is the module connected?"""
-        return self.commander.connected
+        super().__init__(csc, terminator, encoding, simulation_mode)
 
     @property
     @abstractmethod
@@ -249,19 +605,8 @@ class CompoWayFModule(ABC):
         """Configure the module."""
         raise NotImplementedError
 
-    async def disconnect(self):
-        """Disconnect from the module."""
-        await self.commander.close()
-        self.commander = tcpip.Client(host="", port=0, log=self.log)
-
     async def connect(self):
-        """Connect to the module."""
-        if self.host is not None:
-            self.commander = tcpip.Client(
-                host=self.host,
-                port=self.port,
-                log=self.log,
-                terminator=bytes(self.terminator),
-                encoding=self.encoding,
-            )
-            await self.commander.start_task
+        """Connect to the module, unless it has no host."""
+        if self.host is None:
+            return
+        await super().connect()
@@ -0,0 +1,179 @@
+# This file is part of ts_tunablelaser.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Software.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Implements the lock that serializes the exchanges with a device.
+
+Notes
+-----
+Commands and telemetry share the connection of a device.
+The lock hands the connection to the waiting task with the most important
+`LockPriority`, so a command does not wait behind the reads queued for
+telemetry.
+The priority of a task is taken from `lock_priority`, so the code that
+takes the lock does not need to know who is calling it.
+"""
+__all__ = ["PriorityLock", "WaitStatistics", "lock_priority"]
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import time
+
+from .enums import LockPriority
+
+lock_priority = contextvars.ContextVar("lock_priority", default=LockPriority.COMMAND)
+"""The priority with which the current task acquires a `PriorityLock`."""
+
+
+class WaitStatistics:
+    """Statistics of the time spent waiting for a lock.
+
+    Attributes
+    ----------
+    count : `int`
+        The number of times the lock was acquired.
+    total : `float`
+        The total time spent waiting [s].
+    maximum : `float`
+        The longest time spent waiting [s].
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    @property
+    def mean(self):
+        """The mean time spent waiting [s]."""
+        return self.total / self.count if self.count else 0.0
+
+    def record(self, wait):
+        """Record the time spent waiting for the lock.
+
+        Parameters
+        ----------
+        wait : `float`
+            The time spent waiting [s].
+        """
+        self.count += 1
+        self.total += wait
+        self.maximum = max(self.maximum, wait)
+
+    def __str__(self):
+        return (
+            f"count={self.count} mean={self.mean * 1000:.1f}ms "
+            f"max={self.maximum * 1000:.1f}ms"
+        )
+
+
+class PriorityLock:
+    """A lock that is handed to the waiting task with the most important
+    priority.
+
+    Tasks of the same priority acquire the lock in the order they asked for
+    it.
+    The lock is reentrant: the task that holds it can acquire it again, and
+    must release it as many times.
+    The lock is used like `asyncio.Lock`.
+
+    Attributes
+    ----------
+    wait_statistics : `dict` [`LockPriority`, `WaitStatistics`]
+        The time spent waiting for the lock, by priority.
+    """
+
+    def __init__(self):
+        self._locked = False
+        self._owner = None
+        self._depth = 0
+        self._waiters = []
+        self._counter = itertools.count()
+        self.wait_statistics = {priority: WaitStatistics() for priority in LockPriority}
+
+    def locked(self):
+        """Is the lock acquired?"""
+        return self._locked
+
+    async def acquire(self, priority=None):
+        """Acquire the lock.
+
+        Parameters
+        ----------
+        priority : `LockPriority`, optional
+            The priority of the task, `lock_priority` if not given.
+
+        Returns
+        -------
+        `True`
+        """
+        task = asyncio.current_task()
+        if self._locked and self._owner is task:
+            self._depth += 1
+            return True
+        if priority is None:
+            priority = lock_priority.get()
+        start = time.monotonic()
+        if self._locked:
+            future = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._waiters, (priority, next(self._counter), future))
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    # The lock was handed over before the cancellation.
+                    self.release()
+                raise
+        else:
+            self._locked = True
+        self._owner = task
+        self._depth = 1
+        self.wait_statistics[LockPriority(priority)].record(time.monotonic() - start)
+        return True
+
+    def release(self):
+        """Release the lock, handing it to the most important waiting task.
+
+        Raises
+        ------
+        RuntimeError
+            Raised when the lock is not acquired.
+        """
+        if not self._locked:
+            raise RuntimeError("Lock is not acquired.")
+        if self._depth > 1:
+            self._depth -= 1
+            return
+        self._owner = None
+        self._depth = 0
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(True)
+                return
+        self._locked = False
+
+    async def __aenter__(self):
+        await self.acquire()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.release()
@@ -377,11 +377,24 @@ class MockNP5450:
         The temperature of the laser.
     log : `logging.Logger`
         The log for this class.
+    ambient_temperature : `int`
+        The process value when stopped [0.1 C].
+    status : `int`
+        The status bits of the controller.
+    heater_current : `int`
+        The current of the heater [0.1 A].
+    manipulated_value : `int`
+        The heating output when running [0.1 %].
     """
 
     def __init__(self):
         self.e5dcb_setpoint_temperature = random.randrange(1, 100)
         self.run_stop = False
+        # monitor values, in tenths of their unit
+        self.ambient_temperature = 200
+        self.status = 0
+        self.heater_current = 15
+        self.manipulated_value = 500
         self.log = logging.getLogger(__name__)
         self.log.debug("NP5450 initialized")
 
@@ -436,14 +449,14 @@ class MockNP5450:
             parameter = None
 
             if split_msg.MRC == "\x30\x31":
-                if int(split_msg.num_of_elements) != 1:
-                    raise ValueError(
-                        "More than 1 number of element read/write not supported"
-                    )
-
+                num_of_elements = int(split_msg.num_of_elements, 16)
                 if split_msg.SRC == "\x30\x31":
                     command_name += "get_"
                 elif split_msg.SRC == "\x30\x32":
+                    if num_of_elements != 1:
+                        raise ValueError(
+                            "More than 1 number of element write not supported"
+                        )
                     parameter = split_msg.write_data
                     command_name += "set_"
 
@@ -453,6 +466,15 @@ class MockNP5450:
                     # set point
                     if split_msg.address == "\x30\x30\x30\x33":
                         command_name += "sp"
+                elif split_msg.var_type == "\x38\x30":
+                    # monitor values, read from the process value on
+                    if split_msg.address == "\x30\x30\x30\x30":
+                        command_name += "monitor"
+                        parameter = num_of_elements
+                if num_of_elements != 1 and parameter != num_of_elements:
+                    raise ValueError(
+                        f"{num_of_elements} elements not supported by {command_name}"
+                    )
             elif split_msg.MRC == "\x33\x30":
                 # operation msg
                 if split_msg.SRC == "\x30\x35":
@@ -508,6 +530,43 @@ class MockNP5450:
         returnmsg = "\x02" + returnmsg + bcc
         return returnmsg
 
+    def do_get_01_monitor(self, num_of_elements):
+        """Return the monitor values, from the process value on.
+
+        Parameters
+        ----------
+        num_of_elements : `int`
+            The number of values to read.
+
+        Returns
+        -------
+        returnmsg : `str`
+            The response frame.
+        """
+        set_point = self.e5dcb_setpoint_temperature
+        if isinstance(set_point, str):
+            set_point = int(set_point, 16)
+        else:
+            set_point = int(set_point * 10)
+        process_value = set_point if self.run_stop else self.ambient_temperature
+        values = [
+            process_value,
+            self.status,
+            set_point,
+            self.heater_current,
+            self.manipulated_value if self.run_stop else 0,
+        ][:num_of_elements]
+        returnmsg = "\x30\x31" + "\x30\x30"
+        returnmsg += "\x30\x30"  # end code
+        returnmsg += "\x30\x31\x30\x31"  # mrc/src
+        returnmsg += "\x30\x30\x30\x30"  # response code
+        returnmsg += "".join(f"{value & 0xFFFF:04X}" for value in values)
+        returnmsg += "\x03"  # ETX
+        bcc_maker = CompoWayFGeneralRegister()
+        bcc = bcc_maker.generate_bcc(frame=returnmsg)
+        returnmsg = "\x02" + returnmsg + bcc
+        return returnmsg
+
     def do_set_op_01_runstop(self, data):
         run_stop_related_info = {
             True: "\x30\x30",  # on
@@ -1338,6 +1397,12 @@ class MockNT900:
     def do_tk6_45_display_temperature(self):
         return f"{self.temperature}"
 
+    def do_tk6_44_set_temperature(self):
+        return f"{self.temperature}C"
+
+    def do_tk6_45_set_temperature(self):
+        return f"{self.temperature}C"
+
     def do_set_temperature(self):
         """Change setpoint temperature as formatted string.
 
@@ -30,10 +30,93 @@ The most important classes are the `TCPIPClient` class and the `AsciiRegister`
 class as they contain the bulk of the functionality.
 
 """
-__all__ = ["AsciiRegister"]
+__all__ = [
+    "AsciiRegister",
+    "ReplyError",
+    "RegisterSnapshot",
+    "read_registers_pipelined",
+    "current_transaction",
+    "reconnect_on_cancel",
+]
+import asyncio
+import contextlib
+import contextvars
+import enum
+import functools
+import itertools
 import logging
+import math
+import time
+import types
+from collections.abc import Mapping
 
-from .wizardry import NUMBER_OF_RETRIES
+from .codec import AsciiCodec
+from .enums import Error, ErrorPolicy
+from .lock import lock_priority
+from .wizardry import (
+    PIPELINE_WINDOW,
+    REGISTER_MAX_AGE,
+    SETTLE_MAX_POLL_PERIOD,
+    SETTLE_MIN_POLL_PERIOD,
+)
+
+current_transaction = contextvars.ContextVar("current_transaction", default=None)
+"""The `Transaction` of the current task, `None` outside of transactions."""
+
+
+@contextlib.asynccontextmanager
+async def reconnect_on_cancel(component):
+    """Reconnect to a component if the task is cancelled while replies of
+    the component are outstanding.
+
+    The replies not read would otherwise be read by the next exchange, as
+    replies to other messages.
+    The lock of the component must be held, from before the messages are
+    written until their replies are read.
+
+    Parameters
+    ----------
+    component : `Laser`
+        The component which the messages are written to.
+    """
+    try:
+        yield
+    except asyncio.CancelledError:
+        await component.reconnect()
+        raise
+
+
+class ReplyError(RuntimeError):
+    """Raised when the laser replies to a message with an error.
+
+    Parameters
+    ----------
+    register : `AsciiRegister`
+        The register that the message was sent to.
+    reply : `AsciiReply`
+        The error reply.
+
+    Attributes
+    ----------
+    register : `AsciiRegister`
+        The register that the message was sent to.
+    reply : `AsciiReply`
+        The error reply.
+    code : `Error` or `int`
+        The code of the error, as an `Error` if it is known.
+    """
+
+    def __init__(self, register, reply):
+        super().__init__(
+            f"{register.module_name}/{register.module_id}/{register.register_name}: "
+            f"{reply.value}"
+        )
+        self.register = register
+        self.reply = reply
+        try:
+            self.code = Error(reply.error_code)
+        except ValueError:
+            self.code = reply.error_code
 
 
 class AsciiRegister:
@@ -59,6 +142,11 @@ class AsciiRegister:
         If read_only is set to true then this parameter can be None. If not,
         this parameter must contain a list of values accepted by this
         register and can be of int or str.
+    value_type : `type`, optional
+        The type of the value of the register, for instance `float`, `int`
+        or an enumeration of `enums`.
+    unit : `str`, optional
+        The unit of the value of the register, empty if it has none.
     simulation_mode : `bool`, optional
         A bool representing whether the register is in simulation mode or not.
         Currently is not implemented.
@@ -84,11 +172,34 @@ class AsciiRegister:
     simulation_mode : `bool`
         A bool representing whether the register is in simulation mode or not.
         Currently has a basic implementation.
-    register_value : `str`
+    value_type : `type`
+        The type of the value of the register.
+    unit : `str`
+        The unit of the value of the register.
+    register_value : ``value_type``
         The value of the register as gotten by :meth:`get_register_value`.
+    read_time : `float` or `None`
+        The monotonic time at which ``register_value`` was read from the
+        laser, `None` if it was never read.
+    unverified_value : ``value_type`` or `None`
+        The value set without reading it back, until the register is read
+        again.
+    set_time : `float` or `None`
+        The monotonic time at which the laser acknowledged the last set of
+        the register, `None` if it was never set.
+    codec : `AsciiCodec`
+        Decodes the replies of the laser.
 
     """
 
+    codec = AsciiCodec()
+    error_policies = {
+        Error.TIMEOUT: ErrorPolicy.RETRY,
+        Error.TOP_LIMIT: ErrorPolicy.FAIL,
+        Error.BOTTOM_LIMIT: ErrorPolicy.FAIL,
+        Error.WRONG_VALUE: ErrorPolicy.FAIL,
+    }
+
     def __init__(
         self,
         component,
@@ -97,6 +208,8 @@ class AsciiRegister:
         register_name,
         read_only=True,
         accepted_values=None,
+        value_type=str,
+        unit="",
     ):
         self.component = component
         self.log = logging.getLogger(f"{register_name.replace(' ', '')}Register")
@@ -109,9 +222,137 @@ class AsciiRegister:
                 "If read_only is false than accepted_values should not be None."
             )
         self.accepted_values = accepted_values
+        self.value_type = value_type
+        self.unit = unit
         self.register_value = None
+        self.read_time = None
+        self.unverified_value = None
+        self.set_time = None
+        self._set_frames = {}
+        self._read = None
+        self._read_priority = None
         self.log.debug(f"{self.register_name} Register initialized")
 
+    @property
+    def age(self):
+        """The time since the value of the register was read [s].
+
+        `math.inf` if the register was never read.
+        """
+        if self.read_time is None:
+            return math.inf
+        return time.monotonic() - self.read_time
+
+    def is_fresh(self, max_age):
+        """Is the cached value of the register recent enough?
+
+        Parameters
+        ----------
+        max_age : `float`
+            The maximum age of the cached value [s].
+
+        Returns
+        -------
+        `bool`
+        """
+        return self.age <= max_age
+
+    async def get(self, max_age=None):
+        """Return the value of the register, reading it only if needed.
+
+        Parameters
+        ----------
+        max_age : `float` or `None`, optional
+            The maximum age of the cached value [s].
+            If the cached value is older, or `None` is given,
+            the register is read from the laser.
+
+        Returns
+        -------
+        register_value : ``value_type``
+            The value of the register.
+        """
+        if max_age is None or not self.is_fresh(max_age):
+            await self.send_command()
+        return self.register_value
+
+    async def wait_until_settled(self, target, tolerance, stable_reads, timeout):
+        """Poll the register until its value settles on a target.
+
+        The value is settled once it is within the tolerance of the target
+        for ``stable_reads`` consecutive reads.
+        While the value is far from the target, the register is polled at a
+        rate adapted to how fast the value approaches the target, between
+        `SETTLE_MIN_POLL_PERIOD` and `SETTLE_MAX_POLL_PERIOD`.
+
+        Parameters
+        ----------
+        target : `float`
+            The value to settle on.
+        tolerance : `float`
+            The largest difference from the target that counts as settled.
+        stable_reads : `int`
+            The number of consecutive reads within tolerance.
+        timeout : `float`
+            The longest time to wait [s].
+
+        Returns
+        -------
+        settle_time : `float`
+            The time it took the value to settle [s].
+
+        Raises
+        ------
+        TimeoutError
+            Raised when the value does not settle within the timeout.
+        """
+        # Settling on the target verifies a value set without readback.
+        self.unverified_value = None
+        start = time.monotonic()
+        reads_in_tolerance = 0
+        last_distance = None
+        last_read_time = None
+        while True:
+            await self.send_command()
+            try:
+                distance = abs(float(self.register_value) - target)
+            except ValueError:
+                distance = math.inf
+            if distance <= tolerance:
+                reads_in_tolerance += 1
+                if reads_in_tolerance >= stable_reads:
+                    return self.read_time - start
+                period = SETTLE_MIN_POLL_PERIOD
+            else:
+                reads_in_tolerance = 0
+                period = SETTLE_MAX_POLL_PERIOD
+                if last_distance is not None and distance < last_distance:
+                    speed = (last_distance - distance) / (
+                        self.read_time - last_read_time
+                    )
+                    # Poll about twice before the value reaches the target.
+                    period = min(
+                        max((distance - tolerance) / speed / 2, SETTLE_MIN_POLL_PERIOD),
+                        SETTLE_MAX_POLL_PERIOD,
+                    )
+            last_distance = distance
+            last_read_time = self.read_time
+            remaining = timeout - (time.monotonic() - start)
+            if remaining <= 0:
+                raise TimeoutError(
+                    f"{self.register_name}={self.register_value} did not settle "
+                    f"on {target} within {timeout}s."
+                )
+            await asyncio.sleep(min(period, remaining))
+
+    @functools.cached_property
+    def get_frame(self):
+        """The encoded message that gets the register value.
+
+        The frame is built once and reused by every read.
+        """
+        return self.create_get_message().encode("ascii")
+
     def create_get_message(self):
         """Generate the message that will get the register value.
 
@@ -120,9 +361,7 @@ class AsciiRegister:
         get_message: `bytes`
 
         """
-        get_message = f"/{self.module_name}/{self.module_id}/{self.register_name}\r"
-        self.log.debug(f"get_message={get_message}")
-        return get_message
+        return f"/{self.module_name}/{self.module_id}/{self.register_name}\r"
 
     def create_set_message(self, set_value):
         """Create the message that sets the value of the register provided
@@ -152,13 +391,57 @@ class AsciiRegister:
                 f"/{self.module_name}/{self.module_id}/{self.register_name}/"
                 f"{set_value}\r"
             )
-            self.log.debug(f"set_message={set_message}")
+            self.log.debug("set_message=%r", set_message)
             return set_message
         else:
             raise PermissionError("This register is read only.")
 
-    async def send_command(self, set_value=None):
-        """Read the value of the register.
+    def create_set_frame(self, set_value):
+        """Return the encoded message that sets the register value.
+
+        The frames of enumerated values are built once and reused.
+
+        Parameters
+        ----------
+        set_value : Any
+
+        Raises
+        ------
+        PermissionError
+            Indicates that the register is read only.
+        ValueError
+            Indicates that the value received is not in the acceptable values
+            for the register.
+
+        Returns
+        -------
+        set_frame : `bytes`
+        """
+        set_frame = self._set_frames.get(set_value)
+        if set_frame is None:
+            set_frame = self.create_set_message(set_value).encode("ascii")
+            if isinstance(set_value, enum.Enum):
+                self._set_frames[set_value] = set_frame
+        return set_frame
+
+    async def send_command(self, set_value=None, readback=True, force=False):
+        """Read the value of the register, after setting it if a value is
+        given.
+
+        A set is skipped when the register was read within the last
+        `REGISTER_MAX_AGE` seconds and already holds the value.
+
+        Parameters
+        ----------
+        set_value : Any, optional
+            The value to set.
+        readback : `bool`, optional
+            Whether to read the register after setting it.
+            If not, a set acknowledged by the laser is trusted, and the value
+            is verified by the next read of the register, which the polling
+            scheduler of the component does at its next tick.
+        force : `bool`, optional
+            Whether to set the value even if the register already holds it.
 
         Returns
         -------
@@ -166,40 +449,613 @@ class AsciiRegister:
         """
         if not self.component.connected:
             raise RuntimeError("Not connected.")
-        async with self.component.lock:
-            if set_value:
-                message = self.create_set_message(set_value=set_value)
-                await self.component.commander.write(
-                    message.encode(self.component.commander.encoding)
+        if set_value:
+            set_frame = self.create_set_frame(set_value)
+            if (
+                not force
+                and self.is_fresh(REGISTER_MAX_AGE)
+                and self.register_value == self.value_type(set_value)
+            ):
+                self.log.debug(
+                    "%s already holds %r, skipping set.", self.register_name, set_value
                 )
-                msg = await self.component.commander.read_str()
-                self.log.debug(f"{msg=}")
-                if msg.startswith("'''"):
-                    for _ in range(NUMBER_OF_RETRIES):
-                        await self.component.commander.write(
-                            message.encode(self.component.commander.encoding)
-                        )
-                        msg = await self.component.commander.read_str()
-                        if not msg.startswith("'''"):
-                            break
-            message = self.create_get_message()
-            await self.component.commander.write(
-                message.encode(self.component.commander.encoding)
+                return
+            transaction = self.transaction()
+            if transaction is not None:
+                transaction.queue_set(self, set_frame, set_value, readback)
+                return
+            await self.exchange(set_frame, self.codec.decode)
+            self.set_time = time.monotonic()
+            if not readback:
+                self.trust_value(set_value)
+                return
+            # A read in flight may have started before the set, so read the
+            # value back on its own.
+            reply = await self.exchange(self.get_frame, self.decode_reply)
+            self.update_value(reply.value, time.monotonic())
+            return
+        await self.read()
+
+    async def read(self):
+        """Read the value of the register from the laser.
+
+        A read that starts while another read of the register is in flight,
+        including a pipelined read, waits for the reply of that read instead
+        of sending the get message again, unless the read in flight was
+        started with a less important `lock_priority`, so that a command
+        does not wait behind telemetry.
+
+        Returns
+        -------
+        register_value : ``value_type``
+            The value read.
+        """
+        transaction = self.transaction()
+        if transaction is not None:
+            # A read in flight waits for the lock held by the transaction.
+            await transaction.flush()
+            return await self._read_once()
+        read = self._joinable_read()
+        if read is None:
+            read = asyncio.ensure_future(self._read_once())
+            self._start_read(read)
+        return await asyncio.shield(read)
+
+    async def _read_once(self):
+        reply = await self.exchange(self.get_frame, self.decode_reply)
+        self.update_value(reply.value, time.monotonic())
+        return reply.value
+
+    def _joinable_read(self):
+        """Return the read in flight that the current task may wait for.
+
+        Returns
+        -------
+        read : `asyncio.Future` or `None`
+            The future of the read in flight, `None` if there is none, or
+            it was started with a less important priority than the
+            `lock_priority` of the current task.
+        """
+        if (
+            self._read is None
+            or self._read.done()
+            or self._read_priority > lock_priority.get()
+        ):
+            return None
+        return self._read
+
+    def _start_read(self, read):
+        """Mark a read of the register as in flight until it is done.
+
+        The read is done with the `lock_priority` of the current task.
+
+        Parameters
+        ----------
+        read : `asyncio.Future`
+            The future of the value read.
+        """
+        self._read = read
+        self._read_priority = lock_priority.get()
+        read.add_done_callback(self._read_done)
+
+    def _read_done(self, read):
+        if self._read is read:
+            self._read = None
+        # Callers may all have been cancelled, so retrieve the exception
+        # to not have it logged as never retrieved.
+        if not read.cancelled():
+            read.exception()
+
+    def transaction(self):
+        """Return the transaction of the current task on the component.
+
+        Returns
+        -------
+        transaction : `Transaction` or `None`
+            The transaction, `None` if the current task has no transaction
+            on the component of the register.
+            Tasks started in a transaction are not part of it.
+        """
+        transaction = current_transaction.get()
+        if (
+            transaction is not None
+            and transaction.component is self.component
+            and transaction.task is asyncio.current_task()
+        ):
+            return transaction
+        return None
+
+    def trust_value(self, set_value):
+        """Take a value acknowledged by the laser as the register value,
+        until the register is read again.
+
+        Parameters
+        ----------
+        set_value : Any
+            The value set.
+        """
+        self.register_value = self.unverified_value = self.value_type(set_value)
+        self.read_time = None
+        self.component.scheduler.expedite([self])
+
+    def update_value(self, value, read_time):
+        """Store a value read from the laser.
+
+        A value set without reading it back is verified against the value
+        read.
+        A value read before the last set of the register, by a pipelined
+        read which let the set through between two windows, is dropped.
+
+        Parameters
+        ----------
+        value : ``value_type``
+            The value read.
+        read_time : `float`
+            The monotonic time at which the value was read.
+
+        Returns
+        -------
+        updated : `bool`
+            Whether the value was stored.
+        """
+        if self.set_time is not None and read_time < self.set_time:
+            self.log.debug(
+                "Dropping %s=%r read before its last set.", self.register_name, value
             )
-            msg = await self.component.commander.read_str()
-            if msg.startswith("'''"):
-                for _ in range(NUMBER_OF_RETRIES):
-                    await self.component.commander.write(
-                        message.encode(self.component.commander.encoding)
-                    )
-                    msg = await self.component.commander.read_str()
-                    self.log.debug(f"{msg=}")
-                    if not msg.startswith("'''"):
-                        break
-            self.register_value = msg
-            if self.register_value is None:
-                raise TimeoutError
-            self.register_value = self.register_value.rstrip("nmC\r\n")
+            return False
+        if self.unverified_value is not None:
+            if value != self.unverified_value:
+                self.log.warning(
+                    "%s/%s/%s was set to %r but reads %r.",
+                    self.module_name,
+                    self.module_id,
+                    self.register_name,
+                    self.unverified_value,
+                    value,
+                )
+            self.unverified_value = None
+        self.register_value = value
+        self.read_time = read_time
+        return True
+
+    async def exchange(self, frame, decode):
+        """Write a message and read its reply, handling error replies.
+
+        Error replies are handled according to `error_policy`, and retried
+        as allowed by the retry policy of the component.
+        A reply that does not arrive in time may still arrive later, so the
+        component reconnects, whether or not the message is retried.
+        The lock of the component is only held while the message is written
+        and its reply read, so other messages can be sent while waiting to
+        retry.
+        If the exchange is cancelled before the reply is read, the component
+        reconnects, so the reply is not read by the next exchange.
+
+        Parameters
+        ----------
+        frame : `bytes`
+            The encoded message.
+        decode : callable
+            Decodes the reply.
+
+        Returns
+        -------
+        reply : `AsciiReply`
+            The decoded reply.
+
+        Raises
+        ------
+        ReplyError
+            Raised when the error cannot be retried, or keeps happening
+            after the retries allowed.
+        TimeoutError
+            Raised when no reply is received in time after the retries
+            allowed.
+        """
+        for attempt in itertools.count():
+            try:
+                async with self.component.lock, reconnect_on_cancel(self.component):
+                    sent = time.monotonic()
+                    await self.component.commander.write(frame)
+                    reply = decode(await self.read_reply(sent))
+            except TimeoutError:
+                # The reply may still arrive, so reconnect even if the
+                # exchange is not retried, or the next exchange reads it.
+                await self.component.reconnect()
+                if not self.component.retry_policy.allow(attempt):
+                    raise
+                continue
+            self.log.debug("reply=%r", reply)
+            if not reply.is_error:
+                return reply
+            policy = self.error_policy(reply)
+            if policy is ErrorPolicy.FAIL or not self.component.retry_policy.allow(
+                attempt
+            ):
+                raise ReplyError(self, reply)
+            await _recover(self.component, policy, attempt)
+
+    def error_policy(self, reply):
+        """Return how to handle an error reply.
+
+        Errors without a known code may mean that the replies are out of
+        step with the messages, so they are handled by reconnecting.
+
+        Parameters
+        ----------
+        reply : `AsciiReply`
+            The error reply.
+
+        Returns
+        -------
+        policy : `ErrorPolicy`
+            How to handle the error.
+        """
+        return self.error_policies.get(reply.error_code, ErrorPolicy.RECONNECT)
+
+    async def read_reply(self, sent=None):
+        """Read a reply of the laser.
+
+        The reply must arrive within the timeout estimated from the round
+        trip times of the previous replies.
+
+        Parameters
+        ----------
+        sent : `float` or `None`, optional
+            The monotonic time at which the message was written, used to
+            measure the round trip time.
+            `None` if the reply is queued behind the replies to other
+            messages written at the same time, as its round trip time cannot
+            be measured.
+
+        Returns
+        -------
+        data : `bytes`
+            The reply, including its terminator.
+
+        Raises
+        ------
+        TimeoutError
+            Raised when no reply is received in time.
+        """
+        rtt = self.component.rtt
+        timeout = rtt.timeout
+        try:
+            async with asyncio.timeout(timeout):
+                data = await self.component.commander.readuntil(self.codec.terminator)
+        except TimeoutError:
+            rtt.record_timeout()
+            self.log.warning(
+                "No reply from %s/%s/%s within %.3f s.",
+                self.module_name,
+                self.module_id,
+                self.register_name,
+                timeout,
+            )
+            raise
+        if data is None:
+            raise TimeoutError
+        if sent is not None:
+            rtt.record(time.monotonic() - sent)
+        return data
+
+    def decode_reply(self, data):
+        """Decode a reply to a get message into the type of the register.
+
+        Parameters
+        ----------
+        data : `bytes`
+            The reply, including its terminator.
+
+        Returns
+        -------
+        reply : `AsciiReply`
+            The decoded reply.
+
+        Raises
+        ------
+        ValueError
+            Raised when the value cannot be decoded into ``value_type``.
+        """
+        try:
+            reply = self.codec.decode(data, self.value_type)
+        except ValueError:
+            self.log.error(
+                "Cannot decode reply %r of %s/%s/%s as %s.",
+                bytes(data),
+                self.module_name,
+                self.module_id,
+                self.register_name,
+                self.value_type.__name__,
+            )
+            raise
+        if reply.unit and self.unit and reply.unit != self.unit:
+            self.log.warning(
+                "Expected unit %r for %s, got %r.",
+                self.unit,
+                self.register_name,
+                reply.unit,
+            )
+        return reply
 
     def __repr__(self):
         return "{}: {}".format(self.register_name, self.register_value)
+
+
+class RegisterSnapshot(Mapping):
+    """An immutable view of register values read in one batch.
+
+    The snapshot maps each register to the value it had when it was read.
+
+    Parameters
+    ----------
+    values : `dict` [`AsciiRegister`, `str`], optional
+        The register values.
+    timestamps : `dict` [`AsciiRegister`, `float`], optional
+        The monotonic time at which each register value was received.
+    timestamp : `float`, optional
+        The monotonic time at which the batch completed.
+
+    Attributes
+    ----------
+    timestamps : `types.MappingProxyType`
+        The monotonic time at which each register value was received.
+    timestamp : `float`
+        The monotonic time at which the batch completed.
+    """
+
+    __slots__ = ("_values", "timestamps", "timestamp")
+
+    def __init__(self, values=None, timestamps=None, timestamp=None):
+        object.__setattr__(self, "_values", types.MappingProxyType(dict(values or {})))
+        object.__setattr__(
+            self, "timestamps", types.MappingProxyType(dict(timestamps or {}))
+        )
+        object.__setattr__(
+            self, "timestamp", time.monotonic() if timestamp is None else timestamp
+        )
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable.")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable.")
+
+    def __getitem__(self, register):
+        return self._values[register]
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self):
+        return len(self._values)
+
+    def merged(self, other):
+        """Return a snapshot updated with the values of another snapshot.
+
+        Parameters
+        ----------
+        other : `RegisterSnapshot`
+            The newer snapshot.
+
+        Returns
+        -------
+        snapshot : `RegisterSnapshot`
+            The values of this snapshot updated with those of ``other``.
+        """
+        return RegisterSnapshot(
+            values={**self._values, **other._values},
+            timestamps={**self.timestamps, **other.timestamps},
+            timestamp=other.timestamp,
+        )
+
+    def __str__(self):
+        return "\n".join(
+            f"{register.module_name}/{register.module_id}/{register.register_name}: {value}"
+            for register, value in self._values.items()
+        )
+
+
+async def read_registers_pipelined(registers):
+    """Read the values of several registers in one pipelined exchange.
+
+    The get messages of the registers are written back-to-back, in windows
+    of up to `PIPELINE_WINDOW` registers, and the replies are then matched
+    to the registers in the order that they were sent.
+    The lock of the component is released between windows, so a command
+    waits for at most one window.
+    Registers which receive an error reply are sent again in a new batch,
+    as allowed by the retry policy of the component, unless the error
+    cannot be retried.
+    Each new batch takes one retry from the budget of the retry policy,
+    however many registers it holds.
+    When a reply does not arrive in time, the component reconnects and the
+    registers without a reply are sent again in the new batch.
+    A register whose reply cannot be decoded into its type keeps its
+    previous value, so one garbled reply does not fail the whole batch, and
+    so do the registers left to retry once the budget is spent.
+    The register values are only updated once every reply is received,
+    except for the registers set between two windows, which keep the value
+    set.
+    Registers which are already being read with the same or a more
+    important priority are not sent again, their values are taken from the
+    reads in flight, and reads of the other registers which start before
+    the replies are received wait for them.
+    In a transaction, the sets queued are sent first, and every register is
+    read.
+
+    Parameters
+    ----------
+    registers : `list` [`AsciiRegister`]
+        The registers to read, which must all belong to the same component.
+
+    Returns
+    -------
+    snapshot : `RegisterSnapshot`
+        The values of the registers read.
+
+    Raises
+    ------
+    RuntimeError
+        Raised when the component is not connected.
+    TimeoutError
+        Raised when a reply is not received in time after the retries of
+        one exchange.
+    ReplyError
+        Raised when an error cannot be retried, or keeps happening after
+        the retries of one exchange.
+    """
+    if not registers:
+        return RegisterSnapshot()
+    component = registers[0].component
+    if not component.connected:
+        raise RuntimeError("Not connected.")
+    transaction = registers[0].transaction()
+    if transaction is not None:
+        await transaction.flush()
+        return await _read_pipelined(component, list(registers))
+    loop = asyncio.get_running_loop()
+    joined = {}
+    reads = {}
+    for register in registers:
+        read = register._joinable_read()
+        if read is not None:
+            joined[register] = read
+        else:
+            reads[register] = loop.create_future()
+            register._start_read(reads[register])
+    try:
+        snapshot = await _read_pipelined(component, list(reads))
+    except BaseException as e:
+        for read in reads.values():
+            if isinstance(e, asyncio.CancelledError):
+                read.cancel()
+            else:
+                read.set_exception(e)
+        raise
+    for register, value in snapshot.items():
+        reads[register].set_result(value)
+    if not joined:
+        return snapshot
+    values = dict(snapshot.items())
+    timestamps = {register: snapshot.timestamps[register] for register in snapshot}
+    for register, read in joined.items():
+        values[register] = await asyncio.shield(read)
+        timestamps[register] = register.read_time
+    return RegisterSnapshot(values=values, timestamps=timestamps)
+
+
+async def _read_pipelined(component, registers):
+    """Read the values of registers which are not being read already.
+
+    Parameters
+    ----------
+    component : `Laser`
+        The component of the registers.
+    registers : `list` [`AsciiRegister`]
+        The registers to read.
+
+    Returns
+    -------
+    snapshot : `RegisterSnapshot`
+        The values of the registers read.
+    """
+    replies = {}
+    timestamps = {}
+    pending = list(registers)
+    for attempt in itertools.count():
+        if not pending:
+            break
+        received = {}
+        timed_out = False
+        for start in range(0, len(pending), PIPELINE_WINDOW):
+            window = pending[start : start + PIPELINE_WINDOW]
+            try:
+                async with component.lock, reconnect_on_cancel(component):
+                    sent = time.monotonic()
+                    await component.commander.write(
+                        b"".join(register.get_frame for register in window)
+                    )
+                    for register in window:
+                        # Only the first reply measures the round trip time,
+                        # the others are queued behind it.
+                        received[register] = await register.read_reply(sent)
+                        timestamps[register] = time.monotonic()
+                        sent = None
+            except TimeoutError:
+                timed_out = True
+                break
+        failed = [register for register in pending if register not in received]
+        policies = {ErrorPolicy.RECONNECT} if timed_out else set()
+        for register, data in received.items():
+            try:
+                reply = replies[register] = register.decode_reply(data)
+            except ValueError:
+                # decode_reply logged the reply, keep the previous value.
+                replies.pop(register, None)
+                continue
+            if reply.is_error:
+                register.log.debug("reply=%r", reply)
+                policy = register.error_policy(reply)
+                if policy is ErrorPolicy.FAIL:
+                    raise ReplyError(register, reply)
+                policies.add(policy)
+                failed.append(register)
+        pending = failed
+        if not pending:
+            break
+        retry_policy = component.retry_policy
+        if not retry_policy.allow(attempt):
+            if timed_out:
+                # The late replies may still arrive, so they must not be
+                # read by the next exchange.
+                await component.reconnect()
+            if attempt < retry_policy.retries:
+                # The budget of retries is spent, keep the previous values
+                # until the next sweep.
+                pending[0].log.warning(
+                    "Retry budget spent, keeping the previous values of %s.",
+                    ", ".join(register.register_name for register in pending),
+                )
+                for register in pending:
+                    replies.pop(register, None)
+                break
+            if timed_out:
+                raise TimeoutError(f"No reply from {pending[0].register_name}.")
+            raise ReplyError(pending[0], replies[pending[0]])
+        policy = (
+            ErrorPolicy.RECONNECT
+            if ErrorPolicy.RECONNECT in policies
+            else ErrorPolicy.RETRY
+        )
+        await _recover(component, policy, attempt)
+    values = {}
+    for register in registers:
+        reply = replies.get(register)
+        if reply is None or not register.update_value(
+            reply.value, timestamps[register]
+        ):
+            values[register] = register.register_value
+            timestamps[register] = register.read_time
+        else:
+            values[register] = reply.value
+    return RegisterSnapshot(values=values, timestamps=timestamps)
+
+
+async def _recover(component, policy, attempt):
+    """Prepare to send a message again after an error reply.
+
+    Parameters
+    ----------
+    component : `Laser`
+        The component that replied with an error.
+    policy : `ErrorPolicy`
+        How to handle the error, either `ErrorPolicy.RETRY` or
+        `ErrorPolicy.RECONNECT`.
+    attempt : `int`
+        The number of retries already done.
+    """
+    if policy is ErrorPolicy.RECONNECT:
+        await component.reconnect()
+    else:
+        await component.retry_policy.wait(attempt)
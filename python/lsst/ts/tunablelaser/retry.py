@@ -0,0 +1,158 @@
+# This file is part of ts_tunablelaser.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Software.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Implements the retry policy of the exchanges with the devices.
+
+Notes
+-----
+The delay before a retry doubles with each attempt, up to a maximum, and a
+random part of it is dropped so that retries of different exchanges do not
+line up.
+The budget bounds the number of retries between two resets, so that a flaky
+link cannot turn a telemetry sweep into a retry storm.
+"""
+__all__ = ["RetryPolicy"]
+
+import asyncio
+import random
+
+from .wizardry import (
+    NUMBER_OF_RETRIES,
+    RETRY_BACKOFF,
+    RETRY_JITTER,
+    RETRY_MAX_BACKOFF,
+)
+
+
+class RetryPolicy:
+    """Decide whether and when to retry a failed exchange with a device.
+
+    Parameters
+    ----------
+    retries : `int`, optional
+        The largest number of retries of one exchange.
+    backoff : `float`, optional
+        The delay before the first retry [s].
+    max_backoff : `float`, optional
+        The longest delay before a retry [s].
+    jitter : `float`, optional
+        The largest fraction of the delay dropped at random, from 0 to 1.
+    budget : `int` or `None`, optional
+        The number of retries allowed between resets of the budget, or
+        `None` for no limit.
+
+    Attributes
+    ----------
+    retries : `int`
+        The largest number of retries of one exchange.
+    backoff : `float`
+        The delay before the first retry [s].
+    max_backoff : `float`
+        The longest delay before a retry [s].
+    jitter : `float`
+        The largest fraction of the delay dropped at random.
+    budget : `int` or `None`
+        The number of retries allowed between resets of the budget.
+    budget_left : `int` or `None`
+        The number of retries left in the budget.
+    retry_count : `int`
+        The number of retries allowed so far.
+    denied_count : `int`
+        The number of retries denied because the budget was spent.
+    """
+
+    def __init__(
+        self,
+        retries=NUMBER_OF_RETRIES,
+        backoff=RETRY_BACKOFF,
+        max_backoff=RETRY_MAX_BACKOFF,
+        jitter=RETRY_JITTER,
+        budget=None,
+    ):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.budget = budget
+        self.budget_left = budget
+        self.retry_count = 0
+        self.denied_count = 0
+
+    def reset_budget(self):
+        """Refill the budget of retries."""
+        self.budget_left = self.budget
+
+    def allow(self, attempt, count=1):
+        """Take retries from the budget if they are allowed.
+
+        Parameters
+        ----------
+        attempt : `int`
+            The number of retries of the exchange already done.
+        count : `int`, optional
+            The number of messages to retry.
+
+        Returns
+        -------
+        allowed : `bool`
+            Whether the exchange may be retried.
+        """
+        if attempt >= self.retries:
+            return False
+        if self.budget_left is not None:
+            if self.budget_left < count:
+                self.denied_count += 1
+                return False
+            self.budget_left -= count
+        self.retry_count += count
+        return True
+
+    def delay(self, attempt):
+        """Return the delay before a retry.
+
+        Parameters
+        ----------
+        attempt : `int`
+            The number of retries of the exchange already done.
+
+        Returns
+        -------
+        delay : `float`
+            The delay [s].
+        """
+        delay = min(self.backoff * 2**attempt, self.max_backoff)
+        return delay * (1 - self.jitter * random.random())
+
+    async def wait(self, attempt):
+        """Sleep before a retry.
+
+        Parameters
+        ----------
+        attempt : `int`
+            The number of retries of the exchange already done.
+        """
+        await asyncio.sleep(self.delay(attempt))
+
+    def __str__(self):
+        return (
+            f"retries={self.retry_count} denied={self.denied_count} "
+            f"budget_left={self.budget_left}"
+        )
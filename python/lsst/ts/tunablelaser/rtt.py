@@ -0,0 +1,123 @@
+# This file is part of ts_tunablelaser.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Software.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Implements the estimate of the time to wait for a reply of a device.
+
+Notes
+-----
+The estimate follows the retransmission timeout of TCP (RFC 6298).
+The smoothed round trip time and its mean deviation are updated with every
+reply whose round trip can be measured, which excludes the replies queued
+behind the first reply to messages written together.
+The timeout is the smoothed round trip time plus four times its deviation.
+Each timeout doubles the next timeout, until a reply is received again.
+"""
+__all__ = ["RttEstimator"]
+
+from .wizardry import RTT_MAX_TIMEOUT, RTT_MIN_TIMEOUT
+
+
+class RttEstimator:
+    """Estimate the time to wait for a reply from the round trip times.
+
+    Parameters
+    ----------
+    max_timeout : `float`, optional
+        The longest time to wait for a reply [s].
+    min_timeout : `float`, optional
+        The shortest time to wait for a reply [s].
+    gain : `float`, optional
+        The gain of the moving average of the round trip time.
+    variance_gain : `float`, optional
+        The gain of the moving average of the deviation of the round trip
+        time.
+
+    Attributes
+    ----------
+    max_timeout : `float`
+        The longest time to wait for a reply [s].
+    min_timeout : `float`
+        The shortest time to wait for a reply [s].
+    gain : `float`
+        The gain of the moving average of the round trip time.
+    variance_gain : `float`
+        The gain of the moving average of the deviation of the round trip
+        time.
+    srtt : `float` or `None`
+        The smoothed round trip time [s], `None` before the first reply.
+    rttvar : `float` or `None`
+        The mean deviation of the round trip time [s].
+    backoff : `int`
+        The factor applied to the timeout after timeouts.
+    timeouts : `int`
+        The number of timeouts so far.
+    """
+
+    def __init__(
+        self,
+        max_timeout=RTT_MAX_TIMEOUT,
+        min_timeout=RTT_MIN_TIMEOUT,
+        gain=1 / 8,
+        variance_gain=1 / 4,
+    ):
+        self.max_timeout = max_timeout
+        self.min_timeout = min_timeout
+        self.gain = gain
+        self.variance_gain = variance_gain
+        self.srtt = None
+        self.rttvar = None
+        self.backoff = 1
+        self.timeouts = 0
+
+    @property
+    def timeout(self):
+        """The time to wait for the next reply [s]."""
+        if self.srtt is None:
+            return self.max_timeout
+        timeout = max(self.srtt + 4 * self.rttvar, self.min_timeout)
+        return min(timeout * self.backoff, self.max_timeout)
+
+    def record(self, rtt):
+        """Update the estimate with the round trip time of a reply.
+
+        Parameters
+        ----------
+        rtt : `float`
+            The round trip time [s].
+        """
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar += self.variance_gain * (abs(self.srtt - rtt) - self.rttvar)
+            self.srtt += self.gain * (rtt - self.srtt)
+        self.backoff = 1
+
+    def record_timeout(self):
+        """Double the timeout after a reply was not received in time."""
+        self.timeouts += 1
+        self.backoff *= 2
+
+    def __str__(self):
+        return (
+            f"srtt={self.srtt} rttvar={self.rttvar} timeout={self.timeout:.3f} "
+            f"timeouts={self.timeouts}"
+        )
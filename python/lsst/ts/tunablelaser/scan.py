@@ -0,0 +1,42 @@
+# This file is part of ts_tunablelaser.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Software.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["ScanStep"]
+
+import typing
+
+
+class ScanStep(typing.NamedTuple):
+    """A step of a wavelength scan.
+
+    Parameters
+    ----------
+    wavelength : `float`
+        The wavelength of the step [nm].
+    burst_count : `int`
+        The number of pulses of the burst triggered at the step.
+    dwell : `float`
+        The time to wait after triggering the burst [s].
+    """
+
+    wavelength: float
+    burst_count: int
+    dwell: float
@@ -0,0 +1,273 @@
+# This file is part of ts_tunablelaser.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Software.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Implements the polling scheduler for the registers of the laser.
+
+Notes
+-----
+The scheduler runs in ticks.
+Each register is read every ``period`` seconds, rounded to a whole number of
+ticks, and registers with the same period are spread over different ticks
+so that every tick reads about the same number of registers.
+
+The ticks are kept on a fixed cadence of the monotonic clock.
+When the reads of a tick are estimated to take longer than the tick, the
+reads of lower priority are deferred to the next tick, and when a tick
+overruns anyway, the missed ticks are skipped instead of stretching the
+cadence.
+"""
+__all__ = ["PollingScheduler"]
+
+import asyncio
+import math
+import time
+
+from .enums import PollPriority
+
+
+class PollingScheduler:
+    """Schedule the reads of registers at per-register rates.
+
+    Parameters
+    ----------
+    tick : `float`
+        The period of the scheduler [s].
+    smoothing : `float`, optional
+        The gain of the moving average of the time to read a register.
+
+    Attributes
+    ----------
+    tick : `float`
+        The period of the scheduler [s].
+    smoothing : `float`
+        The gain of the moving average of the time to read a register.
+    tick_count : `int`
+        The number of ticks since the last reset.
+    read_time : `float` or `None`
+        The estimated time to read one register [s].
+    overruns : `int`
+        The number of ticks that took longer than the tick.
+    skipped_ticks : `int`
+        The number of ticks skipped because of overruns.
+    """
+
+    def __init__(self, tick, smoothing=0.125):
+        self.tick = tick
+        self.smoothing = smoothing
+        self.tick_count = 0
+        self.read_time = None
+        self.overruns = 0
+        self.skipped_ticks = 0
+        self._periods = {}
+        self._phases = {}
+        self._priorities = {}
+        self._pending = set()
+        self._tick_start = time.monotonic()
+
+    @property
+    def registers(self):
+        """The registers handled by the scheduler."""
+        return list(self._priorities)
+
+    @property
+    def static_registers(self):
+        """The registers only read after each reset or when expedited."""
+        return [
+            register for register in self._priorities if register not in self._periods
+        ]
+
+    def add(self, registers, period, priority=PollPriority.MEDIUM):
+        """Add a group of registers to the scheduler.
+
+        Parameters
+        ----------
+        registers : `list` [`AsciiRegister`]
+            The registers to read.
+        period : `float` or `None`
+            The period between reads of each register [s].
+            `None` to only read the registers after each reset.
+        priority : `PollPriority`, optional
+            The priority of the registers.
+        """
+        for register in registers:
+            self._priorities[register] = PollPriority(priority)
+            self._pending.add(register)
+            if period is None:
+                continue
+            ticks = max(1, round(period / self.tick))
+            self._phases[register] = self._least_loaded_phase(ticks)
+            self._periods[register] = ticks
+
+    def _least_loaded_phase(self, ticks):
+        """Return the phase which collides the least with the registers
+        already scheduled.
+
+        Two registers with periods ``n1``, ``n2`` and phases ``p1``, ``p2``
+        are read in the same tick once every ``lcm(n1, n2)`` ticks when
+        ``p1`` and ``p2`` are congruent modulo ``gcd(n1, n2)``, and never
+        otherwise.
+
+        Parameters
+        ----------
+        ticks : `int`
+            The period of the new register in ticks.
+
+        Returns
+        -------
+        phase : `int`
+            The phase of the new register in ticks.
+        """
+
+        def load(phase):
+            return sum(
+                1 / math.lcm(ticks, other_ticks)
+                for register, other_ticks in self._periods.items()
+                if (phase - self._phases[register]) % math.gcd(ticks, other_ticks) == 0
+            )
+
+        return min(range(ticks), key=load)
+
+    def reset(self):
+        """Make every register due at the next tick and restart the
+        cadence.
+        """
+        self.tick_count = 0
+        self._pending = set(self._priorities)
+        self._tick_start = time.monotonic()
+
+    def expedite(self, registers):
+        """Make registers due at the next tick.
+
+        Parameters
+        ----------
+        registers : `list` [`AsciiRegister`]
+            The registers to read.
+        """
+        self._pending.update(
+            register for register in registers if register in self._priorities
+        )
+
+    def _is_scheduled(self, register):
+        """Is the register scheduled in the current tick?"""
+        return (
+            register in self._periods
+            and (self.tick_count - self._phases[register]) % self._periods[register]
+            == 0
+        )
+
+    def due(self):
+        """Return the registers to read in this tick and advance the tick.
+
+        When the reads are estimated to take longer than the tick, the
+        registers of lower priority than `PollPriority.HIGH` that do not fit
+        are deferred to the next tick.
+        Deferred registers are read first within their priority, and at least
+        one of them is read every tick, so none of them starves.
+
+        Returns
+        -------
+        registers : `list` [`AsciiRegister`]
+            The registers due, in order of priority.
+        """
+        due = sorted(
+            (
+                register
+                for register in self._priorities
+                if register in self._pending or self._is_scheduled(register)
+            ),
+            key=lambda register: (
+                self._priorities[register],
+                register not in self._pending,
+            ),
+        )
+        self._pending.clear()
+        self.tick_count += 1
+        if self.read_time:
+            high_count = sum(
+                self._priorities[register] == PollPriority.HIGH for register in due
+            )
+            budget = max(int(self.tick / self.read_time), high_count + 1)
+            deferred = [
+                register
+                for register in due[budget:]
+                if self._priorities[register] != PollPriority.HIGH
+            ]
+            self._pending.update(deferred)
+            due = [register for register in due if register not in self._pending]
+        return due
+
+    def skip(self, ticks):
+        """Skip ticks, reading their registers at the next tick instead.
+
+        Parameters
+        ----------
+        ticks : `int`
+            The number of ticks to skip.
+        """
+        for _ in range(ticks):
+            self._pending.update(
+                register
+                for register in self._priorities
+                if self._is_scheduled(register)
+            )
+            self.tick_count += 1
+
+    def record_read(self, count, duration):
+        """Update the estimate of the time to read a register.
+
+        Parameters
+        ----------
+        count : `int`
+            The number of registers read.
+        duration : `float`
+            The time it took to read them [s].
+        """
+        if count == 0:
+            return
+        read_time = duration / count
+        if self.read_time is None:
+            self.read_time = read_time
+        else:
+            self.read_time += self.smoothing * (read_time - self.read_time)
+
+    async def wait_next_tick(self):
+        """Sleep until the start of the next tick.
+
+        The sleep is measured from the start of the current tick, so the
+        time spent working in the tick does not stretch the cadence.
+        If the current tick overran, the missed ticks are skipped.
+
+        Returns
+        -------
+        missed : `int`
+            The number of ticks skipped.
+        """
+        self._tick_start += self.tick
+        now = time.monotonic()
+        missed = 0
+        if now > self._tick_start:
+            missed = math.ceil((now - self._tick_start) / self.tick)
+            self.overruns += 1
+            self.skipped_ticks += missed
+            self.skip(missed)
+            self._tick_start += missed * self.tick
+        await asyncio.sleep(self._tick_start - now)
+        return missed
@@ -0,0 +1,44 @@
+# This file is part of ts_tunablelaser.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Software.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["make_mock_component"]
+
+import unittest.mock
+
+from .retry import RetryPolicy
+from .rtt import RttEstimator
+
+
+def make_mock_component():
+    """Make a mock of a component for the tests of its registers.
+
+    The exchanges of the registers are retried without waiting, and wait
+    for a reply as long as a new component would.
+
+    Returns
+    -------
+    component : `unittest.mock.AsyncMock`
+        The mock of the component.
+    """
+    component = unittest.mock.AsyncMock()
+    component.retry_policy = RetryPolicy(backoff=0)
+    component.rtt = RttEstimator()
+    return component
@@ -0,0 +1,164 @@
+# This file is part of ts_tunablelaser.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Software.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Implements the transactions which group exchanges with a laser.
+
+Notes
+-----
+A transaction holds the lock of the laser from its start to its end, so the
+telemetry cannot read registers in the middle of a multi-step operation.
+The sets of registers done in a transaction are queued, and written
+back-to-back when the transaction ends or a register is read, so that the
+laser receives them in one batch.
+"""
+__all__ = ["Transaction"]
+
+import asyncio
+import itertools
+import time
+
+from .enums import ErrorPolicy
+from .register import (
+    ReplyError,
+    current_transaction,
+    read_registers_pipelined,
+    reconnect_on_cancel,
+)
+
+
+class Transaction:
+    """Hold the lock of a laser for a group of exchanges.
+
+    The transaction is used as an async context manager.
+    The sets queued are discarded if the transaction raises.
+
+    Parameters
+    ----------
+    component : `Laser`
+        The laser.
+
+    Attributes
+    ----------
+    component : `Laser`
+        The laser.
+    task : `asyncio.Task` or `None`
+        The task which runs the transaction.
+    """
+
+    def __init__(self, component):
+        self.component = component
+        self.task = None
+        self._sets = []
+        self._token = None
+
+    def queue_set(self, register, set_frame, set_value, readback):
+        """Queue the set of a register until the transaction is flushed.
+
+        Parameters
+        ----------
+        register : `AsciiRegister`
+            The register to set.
+        set_frame : `bytes`
+            The encoded set message.
+        set_value : Any
+            The value to set.
+        readback : `bool`
+            Whether to read the register after setting it.
+        """
+        self._sets.append((register, set_frame, set_value, readback))
+
+    async def flush(self):
+        """Write the sets queued and read their replies.
+
+        Sets which receive an error reply, a reply that cannot be decoded, or
+        no reply, are sent again on their own, with the error handling of
+        `AsciiRegister.exchange`.
+        The component reconnects when the replies cannot all be read, so
+        that the next exchange does not read them.
+
+        Raises
+        ------
+        ReplyError
+            Raised when an error cannot be retried, or keeps happening after
+            the retries allowed.
+        TimeoutError
+            Raised when a reply is not received in time after the retries
+            allowed.
+        """
+        sets, self._sets = self._sets, []
+        if not sets:
+            return
+        received = []
+        try:
+            async with self.component.lock, reconnect_on_cancel(self.component):
+                sent = time.monotonic()
+                await self.component.commander.write(
+                    b"".join(set_frame for _, set_frame, _, _ in sets)
+                )
+                # The replies are decoded once they are all read, so that an
+                # error cannot leave replies for the next exchange.
+                for register, *_ in sets:
+                    received.append(await register.read_reply(sent))
+                    sent = None
+        except TimeoutError:
+            await self.component.reconnect()
+        except Exception:
+            await self.component.reconnect()
+            raise
+        replies = []
+        for (register, *_), data in zip(sets, received):
+            try:
+                replies.append(register.codec.decode(data))
+            except ValueError:
+                register.log.error("Cannot decode reply %r to a set.", bytes(data))
+                replies.append(None)
+        readbacks = []
+        for (register, set_frame, set_value, readback), reply in itertools.zip_longest(
+            sets, replies
+        ):
+            if reply is None or reply.is_error:
+                if (
+                    reply is not None
+                    and register.error_policy(reply) is ErrorPolicy.FAIL
+                ):
+                    raise ReplyError(register, reply)
+                await register.exchange(set_frame, register.codec.decode)
+            register.set_time = time.monotonic()
+            if readback:
+                readbacks.append(register)
+            else:
+                register.trust_value(set_value)
+        if readbacks:
+            await read_registers_pipelined(readbacks)
+
+    async def __aenter__(self):
+        await self.component.lock.acquire()
+        self.task = asyncio.current_task()
+        self._token = current_transaction.set(self)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                await self.flush()
+        finally:
+            current_transaction.reset(self._token)
+            self.component.lock.release()
@@ -21,5 +21,43 @@
 
 NUMBER_OF_RETRIES = 10
 """Number of retries to attempt in case of communication loss."""
+RETRY_BACKOFF = 0.05
+"""Delay before the first retry of a failed exchange [s]."""
+RETRY_MAX_BACKOFF = 1
+"""Longest delay before a retry of a failed exchange [s]."""
+RETRY_JITTER = 0.5
+"""Largest fraction of the delay before a retry dropped at random."""
+RETRY_BUDGET = 20
+"""Number of retries allowed in a telemetry sweep."""
+RTT_MIN_TIMEOUT = 0.1
+"""Shortest time to wait for a reply [s]."""
+RTT_MAX_TIMEOUT = 1
+"""Longest time to wait for a reply until the timeout is configured [s]."""
 DEFAULT_SLEEP = 1
 """Amount of time to sleep by default."""
+REGISTER_MAX_AGE = 2
+"""Maximum age of a cached register value that commands may use [s]."""
+FAULT_POLL_PERIOD = 0.2
+"""Period between reads of the power and fault registers [s]."""
+STATUS_POLL_PERIOD = 1
+"""Period between reads of the registers of the state of the laser [s]."""
+TEMPERATURE_POLL_PERIOD = 5
+"""Period between reads of the temperature and voltage registers [s]."""
+PIPELINE_WINDOW = 8
+"""Maximum number of get messages sent back-to-back while holding the lock."""
+WARMUP_POLL_PERIOD = 0.2
+"""Period between reads of the propagation state during the warmup [s]."""
+WARMUP_ACK_MARGIN = 5
+"""Time added to the warmup timeout for the exchanges around the warmup [s]."""
+SETTLE_MIN_POLL_PERIOD = 0.05
+"""Shortest period between reads of a register that is settling [s]."""
+SETTLE_MAX_POLL_PERIOD = 1
+"""Longest period between reads of a register that is settling [s]."""
+WAVELENGTH_TOLERANCE = 1
+"""Largest difference from the target of a settled wavelength [nm]."""
+WAVELENGTH_STABLE_READS = 3
+"""Number of consecutive reads within tolerance of a settled wavelength."""
+WAVELENGTH_SETTLE_TIMEOUT = 60
+"""Longest time to wait for the wavelength to settle [s]."""
+WAVELENGTH_ACK_MARGIN = 5
+"""Time added to the settle timeout for the exchanges around the settle [s]."""
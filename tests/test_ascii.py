@@ -19,24 +19,37 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import asyncio
+import math
 import unittest
 import unittest.mock
 
 import pytest
-from lsst.ts.tunablelaser.register import AsciiRegister
+from lsst.ts.tunablelaser.enums import Error, LockPriority, Power
+from lsst.ts.tunablelaser.lock import PriorityLock, lock_priority
+from lsst.ts.tunablelaser.register import (
+    AsciiRegister,
+    RegisterSnapshot,
+    ReplyError,
+    read_registers_pipelined,
+)
+from lsst.ts.tunablelaser.retry import RetryPolicy
+from lsst.ts.tunablelaser.rtt import RttEstimator
+from lsst.ts.tunablelaser.testutils import make_mock_component
+from lsst.ts.tunablelaser.wizardry import NUMBER_OF_RETRIES, REGISTER_MAX_AGE
 
 
 # @pytest.mark.skip()
 class TestAsciiRegister(unittest.IsolatedAsyncioTestCase):
     def setUp(self):
         self.ascii_register = AsciiRegister(
-            component=unittest.mock.AsyncMock(),
+            component=make_mock_component(),
             module_name="Test",
             module_id=0,
             register_name="Test",
         )
         self.settable_ascii_register = AsciiRegister(
-            component=unittest.mock.AsyncMock(),
+            component=make_mock_component(),
             module_name="Foo",
             module_id=0,
             register_name="Bar",
@@ -64,6 +77,23 @@ class TestAsciiRegister(unittest.IsolatedAsyncioTestCase):
                 read_only=False,
             )
 
+    def test_frames(self):
+        assert self.ascii_register.get_frame == b"/Test/0/Test\r"
+        assert self.settable_ascii_register.create_set_frame(5) == b"/Foo/0/Bar/5\r"
+        power_register = AsciiRegister(
+            component=None,
+            module_name="Foo",
+            module_id=0,
+            register_name="Power",
+            read_only=False,
+            accepted_values=list(Power),
+        )
+        frame = power_register.create_set_frame(Power.ON)
+        assert frame == b"/Foo/0/Power/ON\r"
+        assert power_register.create_set_frame("ON") is frame
+        with pytest.raises(ValueError):
+            power_register.create_set_frame("Wumbo")
+
     async def test_read_register_value(self):
         self.ascii_register.create_get_message = unittest.mock.Mock(
             return_value="/Test/0/Test\r"
@@ -72,8 +102,8 @@ class TestAsciiRegister(unittest.IsolatedAsyncioTestCase):
         self.ascii_register.component.commander.send_command = unittest.mock.AsyncMock(
             return_value="ON"
         )
-        self.ascii_register.component.commander.read_str = unittest.mock.AsyncMock(
-            return_value="ON"
+        self.ascii_register.component.commander.readuntil = unittest.mock.AsyncMock(
+            return_value=b"ON\r\n\x03"
         )
         await self.ascii_register.send_command()
         assert self.ascii_register.register_value == "ON"
@@ -84,7 +114,7 @@ class TestAsciiRegister(unittest.IsolatedAsyncioTestCase):
             self.ascii_register.component.commander.send_command = (
                 unittest.mock.AsyncMock(return_value=None)
             )
-            self.ascii_register.component.commander.read_str = unittest.mock.AsyncMock(
+            self.ascii_register.component.commander.readuntil = unittest.mock.AsyncMock(
                 side_effect=TimeoutError
             )
             await self.ascii_register.send_command()
@@ -100,7 +130,11 @@ class TestAsciiRegister(unittest.IsolatedAsyncioTestCase):
         self.settable_ascii_register.component.commander.send_command = (
             unittest.mock.AsyncMock()
         )
+        self.settable_ascii_register.component.commander.readuntil = (
+            unittest.mock.AsyncMock(return_value=b"5\r\n\x03")
+        )
         await self.settable_ascii_register.send_command(5)
+        assert self.settable_ascii_register.register_value == "5"
         with pytest.raises(TimeoutError):
             self.settable_ascii_register.create_set_message = unittest.mock.Mock(
                 return_value="/Foo/0/Bar/5\r"
@@ -108,10 +142,455 @@ class TestAsciiRegister(unittest.IsolatedAsyncioTestCase):
             self.settable_ascii_register.component.commander.send_command = (
                 unittest.mock.AsyncMock(side_effect=TimeoutError)
             )
-            self.settable_ascii_register.component.commander.read_str = (
+            self.settable_ascii_register.component.commander.readuntil = (
                 unittest.mock.AsyncMock(side_effect=TimeoutError)
             )
+            await self.settable_ascii_register.send_command(5, force=True)
+
+    async def test_set_without_readback(self):
+        register = self.settable_ascii_register
+        register.value_type = int
+        register.component.scheduler = unittest.mock.Mock()
+        register.component.commander.readuntil = unittest.mock.AsyncMock(
+            return_value=b"\r\n\x03"
+        )
+        await register.send_command(5, readback=False)
+        register.component.commander.write.assert_awaited_once_with(b"/Foo/0/Bar/5\r")
+        assert register.register_value == 5
+        assert register.unverified_value == 5
+        assert not register.is_fresh(max_age=1)
+        register.component.scheduler.expedite.assert_called_once_with([register])
+
+        register.component.commander.readuntil = unittest.mock.AsyncMock(
+            return_value=b"4\r\n\x03"
+        )
+        with self.assertLogs(register.log, level="WARNING"):
+            await read_registers_pipelined([register])
+        assert register.register_value == 4
+        assert register.unverified_value is None
+
+    async def test_cancel_after_write(self):
+        register = self.settable_ascii_register
+        written = asyncio.Event()
+        register.component.commander.write.side_effect = lambda frame: written.set()
+
+        async def hang(terminator):
+            await asyncio.sleep(10)
+
+        register.component.commander.readuntil = unittest.mock.AsyncMock(
+            side_effect=hang
+        )
+        task = asyncio.create_task(
+            register.send_command(5, readback=False, force=True)
+        )
+        await written.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # The reply to the set must not be read by the next exchange.
+        register.component.reconnect.assert_awaited_once()
+
+    async def test_set_suppressed(self):
+        register = self.settable_ascii_register
+        register.value_type = int
+        commander = register.component.commander
+        commander.readuntil = unittest.mock.AsyncMock(return_value=b"5\r\n\x03")
+        await register.send_command()
+        await register.send_command(5)
+        assert commander.write.await_count == 1
+        await register.send_command(5, force=True)
+        assert commander.write.await_count == 3
+        register.read_time -= REGISTER_MAX_AGE + 1
+        await register.send_command(5)
+        assert commander.write.await_count == 5
+        await register.send_command(6)
+        assert commander.write.await_count == 7
+
+    async def test_error_fail(self):
+        self.settable_ascii_register.component.commander.readuntil = (
+            unittest.mock.AsyncMock(return_value=b"'''Error: (13) Wrong value\r\n\x03")
+        )
+        with pytest.raises(ReplyError) as error:
             await self.settable_ascii_register.send_command(5)
+        assert error.value.code is Error.WRONG_VALUE
+        self.settable_ascii_register.component.commander.write.assert_awaited_once()
+
+    async def test_error_retry(self):
+        timeout_reply = b"'''Error: (8) Timeout waiting for device answer\r\n\x03"
+        commander = self.ascii_register.component.commander
+        commander.readuntil = unittest.mock.AsyncMock(
+            side_effect=[timeout_reply, b"ON\r\n\x03"]
+        )
+        await self.ascii_register.send_command()
+        assert self.ascii_register.register_value == "ON"
+        self.ascii_register.component.reconnect.assert_not_awaited()
+        commander.readuntil = unittest.mock.AsyncMock(return_value=timeout_reply)
+        with pytest.raises(ReplyError):
+            await self.ascii_register.send_command()
+        assert commander.readuntil.await_count == NUMBER_OF_RETRIES + 1
+        assert self.ascii_register.component.retry_policy.retry_count == (
+            NUMBER_OF_RETRIES + 1
+        )
+
+    async def test_error_reconnect(self):
+        self.ascii_register.component.commander.readuntil = unittest.mock.AsyncMock(
+            side_effect=[b"'''Error: unexpected\r\n\x03", b"ON\r\n\x03"]
+        )
+        await self.ascii_register.send_command()
+        assert self.ascii_register.register_value == "ON"
+        self.ascii_register.component.reconnect.assert_awaited_once()
+
+    async def test_reply_timeout(self):
+        async def hang(terminator):
+            await asyncio.sleep(10)
+
+        component = self.ascii_register.component
+        component.rtt = RttEstimator(max_timeout=0.1, min_timeout=0.01)
+        component.retry_policy = RetryPolicy(retries=1, backoff=0)
+        component.commander.readuntil = unittest.mock.AsyncMock(side_effect=hang)
+        with pytest.raises(TimeoutError):
+            await self.ascii_register.send_command()
+        assert component.commander.readuntil.await_count == 2
+        assert component.reconnect.await_count == 2
+        assert component.rtt.timeouts == 2
+
+    async def test_read_registers_pipelined_timeout(self):
+        component = make_mock_component()
+        registers = [
+            AsciiRegister(
+                component=component,
+                module_name="Test",
+                module_id=0,
+                register_name=name,
+            )
+            for name in ("Power", "WaveLength")
+        ]
+
+        replies = iter([b"ON\r\n\x03", None, b"700nm\r\n\x03"])
+
+        async def readuntil(terminator):
+            reply = next(replies)
+            if reply is None:
+                await asyncio.sleep(10)
+            return reply
+
+        component.rtt = RttEstimator(max_timeout=0.1)
+        component.commander.readuntil = readuntil
+        snapshot = await read_registers_pipelined(registers)
+        assert list(snapshot.values()) == ["ON", "700nm"]
+        component.reconnect.assert_awaited_once()
+        assert component.commander.write.await_args.args[0] == b"/Test/0/WaveLength\r"
+
+    async def test_read_registers_pipelined_budget(self):
+        component = make_mock_component()
+        component.retry_policy = RetryPolicy(backoff=0, budget=1)
+        registers = [
+            AsciiRegister(
+                component=component,
+                module_name="Test",
+                module_id=0,
+                register_name=f"Register {index}",
+            )
+            for index in range(5)
+        ]
+        for register in registers:
+            register.register_value = "old"
+        replies = iter([None] + [b"new\r\n\x03"] * 4 + [None])
+
+        async def readuntil(terminator):
+            reply = next(replies)
+            if reply is None:
+                await asyncio.sleep(10)
+            return reply
+
+        component.rtt = RttEstimator(max_timeout=0.1)
+        component.commander.readuntil = readuntil
+        # One retry round for the five registers late, then the budget is
+        # spent and the previous values are kept.
+        snapshot = await read_registers_pipelined(registers)
+        assert list(snapshot.values()) == ["new"] * 4 + ["old"]
+        assert component.retry_policy.retry_count == 1
+        assert component.retry_policy.denied_count == 1
+        assert component.reconnect.await_count == 2
+
+    async def test_set_between_windows(self):
+        component = make_mock_component()
+        component.lock = PriorityLock()
+        component.scheduler = unittest.mock.Mock()
+        mode, power = (
+            AsciiRegister(
+                component=component,
+                module_name="Test",
+                module_id=0,
+                register_name=name,
+                read_only=False,
+                accepted_values=values,
+            )
+            for name, values in (("Mode", ["Burst", "Continuous"]), ("Power", ["ON"]))
+        )
+        gate = asyncio.Event()
+        replies = iter([b"Continuous\r\n\x03", b"\r\n\x03", b"ON\r\n\x03"])
+
+        async def readuntil(terminator):
+            await gate.wait()
+            return next(replies)
+
+        component.commander.readuntil = readuntil
+        with unittest.mock.patch("lsst.ts.tunablelaser.register.PIPELINE_WINDOW", 1):
+            sweep = asyncio.create_task(read_registers_pipelined([mode, power]))
+            await asyncio.sleep(0)
+            set_mode = asyncio.create_task(
+                mode.send_command("Burst", readback=False, force=True)
+            )
+            await asyncio.sleep(0)
+            gate.set()
+            snapshot = await sweep
+            await set_mode
+        assert [call.args[0] for call in component.commander.write.await_args_list] == [
+            b"/Test/0/Mode\r",
+            b"/Test/0/Mode/Burst\r",
+            b"/Test/0/Power\r",
+        ]
+        # The value read before the set does not overwrite the value set.
+        assert mode.register_value == snapshot[mode] == "Burst"
+        assert mode.unverified_value == "Burst"
+        assert not mode.is_fresh(REGISTER_MAX_AGE)
+        assert snapshot[power] == "ON"
+
+    async def test_read_registers_pipelined_fail(self):
+        component = make_mock_component()
+        registers = [
+            AsciiRegister(
+                component=component,
+                module_name="Test",
+                module_id=0,
+                register_name=name,
+            )
+            for name in ("Power", "WaveLength")
+        ]
+        component.commander.readuntil = unittest.mock.AsyncMock(
+            side_effect=[b"'''Error: (11) Top limit\r\n\x03", b"700nm\r\n\x03"]
+        )
+        with pytest.raises(ReplyError) as error:
+            await read_registers_pipelined(registers)
+        assert error.value.register is registers[0]
+        assert component.commander.readuntil.await_count == 2
+        component.commander.write.assert_awaited_once()
+
+    async def test_read_registers_pipelined(self):
+        component = make_mock_component()
+        component.commander.encoding = "ascii"
+        registers = [
+            AsciiRegister(
+                component=component,
+                module_name="Test",
+                module_id=0,
+                register_name=name,
+            )
+            for name in ("Power", "WaveLength", "Display temperature")
+        ]
+        component.commander.readuntil = unittest.mock.AsyncMock(
+            side_effect=[
+                b"ON\r\n\x03",
+                b"'''Error: (8) Timeout waiting for device answer\r\n\x03",
+                b"20 C\r\n\x03",
+                b"700nm\r\n\x03",
+            ]
+        )
+        snapshot = await read_registers_pipelined(registers)
+        assert [register.register_value for register in registers] == [
+            "ON",
+            "700nm",
+            "20 C",
+        ]
+        assert list(snapshot.values()) == ["ON", "700nm", "20 C"]
+        assert set(snapshot.timestamps) == set(registers)
+        first_batch, retry_batch = component.commander.write.await_args_list
+        assert first_batch.args[0] == (
+            b"/Test/0/Power\r/Test/0/WaveLength\r/Test/0/Display temperature\r"
+        )
+        assert retry_batch.args[0] == b"/Test/0/WaveLength\r"
+
+    async def test_read_registers_pipelined_rtt(self):
+        component = make_mock_component()
+        registers = [
+            AsciiRegister(
+                component=component,
+                module_name="Test",
+                module_id=0,
+                register_name=f"Register {index}",
+            )
+            for index in range(4)
+        ]
+        replies = []
+
+        async def readuntil(terminator):
+            # The laser takes 50 ms to reply, and the replies to the other
+            # messages of the batch are then already buffered.
+            if not replies:
+                await asyncio.sleep(0.05)
+            replies.append(terminator)
+            return b"0\r\n\x03"
+
+        component.commander.readuntil = readuntil
+        await read_registers_pipelined(registers)
+        assert len(replies) == 4
+        assert component.rtt.srtt >= 0.05
+
+    async def test_read_single_flight(self):
+        component = make_mock_component()
+        power, wavelength = [
+            AsciiRegister(
+                component=component,
+                module_name="Test",
+                module_id=0,
+                register_name=name,
+            )
+            for name in ("Power", "WaveLength")
+        ]
+        replied = asyncio.Event()
+        replies = [b"ON\r\n\x03", b"700nm\r\n\x03", b"OFF\r\n\x03"]
+
+        async def readuntil(terminator):
+            await replied.wait()
+            return replies.pop(0)
+
+        component.commander.readuntil = readuntil
+        reads = [asyncio.create_task(power.read()) for _ in range(3)]
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        sweep = asyncio.create_task(read_registers_pipelined([power, wavelength]))
+        await asyncio.sleep(0)
+        replied.set()
+        assert await asyncio.gather(*reads) == ["ON", "ON", "ON"]
+        snapshot = await sweep
+        assert dict(snapshot) == {power: "ON", wavelength: "700nm"}
+        frames = [call.args[0] for call in component.commander.write.await_args_list]
+        assert frames == [b"/Test/0/Power\r", b"/Test/0/WaveLength\r"]
+        assert await power.read() == "OFF"
+
+    async def test_read_priority(self):
+        component = make_mock_component()
+        component.lock = PriorityLock()
+        power = AsciiRegister(
+            component=component,
+            module_name="Test",
+            module_id=0,
+            register_name="Power",
+        )
+        component.commander.readuntil = unittest.mock.AsyncMock(
+            side_effect=[b"ON\r\n\x03", b"OFF\r\n\x03", b"ON\r\n\x03"]
+        )
+
+        async def telemetry_read():
+            lock_priority.set(LockPriority.TELEMETRY)
+            return await power.read()
+
+        await component.lock.acquire()
+        telemetry = asyncio.create_task(telemetry_read())
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        command = asyncio.create_task(power.read())
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        component.lock.release()
+        assert await command == "ON"
+        assert await telemetry == "OFF"
+        # A read done does not answer the next read.
+        await read_registers_pipelined([power])
+        assert component.commander.write.await_count == 3
+
+    async def test_read_registers_pipelined_typed(self):
+        component = make_mock_component()
+        registers = [
+            AsciiRegister(
+                component=component,
+                module_name="Test",
+                module_id=0,
+                register_name=name,
+                value_type=value_type,
+                unit=unit,
+            )
+            for name, value_type, unit in (
+                ("Power", Power, ""),
+                ("WaveLength", float, "nm"),
+                ("Fault code", int, ""),
+            )
+        ]
+        component.commander.readuntil = unittest.mock.AsyncMock(
+            side_effect=[b"ON\r\n\x03", b"700nm\r\n\x03", b"0\r\n\x03"]
+        )
+        snapshot = await read_registers_pipelined(registers)
+        assert list(snapshot.values()) == [Power.ON, 700.0, 0]
+        assert [type(value) for value in snapshot.values()] == [Power, float, int]
+
+    async def test_read_unexpected_unit(self):
+        register = AsciiRegister(
+            component=make_mock_component(),
+            module_name="Test",
+            module_id=0,
+            register_name="WaveLength",
+            value_type=float,
+            unit="nm",
+        )
+        register.component.commander.readuntil = unittest.mock.AsyncMock(
+            return_value=b"700um\r\n\x03"
+        )
+        with self.assertLogs(register.log, level="WARNING"):
+            await register.send_command()
+        assert register.register_value == 700.0
+
+    async def test_get(self):
+        self.ascii_register.component.commander.encoding = "ascii"
+        self.ascii_register.component.commander.readuntil = unittest.mock.AsyncMock(
+            side_effect=[b"ON\r\n\x03", b"OFF\r\n\x03"]
+        )
+        assert self.ascii_register.age == math.inf
+        assert await self.ascii_register.get(max_age=10) == "ON"
+        assert self.ascii_register.is_fresh(10)
+        assert await self.ascii_register.get(max_age=10) == "ON"
+        self.ascii_register.read_time -= 20
+        assert not self.ascii_register.is_fresh(10)
+        assert await self.ascii_register.get(max_age=10) == "OFF"
+        assert self.ascii_register.component.commander.readuntil.await_count == 2
+
+    async def test_wait_until_settled(self):
+        self.ascii_register.value_type = float
+        self.ascii_register.component.commander.encoding = "ascii"
+        self.ascii_register.component.commander.readuntil = unittest.mock.AsyncMock(
+            side_effect=[b"500nm", b"600nm", b"699nm", b"700nm", b"700nm"]
+        )
+        settle_time = await self.ascii_register.wait_until_settled(
+            target=700, tolerance=1, stable_reads=3, timeout=5
+        )
+        assert settle_time >= 0
+        assert self.ascii_register.register_value == 700.0
+        assert self.ascii_register.component.commander.readuntil.await_count == 5
+
+        self.ascii_register.component.commander.readuntil = unittest.mock.AsyncMock(
+            return_value=b"500nm"
+        )
+        with pytest.raises(TimeoutError):
+            await self.ascii_register.wait_until_settled(
+                target=700, tolerance=1, stable_reads=3, timeout=0.2
+            )
+
+    def test_snapshot(self):
+        snapshot = RegisterSnapshot(
+            values={self.ascii_register: "ON"},
+            timestamps={self.ascii_register: 1.0},
+            timestamp=2.0,
+        )
+        assert snapshot[self.ascii_register] == "ON"
+        assert self.settable_ascii_register not in snapshot
+        assert len(snapshot) == 1
+        assert snapshot.timestamps[self.ascii_register] == 1.0
+        assert snapshot.timestamp == 2.0
+        assert str(snapshot) == "Test/0/Test: ON"
+        with pytest.raises(AttributeError):
+            snapshot.timestamp = 3.0
+        with pytest.raises(TypeError):
+            snapshot.timestamps[self.ascii_register] = 3.0
 
     def test_repr(self):
         assert repr(self.ascii_register) == "Test: None"
@@ -0,0 +1,95 @@
+# This file is part of ts_tunablelaser.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Software.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import unittest
+
+import pytest
+from lsst.ts.tunablelaser.codec import (
+    AsciiCodec,
+    AsciiReply,
+    CompoWayFCodec,
+    CompoWayFFrame,
+)
+from lsst.ts.tunablelaser.enums import Power
+
+
+class TestAsciiCodec(unittest.TestCase):
+    def setUp(self):
+        self.codec = AsciiCodec()
+
+    def test_strip(self):
+        assert self.codec.strip(b" 700nm\r\n\x03") == b"700nm"
+        assert self.codec.strip(memoryview(b"ON")) == b"ON"
+        assert self.codec.strip(b"\r\n\x03") == b""
+
+    def test_decode(self):
+        assert self.codec.decode(b"700nm\r\n\x03", int) == AsciiReply(700, "nm")
+        assert self.codec.decode(b"20 C\r\n\x03", float) == AsciiReply(20.0, "C")
+        assert self.codec.decode(b"19A\r\n\x03", float) == AsciiReply(19.0, "A")
+        # Units are split as a suffix, not stripped as characters.
+        assert self.codec.decode(b"2mC\r\n\x03", int) == AsciiReply(2, "mC")
+        assert self.codec.decode(b"F1 SCU\r\n\x03") == AsciiReply("F1 SCU")
+        with pytest.raises(ValueError):
+            self.codec.decode(b"Wumbo", float)
+        assert self.codec.decode(b"700nm", float) == AsciiReply(700.0, "nm")
+        assert self.codec.decode(b"-5", int) == AsciiReply(-5)
+        assert self.codec.decode(b"ON\r\n\x03", Power).value is Power.ON
+        with pytest.raises(ValueError):
+            self.codec.decode(b"Wumbo", Power)
+
+    def test_decode_text(self):
+        # Text values are not split, even when they start with a number.
+        assert self.codec.decode(b"1 Internal\r\n\x03") == AsciiReply("1 Internal")
+        assert self.codec.decode(b"700nm\r\n\x03") == AsciiReply("700nm")
+
+    def test_error(self):
+        data = b"'''Error: (8) Timeout waiting for device answer\r\n\x03"
+        assert self.codec.is_error(data)
+        reply = self.codec.decode(data, float)
+        assert reply.is_error
+        assert reply.error_code == 8
+        assert reply.value == "'''Error: (8) Timeout waiting for device answer"
+        assert not self.codec.decode(b"ON").is_error
+
+
+class TestCompoWayFCodec(unittest.TestCase):
+    def setUp(self):
+        self.codec = CompoWayFCodec()
+
+    def test_bcc(self):
+        # taken from E5DCB communications doc page 33
+        # section 2-1-2
+        assert self.codec.bcc(b"000000503\x03") == 0x35
+
+    def test_decode(self):
+        data = b"\x0201000001010000001F\x03"
+        frame = self.codec.decode(data, self.codec.bcc(data[1:]))
+        assert frame == CompoWayFFrame("01", "00", "00", "0101", "0000", "001F")
+        assert frame.is_normal
+        data = b"\x02010014\x03"
+        frame = self.codec.decode(data, self.codec.bcc(data[1:]))
+        assert frame == CompoWayFFrame("01", "00", "14")
+        assert not frame.is_normal
+        with pytest.raises(ValueError):
+            self.codec.decode(data, 0)
+        with pytest.raises(ValueError):
+            self.codec.decode(b"\x0201\x03", 0)
+        assert self.codec.find_start(b"\r\x0201000001010000001F\x03") == 1
@@ -0,0 +1,128 @@
+# This file is part of ts_tunablelaser.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Software.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import logging
+import socket
+import types
+import unittest
+import unittest.mock
+
+import pytest
+from lsst.ts.tunablelaser.component import MainLaser, TemperatureCtrl
+from lsst.ts.tunablelaser.enums import Power
+from lsst.ts.tunablelaser.retry import RetryPolicy
+from lsst.ts.tunablelaser.wizardry import RETRY_BUDGET
+
+
+class TestMainLaser(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        csc = unittest.mock.AsyncMock()
+        csc.log = logging.getLogger(__name__)
+        self.laser = MainLaser(csc=csc)
+
+    async def test_start_propagating_timeout(self):
+        m_cpu800 = unittest.mock.AsyncMock()
+        m_cpu800.wait_until_propagating.side_effect = TimeoutError
+        self.laser.m_cpu800 = m_cpu800
+        self.laser.laser_warmup_delay = 1
+        with pytest.raises(TimeoutError):
+            await self.laser.start_propagating(data=None)
+        m_cpu800.start_propagating.assert_awaited_once()
+        m_cpu800.stop_propagating.assert_awaited_once()
+        ack = self.laser.csc.cmd_startPropagateLaser.ack_in_progress
+        assert ack.await_args.kwargs["timeout"] > self.laser.laser_warmup_delay
+
+    async def test_command_retries(self):
+        # Commands keep retrying with no telemetry refilling the budget.
+        self.laser.commander = unittest.mock.AsyncMock()
+        self.laser.command_retry_policy.backoff = 0
+        error = b"'''Error: (8) Timeout waiting for device answer\r\n\x03"
+        self.laser.commander.readuntil = unittest.mock.AsyncMock(
+            side_effect=([error] * 8 + [b"700nm\r\n\x03"]) * 3
+        )
+        register = self.laser.wavelength_register
+        for _ in range(3):
+            reply = await register.exchange(register.get_frame, register.decode_reply)
+            assert reply.value == 700
+        assert self.laser.command_retry_policy.retry_count == 24
+        assert self.laser.telemetry_retry_policy.budget_left == RETRY_BUDGET
+
+    async def test_clear_fault(self):
+        self.laser.commander = unittest.mock.AsyncMock()
+        self.laser.commander.readuntil = unittest.mock.AsyncMock(
+            side_effect=[b"FAULT\r\n\x03", b"\r\n\x03", b"OFF\r\n\x03"]
+        )
+        await self.laser.clear_fault()
+        assert [
+            call.args[0] for call in self.laser.commander.write.await_args_list
+        ] == [
+            b"/M_CPU800/18/Power\r",
+            b"/M_CPU800/18/Power/OFF\r",
+            b"/M_CPU800/18/Power\r",
+        ]
+        assert self.laser.m_cpu800.power_register_2.register_value == Power.OFF
+
+    async def test_run_scan(self):
+        calls = unittest.mock.AsyncMock()
+        self.laser.set_burst_mode = calls.set_burst_mode
+        self.laser.set_burst_count = calls.set_burst_count
+        self.laser.change_wavelength = calls.change_wavelength
+        self.laser.trigger_burst = calls.trigger_burst
+        await self.laser.run_scan([(500, 5, 0), (600, 5, 0), (700, 10, 0)])
+        assert calls.mock_calls == [
+            unittest.mock.call.set_burst_mode(5),
+            unittest.mock.call.change_wavelength(500),
+            unittest.mock.call.trigger_burst(),
+            unittest.mock.call.change_wavelength(600),
+            unittest.mock.call.trigger_burst(),
+            unittest.mock.call.change_wavelength(700),
+            unittest.mock.call.set_burst_count(10),
+            unittest.mock.call.trigger_burst(),
+        ]
+        # set_burst_mode and set_burst_count publish burstCountSet.
+        self.laser.csc.evt_burstCountSet.set_write.assert_not_awaited()
+
+    async def test_set_burst_mode(self):
+        self.laser.m_cpu800 = unittest.mock.AsyncMock()
+        await self.laser.set_burst_mode(5)
+        self.laser.m_cpu800.set_burst_count.assert_awaited_once_with(5)
+        self.laser.csc.evt_burstCountSet.set_write.assert_awaited_once_with(count=5)
+
+
+class TestTemperatureCtrl(unittest.IsolatedAsyncioTestCase):
+    async def test_connect_retries(self):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        csc = unittest.mock.Mock()
+        csc.log = logging.getLogger(__name__)
+        ctrl = TemperatureCtrl(csc, host="127.0.0.1", port=port)
+        ctrl.connect_retry_policy = RetryPolicy(retries=2, backoff=0)
+        await ctrl.connect()
+        assert not ctrl.connected
+        assert ctrl.connect_retry_policy.retry_count == 2
+
+    async def test_configure(self):
+        csc = unittest.mock.Mock()
+        csc.log = logging.getLogger(__name__)
+        ctrl = TemperatureCtrl(csc)
+        await ctrl.configure(types.SimpleNamespace(timeout=3))
+        assert ctrl.rtt.max_timeout == 3
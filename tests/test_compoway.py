@@ -19,15 +19,19 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import asyncio
 import unittest
 import unittest.mock
 
 import pytest
+from lsst.ts.tunablelaser.canbus_modules import E5DCB, E5DCBMonitor
 from lsst.ts.tunablelaser.compoway_register import (
     CompoWayFDataRegister,
     CompoWayFGeneralRegister,
     CompoWayFOperationRegister,
 )
+from lsst.ts.tunablelaser.rtt import RttEstimator
+from lsst.ts.tunablelaser.testutils import make_mock_component
 
 
 class TestAsciiRegister(unittest.IsolatedAsyncioTestCase):
@@ -36,14 +40,14 @@ class TestAsciiRegister(unittest.IsolatedAsyncioTestCase):
         self.ETX = "\x03"
 
         self.general_register = CompoWayFGeneralRegister(
-            component=unittest.mock.AsyncMock(),
+            component=make_mock_component(),
             module_name="GenTest",
             module_id=1,
             register_name="GenTestRegister",
         )
 
         self.data_register = CompoWayFDataRegister(
-            component=unittest.mock.AsyncMock(),
+            component=make_mock_component(),
             module_name="DataTest",
             module_id=2,
             register_name="Set Point",
@@ -52,7 +56,7 @@ class TestAsciiRegister(unittest.IsolatedAsyncioTestCase):
         )
 
         self.read_only_data_reg = CompoWayFDataRegister(
-            component=unittest.mock.AsyncMock(),
+            component=make_mock_component(),
             module_name="DataTest",
             module_id=2,
             register_name="Set Point",
@@ -60,7 +64,7 @@ class TestAsciiRegister(unittest.IsolatedAsyncioTestCase):
         )
 
         self.operation_register = CompoWayFOperationRegister(
-            component=unittest.mock.AsyncMock(),
+            component=make_mock_component(),
             module_name="OpTest",
             module_id=3,
             register_name="Run Stop",
@@ -96,20 +100,20 @@ class TestAsciiRegister(unittest.IsolatedAsyncioTestCase):
     def test_class_creation(self):
         with pytest.raises(ValueError):
             CompoWayFDataRegister(
-                component=unittest.mock.AsyncMock(),
+                component=make_mock_component(),
                 module_name="DataTest",
                 module_id=2,
                 register_name="Invalid Register",
             )
             CompoWayFOperationRegister(
-                component=unittest.mock.AsyncMock(),
+                component=make_mock_component(),
                 module_name="OpTest",
                 module_id=3,
                 register_name="Invalid Register",
                 accepted_values=range(0, 2),
             )
             CompoWayFDataRegister(
-                component=unittest.mock.AsyncMock(),
+                component=make_mock_component(),
                 module_name="DataTest",
                 module_id=2,
                 register_name="Invalid Register",
@@ -120,6 +124,121 @@ class TestAsciiRegister(unittest.IsolatedAsyncioTestCase):
         msg = self.data_register.create_get_message()
         assert msg == "\x02020000101810003000001\x03:"
 
+    async def test_read_elements(self):
+        register = CompoWayFDataRegister(
+            component=make_mock_component(),
+            module_name="E5DCB",
+            module_id=1,
+            register_name="Monitor",
+            elements=5,
+        )
+        assert register.create_get_message()[8:22] == "01800000000005"
+        frame = "\x30\x31\x30\x30\x30\x30\x30\x31\x30\x31\x30\x30\x30\x30"
+        frame += "00FA100000FA000F01F4\x03"
+        commander = register.component.commander
+        commander.readuntil = unittest.mock.AsyncMock(
+            return_value=(self.STX + frame).encode()
+        )
+        commander.readexactly = unittest.mock.AsyncMock(
+            return_value=self.general_register.generate_bcc(frame).encode()
+        )
+        assert await register.read_register_value_once()
+        assert register.register_value == (250, 0x1000, 250, 15, 500)
+        assert register.read_time is not None
+        monitor = E5DCBMonitor.from_words(register.register_value, register.read_time)
+        assert monitor == E5DCBMonitor(
+            25.0, 0x1000, 25.0, 1.5, 50.0, register.read_time
+        )
+        assert monitor.alarms == (True, False, False)
+        monitor = E5DCBMonitor.from_words((0xFFF6, 0, 0, 0, 0), 0)
+        assert monitor.process_value == -1.0
+        with pytest.raises(ValueError):
+            register.decode_words("00FA")
+
+    async def test_set_register_value(self):
+        set_frame = "\x30\x32\x30\x30\x30\x30\x30\x31\x30\x32\x30\x30\x30\x30\x03"
+        get_frame = "\x30\x32\x30\x30\x30\x30\x30\x31\x30\x31\x30\x30\x30\x30"
+        get_frame += "\x30\x30\x33\x32\x03"
+        commander = self.data_register.component.commander
+        commander.readuntil = unittest.mock.AsyncMock(
+            side_effect=[
+                (self.STX + set_frame).encode(),
+                (self.STX + get_frame).encode(),
+            ]
+        )
+        commander.readexactly = unittest.mock.AsyncMock(
+            side_effect=[
+                self.general_register.generate_bcc(set_frame).encode(),
+                self.general_register.generate_bcc(get_frame).encode(),
+            ]
+        )
+        await self.data_register.set_register_value(5)
+        commander.write.assert_awaited_once_with(
+            self.data_register.create_set_message(5).encode()
+            + self.data_register.get_frame
+        )
+        assert self.data_register.register_value == 0x32
+        self.data_register.component.lock.__aenter__.assert_awaited_once()
+
+    async def test_get_and_send_command(self):
+        set_frame = "\x30\x32\x30\x30\x30\x30\x30\x31\x30\x32\x30\x30\x30\x30\x03"
+        get_frame = "\x30\x32\x30\x30\x30\x30\x30\x31\x30\x31\x30\x30\x30\x30"
+        frames = [get_frame + "001E\x03", set_frame, get_frame + "0032\x03"]
+        commander = self.data_register.component.commander
+        commander.readuntil = unittest.mock.AsyncMock(
+            side_effect=[(self.STX + frame).encode() for frame in frames]
+        )
+        commander.readexactly = unittest.mock.AsyncMock(
+            side_effect=[
+                self.general_register.generate_bcc(frame).encode() for frame in frames
+            ]
+        )
+        assert await self.data_register.get() == 0x1E
+        await self.data_register.send_command(5)
+        assert self.data_register.register_value == 0x32
+        assert commander.write.await_args_list[-1].args[0] == (
+            self.data_register.create_set_message(5).encode()
+            + self.data_register.get_frame
+        )
+
+    async def test_set_point_scale(self):
+        e5dcb = E5DCB(component=make_mock_component())
+        header = "\x30\x31\x30\x30\x30\x30"
+        frames = [
+            header + "\x30\x31\x30\x32\x30\x30\x30\x30\x03",
+            header + "\x30\x31\x30\x31\x30\x30\x30\x30" + "00FA\x03",
+            header + "\x30\x31\x30\x31\x30\x30\x30\x30" + "00F0000000FA000F01F4\x03",
+        ]
+        commander = e5dcb.component.commander
+        commander.readuntil = unittest.mock.AsyncMock(
+            side_effect=[(self.STX + frame).encode() for frame in frames]
+        )
+        commander.readexactly = unittest.mock.AsyncMock(
+            side_effect=[
+                self.general_register.generate_bcc(frame).encode() for frame in frames
+            ]
+        )
+        await e5dcb.set_point_register.set_register_value(25)
+        assert e5dcb.set_point_register.register_value == 250
+        await e5dcb.update_register()
+        assert e5dcb.set_point_register.register_value == 250
+        assert e5dcb.set_point_register.read_time == e5dcb.monitor.timestamp
+        assert e5dcb.monitor.set_point == 25.0
+
+    def test_get_frame(self):
+        frame = self.data_register.get_frame
+        assert frame == b"\x02020000101810003000001\x03:"
+        assert self.data_register.get_frame is frame
+        simulated_register = CompoWayFDataRegister(
+            component=make_mock_component(),
+            module_name="DataTest",
+            module_id=2,
+            register_name="Set Point",
+            simulation_mode=True,
+        )
+        assert simulated_register.get_frame == frame + b"\r"
+        assert self.general_register.generate_bcc(frame[1:-1]) == ":"
+
     def test_create_set_message(self):
         with pytest.raises(PermissionError):
             self.read_only_data_reg.create_set_message(set_value=5)
@@ -152,6 +271,67 @@ class TestAsciiRegister(unittest.IsolatedAsyncioTestCase):
         msg = self.operation_register.create_set_message(0)
         assert msg == "\x020300030050101\x036"
 
+    async def test_read_register_value(self):
+        frame = "\x30\x32\x30\x30\x30\x30\x30\x31\x30\x31\x30\x30\x30\x30"
+        frame += "\x30\x30\x31\x46\x03"
+        bcc = self.general_register.generate_bcc(frame).encode()
+        commander = self.read_only_data_reg.component.commander
+        commander.encoding = "ascii"
+        commander.readuntil = unittest.mock.AsyncMock(
+            return_value=("\r" + self.STX + frame).encode()
+        )
+        commander.readexactly = unittest.mock.AsyncMock(return_value=bcc)
+        assert await self.read_only_data_reg.read_register_value_once()
+        assert self.read_only_data_reg.register_value == 0x1F
+        commander.readuntil.assert_awaited_once_with(b"\x03")
+        commander.readexactly.assert_awaited_once_with(1)
+
+        commander.readexactly = unittest.mock.AsyncMock(return_value=b"\x00")
+        assert not await self.read_only_data_reg.read_register_value_once()
+
+    async def test_response_timeout(self):
+        async def hang(separator):
+            await asyncio.sleep(10)
+
+        component = self.data_register.component
+        component.rtt = RttEstimator(max_timeout=0.1, min_timeout=0.01)
+        component.commander.readuntil = unittest.mock.AsyncMock(side_effect=hang)
+        with pytest.raises(TimeoutError):
+            await self.data_register.exchange_frames(
+                [(self.data_register.get_frame, self.data_register.get_mrc_src)]
+            )
+        component.reconnect.assert_awaited_once()
+        assert component.rtt.timeouts == 1
+
+    async def test_corrupted_response_in_batch(self):
+        set_frame = "\x30\x32\x30\x30\x30\x30\x30\x31\x30\x32\x30\x30\x30\x30\x03"
+        get_frame = "\x30\x32\x30\x30\x30\x30\x30\x31\x30\x31\x30\x30\x30\x30"
+        get_frame += "\x30\x30\x33\x32\x03"
+        component = self.data_register.component
+        commander = component.commander
+        commander.readuntil = unittest.mock.AsyncMock(
+            side_effect=[
+                (self.STX + set_frame).encode(),
+                (self.STX + get_frame).encode(),
+            ]
+        )
+        # The block check character of the response to the set is wrong.
+        commander.readexactly = unittest.mock.AsyncMock(return_value=b"\x00")
+        with pytest.raises(ValueError):
+            await self.data_register.exchange_frames(
+                [
+                    (
+                        self.data_register.create_set_message(5).encode(),
+                        self.data_register.set_mrc_src,
+                    ),
+                    (self.data_register.get_frame, self.data_register.get_mrc_src),
+                ]
+            )
+        commander.readuntil.assert_awaited_once()
+        # The response to the get is left unread, so it must not be read by
+        # the next exchange.
+        component.reconnect.assert_awaited_once()
+
     def test_repr(self):
         assert repr(self.data_register) == "Set Point: None"
         assert repr(self.operation_register) == "Run Stop: None"
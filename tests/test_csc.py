@@ -19,9 +19,12 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import asyncio
+import contextlib
 import os
 import pathlib
 import unittest
+import unittest.mock
 
 import pytest
 from lsst.ts import salobj, tunablelaser
@@ -91,14 +94,62 @@ class TunableLaserCscTestCase(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTe
             assert self.csc.fc_client.response is not None
             assert self.csc.la_client.response is not None
 
+    @parameterized.expand([(""), ("stubbs.yaml")])
+    async def test_enable_reads_static_registers(self, config):
+        async with self.make_csc(
+            initial_state=salobj.State.DISABLED, simulation_mode=1, override=config
+        ):
+            scheduler = self.csc.model.scheduler
+            with unittest.mock.patch.object(
+                scheduler, "expedite", wraps=scheduler.expedite
+            ) as expedite:
+                await self.remote.cmd_enable.start(timeout=STD_TIMEOUT)
+            expedite.assert_any_call(scheduler.static_registers)
+            assert scheduler.static_registers
+
+    @parameterized.expand([(""), ("stubbs.yaml")])
+    async def test_telemetry_without_values(self, config):
+        async with self.make_csc(
+            initial_state=salobj.State.ENABLED, simulation_mode=1, override=config
+        ):
+            self.csc.telemetry_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self.csc.telemetry_task
+            model = self.csc.model
+            snapshots = [
+                tunablelaser.RegisterSnapshot(),
+                tunablelaser.RegisterSnapshot(
+                    values={
+                        register: None
+                        for register in (
+                            model.wavelength_register,
+                            *model.temperature_registers,
+                        )
+                    }
+                ),
+            ]
+            with (
+                unittest.mock.patch.object(
+                    self.csc.tel_wavelength, "set_write"
+                ) as wavelength_write,
+                unittest.mock.patch.object(
+                    self.csc.tel_temperature, "set_write"
+                ) as temperature_write,
+            ):
+                for snapshot in snapshots:
+                    await self.csc.publish_telemetry(snapshot)
+            wavelength_write.assert_not_called()
+            temperature_write.assert_not_called()
+
     @parameterized.expand([(""), ("stubbs.yaml")])
     async def test_change_wavelength(self, config):
         async with self.make_csc(
             initial_state=salobj.State.ENABLED, simulation_mode=1, override=config
         ):
-            await self.remote.cmd_changeWavelength.set_start(
+            ackcmd = await self.remote.cmd_changeWavelength.set_start(
                 wavelength=700, timeout=STD_TIMEOUT
             )
+            assert ackcmd.result.startswith("Wavelength settled in ")
             await self.assert_next_sample(
                 topic=self.remote.evt_wavelengthChanged, wavelength=700
             )
@@ -193,6 +244,67 @@ class TunableLaserCscTestCase(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTe
                 detailedState=TunableLaser.LaserDetailedState.PROPAGATING_BURST_MODE,
             )
 
+    @parameterized.expand([(""), ("stubbs.yaml")])
+    async def test_run_scan(self, config):
+        async with self.make_csc(
+            initial_state=salobj.State.ENABLED, simulation_mode=1, override=config
+        ):
+            await self.remote.cmd_setBurstMode.set_start(count=1, timeout=STD_TIMEOUT)
+            await self.remote.cmd_startPropagateLaser.set_start(timeout=STD_TIMEOUT)
+            steps = [
+                tunablelaser.ScanStep(wavelength=500, burst_count=5, dwell=0),
+                tunablelaser.ScanStep(wavelength=600, burst_count=5, dwell=0),
+                tunablelaser.ScanStep(wavelength=700, burst_count=10, dwell=0),
+            ]
+            await self.csc.run_scan(steps)
+            for step in steps:
+                await self.assert_next_sample(
+                    topic=self.remote.evt_wavelengthChanged,
+                    wavelength=step.wavelength,
+                )
+            assert float(self.csc.model.wavelength) == 700
+
+            with pytest.raises(salobj.ExpectedError):
+                await self.csc.run_scan(
+                    [
+                        tunablelaser.ScanStep(wavelength=500, burst_count=5, dwell=0),
+                        tunablelaser.ScanStep(wavelength=5000, burst_count=5, dwell=0),
+                    ]
+                )
+            assert self.csc.scan_task.done()
+            assert float(self.csc.model.wavelength) == 700
+
+            # Wavelengths are truncated to whole nanometers by both lasers.
+            await self.csc.run_scan(
+                [tunablelaser.ScanStep(wavelength=650.5, burst_count=5, dwell=0)]
+            )
+            assert float(self.csc.model.wavelength) == 650
+
+            scan = asyncio.create_task(
+                self.csc.run_scan([tunablelaser.ScanStep(500, 5, STD_TIMEOUT)])
+            )
+            await asyncio.sleep(1)
+            with pytest.raises(salobj.AckError):
+                await self.remote.cmd_changeWavelength.set_start(
+                    wavelength=600, timeout=STD_TIMEOUT
+                )
+            with pytest.raises(salobj.AckError):
+                await self.remote.cmd_setBurstMode.set_start(
+                    count=2, timeout=STD_TIMEOUT
+                )
+            await self.csc.abort_scan()
+            assert self.csc.scan_task.done()
+            with pytest.raises(asyncio.CancelledError):
+                await scan
+
+            scan = asyncio.create_task(
+                self.csc.run_scan([tunablelaser.ScanStep(500, 5, STD_TIMEOUT)])
+            )
+            await asyncio.sleep(1)
+            await self.remote.cmd_disable.set_start(timeout=STD_TIMEOUT)
+            with pytest.raises(asyncio.CancelledError):
+                await scan
+
     @parameterized.expand([(""), ("stubbs.yaml")])
     async def test_stop_propagate_laser(self, config):
         async with self.make_csc(
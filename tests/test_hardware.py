@@ -19,40 +19,51 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import asyncio
+import itertools
 import unittest
 import unittest.mock
 
-from lsst.ts.tunablelaser.canbus_modules import CPU8000, MaxiOPG
+import pytest
+from lsst.ts.tunablelaser.canbus_modules import CPU8000, MCPU800, MaxiOPG
+from lsst.ts.tunablelaser.enums import Mode, OpticalConfiguration, Power
+from lsst.ts.tunablelaser.testutils import make_mock_component
 
 
 class TestCPU8000(unittest.IsolatedAsyncioTestCase):
     def setUp(self):
-        self.cpu8000 = CPU8000(unittest.mock.AsyncMock())
+        component = make_mock_component()
+        self.cpu8000 = CPU8000(component)
 
     async def test_update_register(self):
-        self.cpu8000.component = unittest.mock.AsyncMock()
-        self.cpu8000.power_register.component.commander.encoding = "ascii"
-        self.cpu8000.power_register.component.commander.send_command = (
-            unittest.mock.AsyncMock()
+        self.cpu8000.component.commander.readuntil = unittest.mock.AsyncMock(
+            side_effect=[b"ON\r\n\x03", b"19A\r\n\x03", b"0\r\n\x03"]
         )
-        self.cpu8000.power_register.component.commander.read_str = (
-            unittest.mock.AsyncMock(return_value="ON")
-        )
-        self.cpu8000.display_current_register.component.commander.encoding = "ascii"
-        self.cpu8000.display_current_register.component.commander.send_command = (
-            unittest.mock.AsyncMock()
-        )
-        self.cpu8000.display_current_register.component.commander.read_str = (
-            unittest.mock.AsyncMock(return_value="19A")
-        )
-        self.cpu8000.fault_register.component.commander.encoding = "ascii"
-        self.cpu8000.fault_register.component.commander.send_command = (
-            unittest.mock.AsyncMock()
-        )
-        self.cpu8000.fault_register.component.commander.read_str = (
-            unittest.mock.AsyncMock(return_value="0")
+        await self.cpu8000.update_register()
+        assert self.cpu8000.power_register.register_value is Power.ON
+        assert self.cpu8000.display_current_register.register_value == 19.0
+        assert self.cpu8000.fault_register.register_value == 0
+        assert isinstance(self.cpu8000.fault_register.register_value, int)
+
+    async def test_update_register_bad_value(self):
+        self.cpu8000.component.commander.readuntil = unittest.mock.AsyncMock(
+            side_effect=[
+                b"ON\r\n\x03",
+                b"19A\r\n\x03",
+                b"0\r\n\x03",
+                b"OFF\r\n\x03",
+                b"NA\r\n\x03",
+                b"1\r\n\x03",
+            ]
         )
         await self.cpu8000.update_register()
+        read_time = self.cpu8000.display_current_register.read_time
+        snapshot = await self.cpu8000.read_registers()
+        assert self.cpu8000.component.commander.readuntil.await_count == 6
+        assert list(snapshot.values()) == [Power.OFF, 19.0, 1]
+        assert snapshot.timestamps[self.cpu8000.display_current_register] == read_time
+        assert self.cpu8000.display_current_register.register_value == 19.0
+        assert self.cpu8000.fault_register.register_value == 1
 
     def test_repr(self):
         assert (
@@ -61,6 +72,55 @@ class TestCPU8000(unittest.IsolatedAsyncioTestCase):
         )
 
 
+class TestMCPU800(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        component = make_mock_component()
+        component.commander.encoding = "ascii"
+        self.m_cpu800 = MCPU800(component)
+
+    async def test_wait_until_propagating(self):
+        self.m_cpu800.component.commander.readuntil = unittest.mock.AsyncMock(
+            side_effect=[b"OFF", b"Burst", b"ON", b"Burst"]
+        )
+        assert await self.m_cpu800.wait_until_propagating(timeout=1) == Mode.BURST
+        assert self.m_cpu800.component.commander.readuntil.await_count == 4
+
+    async def test_wait_until_propagating_trigger(self):
+        self.m_cpu800.component.commander.readuntil = unittest.mock.AsyncMock(
+            side_effect=[b"ON", b"Trigger"]
+        )
+        assert await self.m_cpu800.wait_until_propagating(timeout=1) == Mode.TRIGGER
+
+    async def test_wait_until_propagating_joined(self):
+        replied = asyncio.Event()
+        calls = []
+
+        async def readuntil(terminator):
+            calls.append(terminator)
+            if len(calls) == 1:
+                await replied.wait()
+                return b"ON"
+            return b"Burst"
+
+        self.m_cpu800.component.commander.readuntil = readuntil
+        read = asyncio.create_task(self.m_cpu800.power_register_2.read())
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        wait = asyncio.create_task(self.m_cpu800.wait_until_propagating(timeout=1))
+        await asyncio.sleep(0)
+        replied.set()
+        assert await wait == Mode.BURST
+        assert await read == Power.ON
+        assert len(calls) == 2
+
+    async def test_wait_until_propagating_timeout(self):
+        self.m_cpu800.component.commander.readuntil = unittest.mock.AsyncMock(
+            side_effect=itertools.cycle([b"OFF", b"Burst"])
+        )
+        with pytest.raises(TimeoutError):
+            await self.m_cpu800.wait_until_propagating(timeout=0.3)
+
+
 class TestMaxiOPG(unittest.IsolatedAsyncioTestCase):
     def test_scu_configuration(self):
         self.maxiopg = MaxiOPG(None)
@@ -72,3 +132,24 @@ class TestMaxiOPG(unittest.IsolatedAsyncioTestCase):
             "F1 No SCU",
             "F2 No SCU",
         ]
+
+    async def test_set_configuration_frame_cached(self):
+        component = make_mock_component()
+        component.commander.readuntil = unittest.mock.AsyncMock(
+            side_effect=itertools.cycle([b"\r\n\x03", b"F1 SCU\r\n\x03"])
+        )
+        maxiopg = MaxiOPG(component)
+        register = maxiopg.configuration_register
+        # The configuration of the CSC is a plain string.
+        maxiopg.optical_alignment = "F1 SCU"
+        await maxiopg.set_configuration()
+        assert register.register_value == OpticalConfiguration.F1_SCU
+        register.read_time = None
+        with unittest.mock.patch.object(
+            register, "create_set_message", wraps=register.create_set_message
+        ) as create_set_message:
+            await maxiopg.set_configuration()
+        create_set_message.assert_not_called()
+        first_set, _, second_set, _ = component.commander.write.await_args_list
+        assert first_set.args[0] == b"/MaxiOPG/31/Configuration/F1 SCU\r"
+        assert second_set.args[0] == first_set.args[0]
@@ -0,0 +1,84 @@
+# This file is part of ts_tunablelaser.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Software.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import asyncio
+import unittest
+
+import pytest
+from lsst.ts.tunablelaser.enums import LockPriority
+from lsst.ts.tunablelaser.lock import PriorityLock, lock_priority
+
+
+class TestPriorityLock(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.lock = PriorityLock()
+        self.order = []
+
+    async def hold(self, name, priority=None):
+        if priority is not None:
+            lock_priority.set(priority)
+        async with self.lock:
+            self.order.append(name)
+            await asyncio.sleep(0)
+
+    async def test_priority(self):
+        await self.lock.acquire()
+        tasks = [
+            asyncio.create_task(self.hold("telemetry1", LockPriority.TELEMETRY)),
+            asyncio.create_task(self.hold("telemetry2", LockPriority.TELEMETRY)),
+            asyncio.create_task(self.hold("command1")),
+            asyncio.create_task(self.hold("command2")),
+        ]
+        await asyncio.sleep(0)
+        self.lock.release()
+        await asyncio.gather(*tasks)
+        assert self.order == ["command1", "command2", "telemetry1", "telemetry2"]
+        assert not self.lock.locked()
+        assert self.lock.wait_statistics[LockPriority.COMMAND].count == 3
+        assert self.lock.wait_statistics[LockPriority.TELEMETRY].count == 2
+
+    async def test_cancel(self):
+        await self.lock.acquire()
+        cancelled = asyncio.create_task(self.hold("cancelled"))
+        waiting = asyncio.create_task(self.hold("waiting"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        self.lock.release()
+        await waiting
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+        assert self.order == ["waiting"]
+        assert not self.lock.locked()
+
+    def test_release_unlocked(self):
+        with pytest.raises(RuntimeError):
+            self.lock.release()
+
+    async def test_reentrant(self):
+        async with self.lock:
+            waiting = asyncio.create_task(self.hold("waiting"))
+            async with self.lock:
+                await asyncio.sleep(0)
+            assert self.lock.locked()
+            assert self.order == []
+        await waiting
+        assert self.order == ["waiting"]
+        assert not self.lock.locked()
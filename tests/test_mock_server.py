@@ -1,5 +1,6 @@
 import unittest
 
+from lsst.ts.tunablelaser.canbus_modules import E5DCB
 from lsst.ts.tunablelaser.mock_server import MockMessage, MockNP5450, MockNT900
 
 
@@ -31,3 +32,10 @@ class TestMockNP5450(unittest.TestCase):
         device.e5dcb_setpoint_temperature = 56
         reply = device.do_get_01_sp()
         assert reply == "\x020100000101000056\x03\x01"
+
+    def test_monitor(self):
+        device = MockNP5450()
+        device.e5dcb_setpoint_temperature = 56
+        register = E5DCB(component=None).monitor_register
+        reply = device.parse_message(register.get_frame)
+        assert reply[15:35] == "00C800000230000F0000"
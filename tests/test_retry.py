@@ -0,0 +1,58 @@
+# This file is part of ts_tunablelaser.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Software.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import unittest
+
+from lsst.ts.tunablelaser.retry import RetryPolicy
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_delay(self):
+        policy = RetryPolicy(backoff=0.1, max_backoff=0.5, jitter=0)
+        assert [policy.delay(attempt) for attempt in range(4)] == [
+            0.1,
+            0.2,
+            0.4,
+            0.5,
+        ]
+        policy = RetryPolicy(backoff=0.1, max_backoff=0.5, jitter=0.5)
+        for _ in range(10):
+            assert 0.05 <= policy.delay(0) <= 0.1
+
+    def test_allow(self):
+        policy = RetryPolicy(retries=2)
+        assert policy.allow(0)
+        assert policy.allow(1)
+        assert not policy.allow(2)
+        assert policy.retry_count == 2
+        assert policy.denied_count == 0
+
+    def test_budget(self):
+        policy = RetryPolicy(budget=3)
+        assert policy.allow(0, count=2)
+        assert not policy.allow(0, count=2)
+        assert policy.allow(0)
+        assert not policy.allow(0)
+        assert policy.budget_left == 0
+        assert policy.denied_count == 2
+        policy.reset_budget()
+        assert policy.allow(0, count=3)
+        assert policy.retry_count == 6
@@ -0,0 +1,57 @@
+# This file is part of ts_tunablelaser.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Software.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import unittest
+
+import pytest
+from lsst.ts.tunablelaser.rtt import RttEstimator
+
+
+class TestRttEstimator(unittest.TestCase):
+    def test_timeout(self):
+        rtt = RttEstimator(max_timeout=2, min_timeout=0.01)
+        assert rtt.timeout == 2
+        rtt.record(0.1)
+        assert rtt.srtt == 0.1
+        assert rtt.timeout == pytest.approx(0.3)
+        for _ in range(100):
+            rtt.record(0.1)
+        assert rtt.timeout == pytest.approx(0.1, abs=1e-3)
+        rtt.record(0.5)
+        assert rtt.timeout > 0.5
+
+    def test_limits(self):
+        rtt = RttEstimator(max_timeout=1, min_timeout=0.2)
+        rtt.record(0.001)
+        assert rtt.timeout == 0.2
+        rtt.record(10)
+        assert rtt.timeout == 1
+
+    def test_record_timeout(self):
+        rtt = RttEstimator(max_timeout=1, min_timeout=0.1)
+        rtt.record(0.01)
+        rtt.record_timeout()
+        assert rtt.timeout == pytest.approx(0.2)
+        rtt.record_timeout()
+        assert rtt.timeout == pytest.approx(0.4)
+        assert rtt.timeouts == 2
+        rtt.record(0.01)
+        assert rtt.timeout == pytest.approx(0.1)
@@ -0,0 +1,128 @@
+# This file is part of ts_tunablelaser.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Software.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import time
+import unittest
+import unittest.mock
+
+import pytest
+from lsst.ts.tunablelaser.enums import PollPriority
+from lsst.ts.tunablelaser.scheduler import PollingScheduler
+
+
+class TestPollingScheduler(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.scheduler = PollingScheduler(tick=0.2)
+        self.fault = [unittest.mock.Mock(name=f"fault{i}") for i in range(2)]
+        self.status = [unittest.mock.Mock(name=f"status{i}") for i in range(5)]
+        self.temperature = [unittest.mock.Mock(name=f"temp{i}") for i in range(7)]
+        self.static = [unittest.mock.Mock(name="static")]
+        self.scheduler.add(self.status, period=1, priority=PollPriority.MEDIUM)
+        self.scheduler.add(self.fault, period=0.2, priority=PollPriority.HIGH)
+        self.scheduler.add(self.temperature, period=5, priority=PollPriority.LOW)
+        self.scheduler.add(self.static, period=None, priority=PollPriority.LOW)
+
+    def count_reads(self, ticks):
+        counts = {register: 0 for register in self.scheduler.registers}
+        loads = []
+        for _ in range(ticks):
+            due = self.scheduler.due()
+            loads.append(len(due))
+            for register in due:
+                counts[register] += 1
+        return counts, loads
+
+    def test_due(self):
+        first = self.scheduler.due()
+        assert set(first) == set(self.scheduler.registers)
+        assert first[:2] == self.fault
+        assert first[-1] in self.temperature + self.static
+
+        counts, loads = self.count_reads(ticks=25)
+        for register in self.fault:
+            assert counts[register] == 25
+        for register in self.status:
+            assert counts[register] == 5
+        for register in self.temperature:
+            assert counts[register] == 1
+        assert counts[self.static[0]] == 0
+        # Registers of a group are spread over the ticks.
+        assert max(loads) - min(loads) <= 1
+
+    def test_reset(self):
+        self.count_reads(ticks=3)
+        self.scheduler.reset()
+        assert self.scheduler.tick_count == 0
+        assert set(self.scheduler.due()) == set(self.scheduler.registers)
+        assert self.static[0] not in self.scheduler.due()
+
+    def test_defer(self):
+        self.scheduler.due()
+        # Only four reads fit in a tick.
+        self.scheduler.record_read(count=1, duration=0.05)
+        self.scheduler.reset()
+        due = self.scheduler.due()
+        assert due[:2] == self.fault
+        assert len(due) == 4
+        deferred = set(self.scheduler.registers) - set(due)
+        while deferred:
+            due = self.scheduler.due()
+            assert due[:2] == self.fault
+            assert len(due) <= 4
+            deferred -= set(due)
+        # Reads that take longer than a tick still make progress.
+        self.scheduler.record_read(count=1, duration=10)
+        self.scheduler.reset()
+        assert len(self.scheduler.due()) == 3
+
+    def test_static_registers(self):
+        assert self.scheduler.static_registers == self.static
+
+    def test_expedite(self):
+        self.scheduler.due()
+        unknown = unittest.mock.Mock(name="unknown")
+        self.scheduler.expedite(self.static + [unknown])
+        due = self.scheduler.due()
+        assert self.static[0] in due
+        assert unknown not in due
+        assert self.static[0] not in self.scheduler.due()
+
+    def test_skip(self):
+        self.scheduler.due()
+        self.scheduler.skip(5)
+        counts, _ = self.count_reads(ticks=1)
+        for register in self.status:
+            assert counts[register] == 1
+        assert self.scheduler.tick_count == 7
+
+    async def test_wait_next_tick(self):
+        self.scheduler.reset()
+        start = time.monotonic()
+        assert await self.scheduler.wait_next_tick() == 0
+        assert time.monotonic() - start < self.scheduler.tick * 1.5
+        time.sleep(0.5)
+        assert await self.scheduler.wait_next_tick() == 2
+        assert self.scheduler.overruns == 1
+        assert self.scheduler.skipped_ticks == 2
+        assert self.scheduler.tick_count == 2
+        # The cadence is kept.
+        elapsed = time.monotonic() - start
+        assert elapsed == pytest.approx(0.8, abs=0.05)
@@ -0,0 +1,131 @@
+# This file is part of ts_tunablelaser.
+#
+# Developed for the Vera Rubin Observatory Telescope and Site Software.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import asyncio
+import unittest
+import unittest.mock
+
+import pytest
+from lsst.ts.tunablelaser.codec import AsciiCodec
+from lsst.ts.tunablelaser.enums import Mode
+from lsst.ts.tunablelaser.lock import PriorityLock
+from lsst.ts.tunablelaser.register import AsciiRegister, ReplyError
+from lsst.ts.tunablelaser.testutils import make_mock_component
+from lsst.ts.tunablelaser.transaction import Transaction
+
+
+class TestTransaction(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.component = make_mock_component()
+        self.component.lock = PriorityLock()
+        self.component.scheduler = unittest.mock.Mock()
+        self.mode = AsciiRegister(
+            component=self.component,
+            module_name="M_CPU800",
+            module_id=18,
+            register_name="Continuous / Burst mode / Trigger burst",
+            read_only=False,
+            accepted_values=list(Mode),
+            value_type=Mode,
+        )
+        self.burst_length = AsciiRegister(
+            component=self.component,
+            module_name="M_CPU800",
+            module_id=18,
+            register_name="Burst length",
+            read_only=False,
+            accepted_values=range(1, 50001),
+            value_type=int,
+        )
+
+    async def test_transaction(self):
+        self.component.commander.readuntil = unittest.mock.AsyncMock(
+            side_effect=[b"\r\n\x03", b"\r\n\x03", b"20\r\n\x03"]
+        )
+        async with Transaction(self.component):
+            await self.mode.send_command(Mode.BURST, readback=False)
+            await self.burst_length.send_command(20, readback=False)
+            self.component.commander.write.assert_not_awaited()
+            read = asyncio.create_task(self.burst_length.read())
+            await asyncio.sleep(0)
+        self.component.commander.write.assert_awaited_once_with(
+            b"/M_CPU800/18/Continuous / Burst mode / Trigger burst/Burst\r"
+            b"/M_CPU800/18/Burst length/20\r"
+        )
+        assert self.mode.unverified_value == Mode.BURST
+        assert self.burst_length.unverified_value == 20
+        assert await read == 20
+        assert not self.component.lock.locked()
+
+    async def test_transaction_read(self):
+        self.component.commander.readuntil = unittest.mock.AsyncMock(
+            side_effect=[b"\r\n\x03", b"Burst\r\n\x03"]
+        )
+        async with Transaction(self.component):
+            await self.mode.send_command(Mode.BURST, readback=False)
+            assert await self.mode.read() == Mode.BURST
+        assert self.component.commander.write.await_count == 2
+
+    async def test_transaction_error(self):
+        self.component.commander.readuntil = unittest.mock.AsyncMock(
+            side_effect=[
+                b"\r\n\x03",
+                b"'''Error: (11) Value is above the top limit\r\n\x03",
+            ]
+        )
+        with pytest.raises(ReplyError):
+            async with Transaction(self.component):
+                await self.mode.send_command(Mode.BURST, readback=False)
+                await self.burst_length.send_command(20, readback=False)
+        assert not self.component.lock.locked()
+
+    async def test_transaction_garbled_reply(self):
+        self.component.commander.readuntil = unittest.mock.AsyncMock(
+            side_effect=[b"garbled\r\n\x03", b"\r\n\x03", b"\r\n\x03"]
+        )
+        codec = AsciiCodec()
+        self.mode.codec = unittest.mock.Mock()
+        self.mode.codec.decode.side_effect = [
+            ValueError("garbled"),
+            codec.decode(b"\r\n\x03"),
+        ]
+        async with Transaction(self.component):
+            await self.mode.send_command(Mode.BURST, readback=False)
+            await self.burst_length.send_command(20, readback=False)
+        # The reply to the second set is read before the first is decoded,
+        # and only the first set is sent again.
+        assert [
+            call.args[0] for call in self.component.commander.write.await_args_list
+        ] == [
+            b"/M_CPU800/18/Continuous / Burst mode / Trigger burst/Burst\r"
+            b"/M_CPU800/18/Burst length/20\r",
+            b"/M_CPU800/18/Continuous / Burst mode / Trigger burst/Burst\r",
+        ]
+        self.component.reconnect.assert_not_awaited()
+        assert self.mode.unverified_value == Mode.BURST
+
+    async def test_transaction_raises(self):
+        with pytest.raises(ValueError):
+            async with Transaction(self.component):
+                await self.mode.send_command(Mode.BURST, readback=False)
+                raise ValueError
+        self.component.commander.write.assert_not_awaited()
+        assert not self.component.lock.locked()